@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep benchmark logs and journals out of the project directory
+_tmp = tempfile.mkdtemp(prefix="bench_accounts_")
+os.environ.setdefault("BOT_LOG_PATH", os.path.join(_tmp, "bot.log"))
+os.environ.setdefault("JOURNAL_PATH", os.path.join(_tmp, "orders.journal"))
+
+from src.common import FakeClient
+from src.accounts import AccountPool
+from src.advanced.bracket import place_bracket
+from src.advanced.twap import run_twap
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Wall-clock fan-out across N accounts against a latency-injecting FakeClient")
+    p.add_argument("--accounts", type=int, default=10, help="Number of accounts (default 10)")
+    p.add_argument("--latencyMs", type=float, default=50.0, help="Round-trip latency per request (default 50)")
+    p.add_argument("--slices", type=int, default=5, help="TWAP slices per account (default 5)")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    accounts = [{"name": f"acct{i}", "API_KEY": "", "API_SECRET": "", "size": 1.0 + i / 10}
+                for i in range(args.accounts)]
+    factory = lambda acct, mode: FakeClient(latency_ms=args.latencyMs)
+
+    bracket = lambda client, q, journal: place_bracket(
+        client, "BTCUSDT", "BUY", q, "LIMIT", 60000.0, 62000.0, 59000.0, None, journal=journal)
+    twap = lambda client, q, journal: run_twap(
+        client, "BTCUSDT", "BUY", q, args.slices, 0.0, journal=journal)
+
+    pool = AccountPool(accounts, mode="dryrun", factory=factory)
+    t0 = time.perf_counter()
+    pool.connect()
+    connect_s = time.perf_counter() - t0
+    print(f"{args.accounts} accounts, {args.latencyMs:g}ms RTT, clients connected in {connect_s:.3f}s")
+
+    for label, fn, legs in (("bracket", bracket, 3), ("twap", twap, args.slices)):
+        t0 = time.perf_counter()
+        for acct in accounts:
+            fn(pool.client(acct["name"]), 0.001 * acct["size"], pool.journal(acct["name"]))
+        seq = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        results = pool.fan_out(fn, 0.001)
+        par = time.perf_counter() - t0
+        ok = sum(1 for r in results.values() if "result" in r)
+        print(f"{label:8s} ({legs} orders/account): sequential {seq:.3f}s | fan-out {par:.3f}s "
+              f"| speedup {seq / par:.1f}x | {ok}/{len(results)} ok")
+    pool.close()
+
+if __name__ == "__main__":
+    main()
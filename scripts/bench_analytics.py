@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import json
+import argparse
+import tempfile
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from src.analytics import legs_frame, load_journal, execution_quality, order_type_stats
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark vectorized post-trade analytics on a synthetic journal")
+    p.add_argument("--links", type=int, default=200000, help="TWAP links (default 200000)")
+    p.add_argument("--slices", type=int, default=10, help="Slices per link (default 10)")
+    p.add_argument("--parseRecords", type=int, default=200000, help="Records for the JSON-lines parse benchmark")
+    return p.parse_args()
+
+def synthetic_records(links: int, slices: int, seed: int = 1) -> pd.DataFrame:
+    """Normalized journal records (link + plan + ack per slice), built column-wise."""
+    rng = np.random.default_rng(seed)
+    n = links * slices
+    link_ids = np.char.add("TWAP-", np.arange(links).astype(str))
+    leg_link = np.repeat(link_ids, slices)
+    cids = np.char.add(np.char.add(leg_link, "-S"), np.tile(np.arange(1, slices + 1), links).astype(str))
+    side = np.repeat(np.where(rng.random(links) < 0.5, "BUY", "SELL"), slices)
+    base = np.repeat(rng.uniform(100, 60000, links), slices)
+    px = base * (1 + rng.normal(0, 0.0005, n))
+    t_plan = np.repeat(np.arange(links, dtype=float) * 60, slices)
+    t_ack = t_plan + np.tile(np.arange(slices) * 5.0, links) + rng.gamma(2.0, 0.02, n)
+    failed = rng.random(n) < 0.01
+
+    link_recs = pd.DataFrame({"op": "link", "linkId": link_ids, "strategy": "TWAP", "t": t_plan[::slices],
+                              "meta.arrivalPrice": base[::slices]})
+    plan_recs = pd.DataFrame({
+        "op": "plan", "linkId": leg_link, "cid": cids, "t": t_plan,
+        "req.symbol": "BTCUSDT", "req.side": side, "req.type": "MARKET",
+        "req.quantity": 0.01, "req.price": np.nan,
+    })
+    out_recs = pd.DataFrame({
+        "op": np.where(failed, "fail", "ack"), "linkId": leg_link, "cid": cids, "t": t_ack,
+        "status": "FILLED", "avgPrice": np.where(failed, np.nan, px),
+        "executedQty": np.where(failed, np.nan, 0.01),
+        "latencyMs": rng.lognormal(3.0, 0.5, n),
+    })
+    return pd.concat([link_recs, plan_recs, out_recs], ignore_index=True)
+
+def naive_shortfall(legs: pd.DataFrame) -> dict:
+    """Per-row Python loop equivalent of the achieved-price/shortfall part, for comparison."""
+    acc = {}
+    for row in legs.itertuples(index=False):
+        if row.outcome != "ack":
+            continue
+        a = acc.setdefault(row.linkId, [0.0, 0.0, row.arrivalPrice, 1.0 if row.side == "BUY" else -1.0])
+        a[0] += row.avgPrice * row.executedQty
+        a[1] += row.executedQty
+    return {k: a[3] * (a[0] / a[1] - a[2]) / a[2] * 1e4 for k, a in acc.items()}
+
+def main():
+    args = parse_args()
+
+    t0 = time.perf_counter()
+    recs = synthetic_records(args.links, args.slices)
+    t1 = time.perf_counter()
+    legs = legs_frame(recs)
+    t2 = time.perf_counter()
+    links = execution_quality(legs)
+    t3 = time.perf_counter()
+    types = order_type_stats(legs)
+    t4 = time.perf_counter()
+    market = pd.DataFrame({"ts": np.sort(np.random.default_rng(2).uniform(0, args.links * 60, len(legs))),
+                           "price": 30000.0, "qty": 1.0})
+    execution_quality(legs, market=market)
+    t5 = time.perf_counter()
+
+    print(f"synthetic journal: {len(recs):,} records, {len(legs):,} legs, {len(links):,} links "
+          f"(generated in {t1 - t0:.2f}s)")
+    print(f"legs_frame (join plans/outcomes): {t2 - t1:.3f}s")
+    print(f"execution_quality:                {t3 - t2:.3f}s ({len(legs) / (t3 - t2):,.0f} legs/s)")
+    print(f"order_type_stats:                 {t4 - t3:.3f}s")
+    print(f"execution_quality + market VWAP:  {t5 - t4:.3f}s ({len(market):,} market trades)")
+
+    sample = legs.iloc[: min(len(legs), 500000)]
+    t0 = time.perf_counter()
+    naive_shortfall(sample)
+    t1 = time.perf_counter()
+    execution_quality(sample)
+    t2 = time.perf_counter()
+    print(f"per-row loop vs vectorized on {len(sample):,} legs: {t1 - t0:.3f}s vs {t2 - t1:.3f}s")
+
+    # JSON-lines parse cost, which dominates on real files
+    n_links = max(1, args.parseRecords // (2 * args.slices + 1))
+    small = synthetic_records(n_links, args.slices)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "orders.journal")
+        with open(path, "w", encoding="utf-8") as f:
+            for rec in small.to_dict("records"):
+                out = {"req": {}, "meta": {}}
+                for k, v in rec.items():
+                    if isinstance(v, float) and np.isnan(v):
+                        continue
+                    if k.startswith("req."):
+                        out["req"][k[4:]] = v
+                    elif k.startswith("meta."):
+                        out["meta"][k[5:]] = v
+                    else:
+                        out[k] = v
+                f.write(json.dumps(out) + "\n")
+        t0 = time.perf_counter()
+        parsed = load_journal(path)
+        t1 = time.perf_counter()
+    print(f"load_journal: {len(small):,} records parsed in {t1 - t0:.3f}s ({len(small) / (t1 - t0):,.0f} records/s), "
+          f"{len(parsed):,} legs")
+    print(types[["legs", "ackRate", "fillRate", "latencyP50", "latencyP99"]].to_string())
+
+if __name__ == "__main__":
+    main()
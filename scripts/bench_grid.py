@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep benchmark logs out of the real bot.log
+os.environ.setdefault("BOT_LOG_PATH", os.path.join(tempfile.gettempdir(), "bench_bot.log"))
+
+from src.common import FakeClient
+from src.advanced.grid import GridStrategy, build_ladder, diff_ladder, PLACE_BATCH, CANCEL_BATCH
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark incremental grid re-quoting against the simulated exchange")
+    p.add_argument("--levels", type=int, nargs="+", default=[100, 250, 500, 1000], help="Total ladder sizes")
+    p.add_argument("--moves", type=int, default=200, help="Re-centers per grid (default 200)")
+    p.add_argument("--latencyMs", type=float, default=0.0, help="Simulated round trip per request")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    step, tick = 10.0, 0.1
+    print(f"{'levels':>6} | {'diff us':>8} | {'req/move incr':>13} | {'req/move naive':>14} | {'orders/move':>11} | {'ms/move':>7}")
+    for total in args.levels:
+        per_side = total // 2
+        rng = random.Random(total)
+        grid = GridStrategy(FakeClient(latency_ms=args.latencyMs), "BTCUSDT", step, per_side, 0.001, tick)
+        center = 60000.0
+        grid.requote(center)
+
+        diff_s = 0.0
+        requests = 0
+        orders = 0
+        t0 = time.perf_counter()
+        for _ in range(args.moves):
+            center += rng.choice((-1, 1)) * rng.uniform(0, 3 * step)
+            d0 = time.perf_counter()
+            cancel, place = diff_ladder(build_ladder(center, step, per_side, 0.001, tick), grid.resting)
+            diff_s += time.perf_counter() - d0
+            stats = grid.requote(center)
+            requests += stats["requests"]
+            orders += stats["placed"] + stats["cancelled"]
+        elapsed = time.perf_counter() - t0
+
+        n = len(grid.resting)
+        naive = -(-n // CANCEL_BATCH) + -(-n // PLACE_BATCH)  # cancel everything, re-place everything
+        print(f"{total:>6} | {diff_s / args.moves * 1e6:>8.1f} | {requests / args.moves:>13.2f} | "
+              f"{naive:>14} | {orders / args.moves:>11.2f} | {elapsed / args.moves * 1000:>7.2f}")
+
+if __name__ == "__main__":
+    main()
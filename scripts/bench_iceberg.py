@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep benchmark logs out of the real bot.log
+os.environ.setdefault("BOT_LOG_PATH", os.path.join(tempfile.gettempdir(), "bench_bot.log"))
+
+from src.common import FakeClient
+from src.advanced.iceberg import IcebergOrder
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Iceberg refill latency and request count: fill events vs polling")
+    p.add_argument("--slices", type=int, default=50, help="Visible slices to work through (default 50)")
+    p.add_argument("--latencyMs", type=float, default=20.0, help="Simulated round trip per request (default 20)")
+    p.add_argument("--fillGapMs", type=float, default=100.0, help="Mean resting time before a slice fills")
+    p.add_argument("--pollMs", type=float, nargs="+", default=[50.0, 250.0], help="Polling intervals for the baseline")
+    return p.parse_args()
+
+def pct(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+def run(args, poll_ms=None):
+    """Fill each resting slice after a random gap; time until the next slice is resting."""
+    client = FakeClient(latency_ms=args.latencyMs)
+    ice = IcebergOrder(client, "BTCUSDT", "BUY", args.slices * 0.01, 0.01, 60000.0, seed=1)
+    polls = [0]
+    stop = threading.Event()
+    ice.start()
+    if poll_ms is None:
+        client.add_listener(ice.on_event)
+    else:
+        def poller():
+            # Baseline: ask the exchange for the slice's status every poll_ms
+            while not stop.is_set():
+                cid = ice.cid
+                order = client.futures_get_order(symbol="BTCUSDT", origClientOrderId=cid)
+                polls[0] += 1
+                if order["status"] == "FILLED":
+                    ice.on_event({"e": "ORDER_TRADE_UPDATE", "o": {
+                        "c": cid, "x": "TRADE", "X": "FILLED", "i": order["orderId"],
+                        "l": order["origQty"], "L": order["price"]}})
+                stop.wait(poll_ms / 1000)
+        threading.Thread(target=poller, daemon=True).start()
+
+    rng = random.Random(7)
+    lat = []
+    t0 = time.perf_counter()
+    while ice.status == "working":
+        time.sleep(rng.expovariate(1000 / args.fillGapMs))
+        cid = ice.cid
+        t_fill = time.perf_counter()
+        if poll_ms is None:
+            client.fill(origClientOrderId=cid)
+        else:
+            # Matching engine fills silently; only the poller can notice
+            listeners, client.listeners = client.listeners, []
+            client.fill(origClientOrderId=cid)
+            client.listeners = listeners
+        while ice.cid == cid and ice.status == "working":
+            time.sleep(0.0002)
+        if ice.status == "working":
+            lat.append((time.perf_counter() - t_fill) * 1000)
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    return lat, ice.requests + polls[0], elapsed
+
+def main():
+    args = parse_args()
+    print(f"{args.slices} slices, RTT {args.latencyMs}ms, mean resting time {args.fillGapMs}ms")
+    print(f"{'mode':>12} | {'refill p50 ms':>13} | {'p99 ms':>7} | {'requests':>8} | {'req/slice':>9} | {'wall s':>6}")
+    modes = [("events", None)] + [(f"poll {p:g}ms", p) for p in args.pollMs]
+    for name, poll_ms in modes:
+        lat, requests, elapsed = run(args, poll_ms)
+        print(f"{name:>12} | {pct(lat, 0.5):>13.2f} | {pct(lat, 0.99):>7.2f} | {requests:>8} | "
+              f"{requests / args.slices:>9.2f} | {elapsed:>6.2f}")
+
+if __name__ == "__main__":
+    main()
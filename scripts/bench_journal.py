@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+import json
+import argparse
+import tempfile
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep benchmark order logs out of the real bot.log
+os.environ.setdefault("BOT_LOG_PATH", os.path.join(tempfile.gettempdir(), "bench_bot.log"))
+
+from src.common import FakeClient
+from src.journal import IntentJournal, load_state, pending_links, recover
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark intent-journal recovery on a large synthetic journal")
+    p.add_argument("--links", type=int, default=100000, help="Number of links (brackets) in the journal")
+    p.add_argument("--unfinished", type=float, default=0.01, help="Fraction of links left unfinished")
+    return p.parse_args()
+
+def write_journal(path: str, links: int, unfinished: float) -> int:
+    """Writes bracket-shaped links directly (no fsync per record) and returns the record count."""
+    every = max(1, int(1 / unfinished)) if unfinished > 0 else 0
+    n = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(links):
+            lid = f"BRK-{i:08x}"
+            legs = [f"{lid}-ENTRY", f"{lid}-TP", f"{lid}-SL"]
+            recs = [{"op": "link", "linkId": lid, "strategy": "BRACKET", "meta": {}}]
+            for cid in legs:
+                recs.append({"op": "plan", "linkId": lid, "cid": cid, "req": {
+                    "symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "quantity": 0.001,
+                    "price": 60000.0, "timeInForce": "GTC", "newClientOrderId": cid}})
+            # Unfinished links crash after the entry ack, before TP/SL
+            crashed = every and i % every == 0
+            acked = legs[:1] if crashed else legs
+            for cid in acked:
+                recs.append({"op": "ack", "linkId": lid, "cid": cid, "orderId": f"X{i}", "status": "NEW"})
+            if not crashed:
+                recs.append({"op": "done", "linkId": lid, "status": "complete"})
+            for rec in recs:
+                f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+            n += len(recs)
+    return n
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "orders.journal")
+        n = write_journal(path, args.links, args.unfinished)
+        size_mb = os.path.getsize(path) / 1e6
+
+        t0 = time.perf_counter()
+        state = load_state(path)
+        t1 = time.perf_counter()
+        pending = pending_links(state)
+        t2 = time.perf_counter()
+
+        journal = IntentJournal(path)
+        t3 = time.perf_counter()
+        summary = recover(FakeClient(), journal, policy="resume")
+        t4 = time.perf_counter()
+        journal.close()
+
+    print(f"journal: {n} records, {size_mb:.1f} MB, {args.links} links, {len(pending)} unfinished")
+    print(f"replay:   {t1 - t0:.3f}s ({n / (t1 - t0):,.0f} records/s)")
+    print(f"scan:     {(t2 - t1) * 1000:.1f}ms")
+    print(f"recover:  {t4 - t3:.3f}s total (replay + reconcile + resend), summary={summary}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.logschema import encode_record, iter_frames, parse_record
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Encode/decode throughput and size: JSON lines vs binary frames vs typed records")
+    p.add_argument("--records", type=int, default=200_000, help="Synthetic records (default 200000)")
+    return p.parse_args()
+
+def synthetic(n, seed=1):
+    """Mix of the record shapes the bot writes: FakeClient, strategy, retry, slice and lifecycle records."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        ts = f"2025-08-11T{6 + i // 3_600_000 % 18:02d}:{i // 60_000 % 60:02d}:{i // 1000 % 60:02d}Z"
+        side = rng.choice(("BUY", "SELL"))
+        qty = round(rng.uniform(0.001, 0.5), 3)
+        price = round(rng.uniform(55000, 65000), 1)
+        kind = rng.random()
+        if kind < 0.4:
+            out.append({"ts": ts, "level": "INFO", "action": "place_order", "mode": "dryrun",
+                        "request": {"symbol": "BTCUSDT", "side": side, "type": "LIMIT", "quantity": qty,
+                                    "price": price, "timeInForce": "GTC", "recvWindow": 5000},
+                        "orderId": f"FAKE-{rng.getrandbits(32):08x}"})
+        elif kind < 0.6:
+            out.append({"ts": ts, "level": "INFO", "action": "place_order", "type": "LIMIT", "symbol": "BTCUSDT",
+                        "side": side, "qty": qty, "price": price, "tif": "GTC", "result": "ok",
+                        "orderId": f"FAKE-{rng.getrandbits(32):08x}"})
+        elif kind < 0.7:
+            out.append({"ts": ts, "level": "ERROR", "action": "order_attempt_failed", "attempt": 1, "transient": True,
+                        "error": "APIError(code=-1003): Too many requests",
+                        "req": {"symbol": "BTCUSDT", "side": side, "type": "MARKET", "quantity": qty}})
+        elif kind < 0.95:
+            out.append({"ts": ts, "level": "INFO", "action": "twap_slice", "symbol": "BTCUSDT", "side": side,
+                        "sliceIndex": i % 10 + 1, "totalSlices": 10, "qty": qty, "executedQty": qty * (i % 10 + 1),
+                        "linkId": "TWAP-1a2b3c4d", "orderId": f"FAKE-{rng.getrandbits(32):08x}", "result": "ok"})
+        else:
+            out.append({"ts": ts, "level": "INFO", "action": "twap_start", "symbol": "BTCUSDT", "side": side,
+                        "totalQty": qty * 10, "slices": 10, "sliceQty": qty, "intervalSec": 5, "linkId": "TWAP-1a2b3c4d"})
+    return out
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+def main():
+    args = parse_args()
+    recs = synthetic(args.records)
+    n = len(recs)
+
+    lines, t_json_enc = timed(lambda: [json.dumps(r) + "\n" for r in recs])
+    blob_json = "".join(lines).encode("utf-8")
+    frames, t_bin_enc = timed(lambda: [encode_record(r) for r in recs])
+    blob_bin = b"".join(frames)
+
+    decoded_json, t_json_dec = timed(lambda: [json.loads(l) for l in blob_json.decode("utf-8").splitlines()])
+    decoded_bin, t_bin_dec = timed(lambda: list(iter_frames(blob_bin)))
+    assert decoded_bin == recs and decoded_json == recs
+    _, t_typed = timed(lambda: [parse_record(r) for r in recs])
+
+    print(f"{n} records")
+    print(f"{'format':>12} | {'encode rec/s':>12} | {'decode rec/s':>12} | {'bytes/rec':>9} | {'total MB':>8}")
+    print(f"{'json lines':>12} | {n / t_json_enc:>12,.0f} | {n / t_json_dec:>12,.0f} | "
+          f"{len(blob_json) / n:>9.1f} | {len(blob_json) / 1e6:>8.2f}")
+    print(f"{'binary':>12} | {n / t_bin_enc:>12,.0f} | {n / t_bin_dec:>12,.0f} | "
+          f"{len(blob_bin) / n:>9.1f} | {len(blob_bin) / 1e6:>8.2f}")
+    print(f"typed validation (parse_record): {n / t_typed:,.0f} rec/s")
+
+if __name__ == "__main__":
+    main()
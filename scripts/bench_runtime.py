@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import resource
+import tempfile
+import subprocess
+import tracemalloc
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep benchmark logs and journals out of the project directory
+_tmp = tempfile.mkdtemp(prefix="bench_runtime_")
+os.environ.setdefault("BOT_LOG_PATH", os.path.join(_tmp, "bot.log"))
+os.environ.setdefault("JOURNAL_PATH", os.path.join(_tmp, "orders.journal"))
+
+from src.common import FakeClient
+from src.runtime import Runtime
+from src.advanced.twap import TwapStrategy
+from src.advanced.bracket import BracketStrategy
+from src.advanced.oco import OcoStrategy
+from src.advanced.stop_limit import StopLimitStrategy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Per-strategy CPU and memory of N strategies hosted in one runtime")
+    p.add_argument("--strategies", type=int, default=200, help="Strategies to host, mixed kinds (default 200)")
+    p.add_argument("--latencyMs", type=float, default=20.0, help="Simulated round trip per request (default 20)")
+    p.add_argument("--slices", type=int, default=5, help="TWAP slices (default 5)")
+    p.add_argument("--intervalSec", type=float, default=0.2, help="TWAP slice interval (default 0.2)")
+    p.add_argument("--workers", type=int, default=32, help="Runtime call pool size (default 32)")
+    return p.parse_args()
+
+def rss_kb() -> int:
+    """Peak RSS in KB (Linux reports ru_maxrss in KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def make(i: int, args):
+    kind = i % 4
+    if kind == 0:
+        return TwapStrategy("BTCUSDT", "BUY", 0.001 * args.slices, args.slices, args.intervalSec)
+    if kind == 1:
+        return BracketStrategy("BTCUSDT", "BUY", 0.001, "LIMIT", 60000.0, 62000.0, 59000.0, watch=True)
+    if kind == 2:
+        return OcoStrategy("ETHUSDT", "SELL", 0.01, 3100.0, 2900.0, watch=True)
+    return StopLimitStrategy("BTCUSDT", "SELL", 0.001, 59000.0, 58900.0)
+
+async def host(args, client, strategies):
+    rt = Runtime(client, max_workers=args.workers, trace_memory=True)
+    task = asyncio.ensure_future(rt.run(strategies))
+    # Exits rest until one side fills: fill a random side of every watched pair
+    rng = random.Random(3)
+    while not task.done():
+        await asyncio.sleep(0.05)
+        for st in strategies:
+            if isinstance(st, OcoStrategy) and st.watch and st.placed.get("sl") and not st.done:
+                leg = rng.choice(("TP", "SL"))
+                await asyncio.get_running_loop().run_in_executor(
+                    rt.pool, lambda: client.fill(origClientOrderId=f"{st.link_id}-{leg}"))
+    await rt.shutdown()
+
+def cli_rss_kb() -> int:
+    """Peak RSS of one one-shot CLI process (a bracket), for comparison."""
+    env = dict(os.environ, MODE="dryrun")
+    subprocess.run([sys.executable, os.path.join(ROOT, "src", "advanced", "bracket.py"), "BTCUSDT", "BUY", "0.001",
+                    "--takeProfit", "62000", "--stopPrice", "59000"], env=env, check=True, stdout=subprocess.DEVNULL)
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+def main():
+    args = parse_args()
+    client = FakeClient(latency_ms=args.latencyMs)
+    strategies = [make(i, args) for i in range(args.strategies)]
+    rss0 = rss_kb()
+    tracemalloc.start()
+    t0, c0 = time.perf_counter(), time.process_time()
+    asyncio.run(host(args, client, strategies))
+    wall, cpu = time.perf_counter() - t0, time.process_time() - c0
+    tracemalloc.stop()
+    rss1 = rss_kb()
+
+    print(f"{args.strategies} strategies, RTT {args.latencyMs:g}ms, {args.workers} call threads: "
+          f"wall {wall:.2f}s, process CPU {cpu * 1000:.0f}ms")
+    print(f"{'strategy':>10} | {'n':>4} | {'cpu ms/strat':>12} | {'calls':>5} | {'events':>6} | {'alloc KB/strat':>14}")
+    by_kind = {}
+    for st in strategies:
+        by_kind.setdefault(st.kind, []).append(st)
+    for kind, group in by_kind.items():
+        n = len(group)
+        print(f"{kind:>10} | {n:>4} | {sum(s.stats.cpu_s for s in group) * 1000 / n:>12.2f} | "
+              f"{sum(s.stats.calls for s in group) / n:>5.1f} | {sum(s.stats.events for s in group) / n:>6.1f} | "
+              f"{sum(s.stats.alloc_bytes for s in group) / 1024 / n:>14.1f}")
+    bad = [st.status for st in strategies if st.status != "complete"]
+    print(f"not complete: {len(bad)}")
+
+    cli = cli_rss_kb()
+    hosted = max(rss1 - rss0, 0) / args.strategies
+    print(f"memory: one CLI process {cli / 1024:.1f} MB peak RSS | hosted {hosted:.1f} KB RSS growth per strategy "
+          f"(runtime peak {rss1 / 1024:.1f} MB for all {args.strategies})")
+
+if __name__ == "__main__":
+    main()
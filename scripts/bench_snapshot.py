@@ -0,0 +1,169 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing as mp
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep benchmark logs and journals out of the project directory
+_tmp = tempfile.mkdtemp(prefix="bench_snapshot_")
+os.environ.setdefault("BOT_LOG_PATH", os.path.join(_tmp, "bot.log"))
+os.environ.setdefault("JOURNAL_PATH", os.path.join(_tmp, "orders.journal"))
+
+from src.snapshot import SnapshotReader, SnapshotWriter
+
+SYMBOLS = ("BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT")
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Shared-memory snapshot: writer throughput, reader cost, torn reads, latency")
+    p.add_argument("--name", default=f"bench_snap_{os.getpid()}", help="Scratch segment name (removed at exit)")
+    p.add_argument("--ops", type=int, default=200000, help="Operations per throughput/cost row (default 200000)")
+    p.add_argument("--seconds", type=float, default=2.0, help="Duration of the concurrent runs (default 2)")
+    p.add_argument("--samples", type=int, default=5000, help="Propagation latency samples (default 5000)")
+    return p.parse_args()
+
+def per_op_ns(fn, n: int) -> float:
+    t0 = time.perf_counter_ns()
+    fn(n)
+    return (time.perf_counter_ns() - t0) / n
+
+def hammer(name: str, stop, same_values: bool):
+    """Child process: the single writer, updating one symbol as fast as it can until stop is set."""
+    w = SnapshotWriter(name, 256)
+    v = 1.0
+    while not stop.is_set():
+        for _ in range(1000):
+            v += 1.0
+            if same_values:
+                w.update("BTCUSDT", v, v, v, v, v, v, int(v))
+            else:
+                w.update("BTCUSDT", mark=v)
+    w.close()
+
+def ticker(name: str, stop, samples: int):
+    """Child process: publishes monotonic_ns in the ts field every 0.2 ms, for the latency run."""
+    w = SnapshotWriter(name, 256)
+    for _ in range(samples):
+        if stop.is_set():
+            break
+        w.update("ETHUSDT", mark=1.0, ts_ms=time.monotonic_ns())
+        due = time.perf_counter() + 0.0002
+        while time.perf_counter() < due:
+            pass
+    w.close()
+
+def pct(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def main():
+    args = parse_args()
+    ctx = mp.get_context("fork")
+    writer = SnapshotWriter(args.name, 256)
+    reader = None
+    try:
+        for s in SYMBOLS:
+            writer.update(s, mark=1.0, bid=1.0, ask=1.0, bid_qty=1.0, ask_qty=1.0, funding=0.0, ts_ms=0)
+        reader = SnapshotReader(args.name)
+        msg_mark = {"stream": "btcusdt@markPrice@1s",
+                    "data": {"e": "markPriceUpdate", "E": 1700000000000, "s": "BTCUSDT", "p": "60000.1", "r": "0.0001"}}
+        msg_book = {"e": "bookTicker", "T": 1700000000000, "s": "BTCUSDT", "b": "60000.0", "B": "1.5",
+                    "a": "60000.2", "A": "2.5"}
+
+        def w_full(n):
+            for i in range(n):
+                writer.update("BTCUSDT", 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, i)
+
+        def w_mark(n):
+            for i in range(n):
+                writer.update("BTCUSDT", mark=float(i))
+
+        def w_msg(n):
+            for i in range(n):
+                writer.on_message(msg_mark if i & 1 else msg_book)
+
+        def r_get(n):
+            for _ in range(n):
+                reader.get("BTCUSDT")
+
+        def r_mark(n):
+            for _ in range(n):
+                reader.mark("BTCUSDT")
+
+        def r_dict(n):
+            # Baseline: the same lookup from a per-process dict kept by a local subscription
+            local = {"BTCUSDT": (1, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 0)}
+            for _ in range(n):
+                local.get("BTCUSDT")
+
+        print(f"{'operation':>32} | {'ns/op':>8} | {'ops/s':>10}")
+        for label, fn in (("writer update (all fields)", w_full), ("writer update (mark only)", w_mark),
+                          ("writer on_message (mark/book)", w_msg), ("reader get (idle)", r_get),
+                          ("reader mark (idle)", r_mark), ("baseline dict lookup", r_dict)):
+            ns = per_op_ns(fn, args.ops)
+            print(f"{label:>32} | {ns:>8.0f} | {1e9 / ns:>10.0f}")
+        writer.close()
+        writer = None
+
+        # Reader cost and consistency while another process rewrites the slot flat out
+        stop = ctx.Event()
+        child = ctx.Process(target=hammer, args=(args.name, stop, True))
+        child.start()
+        time.sleep(0.2)
+        reads = torn = empty = 0
+        retries0 = reader.retries
+        t0 = time.perf_counter_ns()
+        deadline = time.perf_counter() + args.seconds
+        while time.perf_counter() < deadline:
+            for _ in range(1000):
+                snap = reader.get("BTCUSDT")
+                if snap is None:
+                    empty += 1
+                elif not (snap.mark == snap.bid == snap.ask == snap.bid_qty == snap.ask_qty == snap.funding
+                          == snap.ts_ms):
+                    torn += 1
+            reads += 1000
+        get_ns = (time.perf_counter_ns() - t0) / reads
+        bad_marks = 0
+        t0 = time.perf_counter_ns()
+        for _ in range(args.ops):
+            # The writer only ever publishes marks >= 2: anything else is a torn or zeroed load
+            m = reader.mark("BTCUSDT")
+            if m is None or m < 2:
+                bad_marks += 1
+        mark_ns = (time.perf_counter_ns() - t0) / args.ops
+        stop.set()
+        child.join()
+        retried = reader.retries - retries0
+        print(f"under a writer process: get {get_ns:.0f} ns/op, mark {mark_ns:.0f} ns/op | {reads} gets, "
+              f"{retried} retries ({retried / reads:.2%}), torn {torn}, gave up {empty}, bad marks {bad_marks}")
+
+        # Writer-to-reader propagation across processes (monotonic clock is host-wide)
+        stop = ctx.Event()
+        child = ctx.Process(target=ticker, args=(args.name, stop, args.samples))
+        child.start()
+        lat = []
+        last = reader.get("ETHUSDT").seq
+        deadline = time.perf_counter() + max(args.seconds, args.samples * 0.0005 + 5)
+        while len(lat) < args.samples and child.is_alive() and time.perf_counter() < deadline:
+            snap = reader.get("ETHUSDT")
+            if snap is not None and snap.seq != last:
+                lat.append((time.monotonic_ns() - snap.ts_ms) / 1000)
+                last = snap.seq
+            time.sleep(0)  # a bot polls between other work; do not starve the writer of the CPU
+        stop.set()
+        child.join()
+        if lat:
+            print(f"propagation (polling reader, {os.cpu_count()} CPUs): p50 {pct(lat, 0.5):.1f} us | "
+                  f"p99 {pct(lat, 0.99):.1f} us | max {max(lat):.1f} us over {len(lat)} updates")
+    finally:
+        if reader is not None:
+            reader.close()
+        if writer is not None:
+            writer.close()
+        SnapshotWriter(args.name, 256).close(unlink=True)
+
+if __name__ == "__main__":
+    main()
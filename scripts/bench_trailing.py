@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep benchmark logs out of the real bot.log
+os.environ.setdefault("BOT_LOG_PATH", os.path.join(tempfile.gettempdir(), "bench_bot.log"))
+
+from src.common import FakeClient
+from src.advanced.trailing import TrailingEngine, replay
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark trailing-stop updates/sec across many brackets")
+    p.add_argument("--brackets", type=int, default=500, help="Number of trailed brackets (default 500)")
+    p.add_argument("--symbols", type=int, default=10, help="Symbols the brackets are spread over (default 10)")
+    p.add_argument("--updates", type=int, default=200000, help="Mark price updates to replay (default 200000)")
+    p.add_argument("--rateHz", type=float, default=10.0, help="Update rate per symbol in recorded time (default 10/s)")
+    return p.parse_args()
+
+def write_prices(path: str, symbols, updates: int, rate_hz: float, seed: int = 7):
+    rng = random.Random(seed)
+    prices = {s: 100.0 for s in symbols}
+    step_ms = 1000.0 / rate_hz / len(symbols)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("ts,symbol,price\n")
+        for i in range(updates):
+            s = symbols[i % len(symbols)]
+            prices[s] = max(1.0, prices[s] * (1 + rng.gauss(0.00005, 0.0008)))
+            f.write(f"{int(i * step_ms)},{s},{prices[s]:.4f}\n")
+
+def build(engine: TrailingEngine, brackets: int, symbols):
+    for i in range(brackets):
+        s = symbols[i % len(symbols)]
+        # Mix of longs and shorts with different trail widths
+        if i % 2:
+            engine.add(f"BRK-{i:05d}", s, "SELL", 1.0, 90.0, 2.0 + (i % 7), 0.01, threshold_ticks=10)
+        else:
+            engine.add(f"BRK-{i:05d}", s, "BUY", 1.0, 110.0, 2.0 + (i % 7), 0.01, threshold_ticks=10)
+
+def main():
+    args = parse_args()
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "marks.csv")
+        write_prices(path, symbols, args.updates, args.rateHz)
+
+        for label, client in (("offline", None), ("FakeClient", FakeClient())):
+            engine = TrailingEngine(client=client, min_amend_interval=1.0)
+            build(engine, args.brackets, symbols)
+            t0 = time.perf_counter()
+            n = replay(engine, path)
+            elapsed = time.perf_counter() - t0
+            triggered = sum(1 for st in engine.by_link.values() if st.triggered)
+            print(f"{label:10s}: {n} updates x {args.brackets} brackets in {elapsed:.3f}s "
+                  f"= {n / elapsed:,.0f} updates/s | amends {engine.amends_sent} | triggered {triggered}")
+
+        # Same run without coalescing, to show what it saves
+        engine = TrailingEngine(client=None, min_amend_interval=0.0)
+        build(engine, args.brackets, symbols)
+        replay(engine, path)
+        print(f"uncoalesced amends would have been {engine.amends_sent}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+import sys
+import argparse
+from collections import Counter
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.logschema import read_records, parse_record, convert
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Convert bot.log (JSON lines) <-> bot.bin (binary frames); direction by extension")
+    p.add_argument("src", help="Source log (.log/.jsonl or .bin)")
+    p.add_argument("dst", nargs="?", help="Destination log (.log/.jsonl or .bin)")
+    p.add_argument("--validate", action="store_true", help="Validate every record against the typed schema")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.src):
+        print(f"Log not found: {args.src}")
+        sys.exit(1)
+
+    if args.validate:
+        kinds = Counter()
+        errors = 0
+        for i, rec in enumerate(read_records(args.src)):
+            try:
+                kinds[type(parse_record(rec)).__name__] += 1
+            except Exception as e:
+                errors += 1
+                print(f"record {i}: {e}")
+        print(", ".join(f"{k}={v}" for k, v in kinds.most_common()) + f", invalid={errors}")
+
+    if args.dst:
+        n = convert(args.src, args.dst)
+        print(f"Converted {n} records: {args.src} ({os.path.getsize(args.src)} bytes) -> "
+              f"{args.dst} ({os.path.getsize(args.dst)} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import argparse
+from datetime import datetime, timezone
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.common import validate_symbol, log_error
+from src.history import DATA_DIR, INTERVAL_MS, FapiHttp, download_klines, download_agg_trades
+
+def _to_ms(day: str) -> int:
+    return int(datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Download klines/aggTrades into the local memory-mapped store (resumable)")
+    p.add_argument("symbols", nargs="+", help="e.g., BTCUSDT ETHUSDT")
+    p.add_argument("--start", required=True, help="UTC start date YYYY-MM-DD")
+    p.add_argument("--end", help="UTC end date YYYY-MM-DD (exclusive, default now)")
+    p.add_argument("--interval", default="1m", choices=list(INTERVAL_MS), help="Kline interval (default 1m)")
+    p.add_argument("--aggTrades", action="store_true", help="Also download aggTrades")
+    p.add_argument("--workers", type=int, default=4, help="Parallel chunk fetches per symbol (default 4)")
+    p.add_argument("--dataDir", default=DATA_DIR, help="Store root (default ./data)")
+    p.add_argument("--baseUrl", help="Override the futures REST base URL (e.g. a local stand-in)")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    try:
+        symbols = [validate_symbol(s) for s in args.symbols]
+        start_ms = _to_ms(args.start)
+        end_ms = _to_ms(args.end) if args.end else int(time.time() * 1000)
+        if start_ms >= end_ms:
+            raise ValueError("start must be before end")
+        if args.workers < 1:
+            raise ValueError("workers must be >= 1")
+    except Exception as e:
+        log_error({"action": "validate", "type": "HISTORY", "error": str(e)})
+        print(f"Input error: {e}")
+        sys.exit(1)
+
+    http = FapiHttp(base_url=args.baseUrl)
+    for symbol in symbols:
+        t0 = time.perf_counter()
+        try:
+            rows = download_klines(symbol, args.interval, start_ms, end_ms, args.dataDir, http, args.workers)
+            print(f"{symbol} klines {args.interval}: +{rows} rows in {time.perf_counter() - t0:.1f}s")
+            if args.aggTrades:
+                t0 = time.perf_counter()
+                rows = download_agg_trades(symbol, start_ms, end_ms, args.dataDir, http, args.workers)
+                print(f"{symbol} aggTrades: +{rows} rows in {time.perf_counter() - t0:.1f}s")
+        except Exception as e:
+            log_error({"action": "history_download", "symbol": symbol, "result": "error", "error": str(e)})
+            print(f"{symbol} failed: {e}")
+    print(f"{http.requests} requests")
+
+if __name__ == "__main__":
+    main()
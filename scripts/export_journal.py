@@ -1,12 +1,19 @@
 import os
+import sys
 import csv
-import json
-from datetime import datetime
+
+from pydantic import ValidationError
 
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(PROJECT_ROOT)  # go up from scripts/ to project root
-LOG_PATH = os.path.join(PROJECT_ROOT, "bot.log")
+sys.path.append(PROJECT_ROOT)
+
+from src.common import BOT_LOG_PATH, BOT_BIN_PATH, LOG_FORMAT
+from src.logschema import read_records, parse_record
+
+LOG_PATH = BOT_BIN_PATH if LOG_FORMAT == "binary" else BOT_LOG_PATH
 OUT_CSV = os.path.join(PROJECT_ROOT, "trades.csv")
+MAX_SKIP_REPORTS = 10  # skipped records printed individually; the rest are only counted
 
 FIELDS = [
     "ts",
@@ -32,17 +39,27 @@ def main():
         return
 
     rows = []
-    with open(LOG_PATH, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                rec = json.loads(line)
-            except Exception:
-                continue
-            row = {k: rec.get(k, "") for k in FIELDS}
-            rows.append(row)
+    skipped = 0
+    for n, raw in enumerate(read_records(LOG_PATH), 1):
+        # Typed records coalesce order fields nested under "request"/"req"
+        try:
+            rec = parse_record(raw).model_dump()
+        except Exception as e:
+            # Never drop a row silently: the first few are shown, all are counted
+            skipped += 1
+            if skipped <= MAX_SKIP_REPORTS:
+                if isinstance(e, ValidationError):
+                    err = e.errors()[0]
+                    reason = f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                else:
+                    reason = str(e) or type(e).__name__
+                print(f"Skipping record {n} ({raw.get('action')}): {reason}", file=sys.stderr)
+            continue
+        row = {k: "" if rec.get(k) is None else rec[k] for k in FIELDS}
+        rows.append(row)
+
+    if skipped:
+        print(f"Skipped {skipped} records that do not match the log schema")
 
     if not rows:
         print("No log entries to export.")
@@ -0,0 +1,137 @@
+import os
+import sys
+import json
+import time
+import random
+import signal
+import argparse
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.common import load_env, log_info, log_error, validate_symbol
+from src.snapshot import DEFAULT_NAME, SnapshotWriter
+from src.advanced.trailing import read_prices
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Feed the host's shared-memory market snapshot (one feeder per host)")
+    p.add_argument("symbols", nargs="+", help="e.g., BTCUSDT ETHUSDT (a replay publishes only these)")
+    p.add_argument("--name", help=f"Segment name (default MARKET_SHM or {DEFAULT_NAME})")
+    p.add_argument("--capacity", type=int, default=256, help="Symbol slots in the segment (default 256)")
+    p.add_argument("--replay", help="Feed from a recorded file instead: .jsonl stream messages or .csv ts,symbol,price")
+    p.add_argument("--speed", type=float, default=1.0, help="Replay speed vs recorded time (default 1, 0 = no pacing)")
+    p.add_argument("--loop", action="store_true", help="Restart the replay file at its end")
+    p.add_argument("--synthetic", action="store_true", help="Feed a random walk for the given symbols instead")
+    p.add_argument("--rate", type=float, default=10.0, help="Synthetic updates per second per symbol (default 10)")
+    p.add_argument("--unlink", action="store_true", help="Remove the segment on exit (default: keep it for a restart)")
+    return p.parse_args()
+
+def read_messages(path: str):
+    """Yields (ts_seconds, stream message) from a recorded file; CSV rows become markPriceUpdate messages."""
+    if path.endswith(".csv"):
+        for ts, symbol, price in read_prices(path):
+            yield ts, {"e": "markPriceUpdate", "E": int(ts * 1000), "s": symbol, "p": str(price)}
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            msg = json.loads(line)
+            data = msg.get("data", msg)
+            yield float(data.get("E") or data.get("T") or 0) / 1000, msg
+
+def replay(writer: SnapshotWriter, path: str, symbols, speed: float, loop: bool):
+    wanted = set(symbols)
+    while True:
+        start = first = None
+        for ts, msg in read_messages(path):
+            if msg.get("data", msg).get("s") not in wanted:
+                continue
+            if speed > 0:
+                if start is None:
+                    start, first = time.monotonic(), ts
+                delay = (ts - first) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            writer.on_message(msg)
+        if not loop:
+            return
+
+def synthetic(writer: SnapshotWriter, symbols, rate: float):
+    rng = random.Random(7)
+    marks = {s: 100.0 * (i + 1) for i, s in enumerate(symbols)}
+    interval = 1.0 / (rate * len(symbols))
+    due = time.monotonic()
+    while True:
+        for s in symbols:
+            mark = marks[s] = marks[s] * (1 + rng.gauss(0, 1e-4))
+            spread = mark * 1e-5
+            writer.update(s, mark=mark, bid=mark - spread, ask=mark + spread, bid_qty=rng.uniform(0.1, 5),
+                          ask_qty=rng.uniform(0.1, 5), funding=0.0001, ts_ms=int(time.time() * 1000))
+            due += interval
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+def main():
+    args = parse_args()
+    cfg = load_env()
+    name = args.name or cfg["MARKET_SHM"] or DEFAULT_NAME
+    try:
+        symbols = [validate_symbol(s) for s in args.symbols]
+        if args.capacity < len(symbols):
+            raise ValueError("capacity must be >= the number of symbols")
+        if args.replay and args.synthetic:
+            raise ValueError("give at most one of --replay and --synthetic")
+        if args.rate <= 0 or args.speed < 0:
+            raise ValueError("rate must be > 0 and speed >= 0")
+    except Exception as e:
+        log_error({"action": "validate", "type": "FEEDER", "error": str(e)})
+        print(f"Input error: {e}")
+        sys.exit(1)
+
+    try:
+        writer = SnapshotWriter(name, args.capacity)
+    except (OSError, ValueError) as e:
+        log_error({"action": "feeder_start", "name": name, "error": str(e)})
+        print(f"Error: {e}")
+        sys.exit(1)
+    source = "replay" if args.replay else "synthetic" if args.synthetic else "stream"
+    log_info({"action": "feeder_start", "name": name, "symbols": symbols, "source": source})
+    print(f"Feeding snapshot {name} ({source}, {len(symbols)} symbols); readers set MARKET_SHM={name} (Ctrl+C stops)",
+          flush=True)
+
+    def _stop(signum, frame):
+        raise KeyboardInterrupt
+    # Supervisors stop the feeder with SIGTERM; shut down the same way as Ctrl+C
+    signal.signal(signal.SIGTERM, _stop)
+    t0 = time.perf_counter()
+    twm = None
+    try:
+        if args.replay:
+            replay(writer, args.replay, symbols, args.speed, args.loop)
+        elif args.synthetic:
+            synthetic(writer, symbols, args.rate)
+        else:
+            from binance import ThreadedWebsocketManager
+            # Market streams need no keys; one multiplexed socket carries every symbol
+            twm = ThreadedWebsocketManager(api_key=cfg["API_KEY"], api_secret=cfg["API_SECRET"])
+            twm.start()
+            streams = [f"{s.lower()}@markPrice@1s" for s in symbols] + [f"{s.lower()}@bookTicker" for s in symbols]
+            twm.start_futures_multiplex_socket(callback=writer.on_message, streams=streams)
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if twm is not None:
+            twm.stop()
+        elapsed = time.perf_counter() - t0
+        log_info({"action": "feeder_stop", "name": name, "updates": writer.updates, "unlink": args.unlink})
+        print(f"Published {writer.updates} updates in {elapsed:.1f}s "
+              f"({writer.updates / max(elapsed, 1e-9):.0f}/s)")
+        writer.close(unlink=args.unlink)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import argparse
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.common import load_env, get_client, account_path, set_log_account
+from src.journal import JOURNAL_PATH, IntentJournal, recover, compact
+from src.accounts import load_accounts
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Reconcile the order intent journal with the exchange after a crash")
+    p.add_argument("--policy", default="resume", choices=["resume", "cancel"],
+                   help="resume: send legs that never went out; cancel: cancel the link's resting orders and abandon the rest")
+    p.add_argument("--compact", action="store_true", help="Drop finished links from the journal afterwards")
+    p.add_argument("--account", help="Recover orders.<account>.journal with that account's credentials (see BINANCE_ACCOUNTS)")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    cfg = load_env()
+    api_key, api_secret = cfg["API_KEY"], cfg["API_SECRET"]
+    if args.account:
+        acct = next((a for a in load_accounts() if a["name"] == args.account.lower()), None)
+        if acct is None:
+            print(f"Unknown account: {args.account}")
+            sys.exit(1)
+        api_key, api_secret = acct["API_KEY"], acct["API_SECRET"]
+        set_log_account(acct["name"])
+    path = account_path(cfg["JOURNAL_PATH"] or JOURNAL_PATH, args.account and args.account.lower())
+    if not os.path.exists(path):
+        print(f"Journal not found: {path}")
+        return
+
+    client = get_client(api_key, api_secret, cfg["MODE"])
+    journal = IntentJournal(path)
+    try:
+        summary = recover(client, journal, policy=args.policy)
+    finally:
+        journal.close()
+    print(f"Recovered {summary['links']} unfinished links: found={summary['found']} "
+          f"resent={summary['resent']} cancelled={summary['cancelled']} failed={summary['failed']} "
+          f"skipped={summary['skipped']}")
+
+    if args.compact:
+        kept = compact(path)
+        print(f"Compacted journal: {kept} records kept")
+
+if __name__ == "__main__":
+    main()
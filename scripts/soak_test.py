@@ -0,0 +1,537 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import subprocess
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Add project root to path so we can import from src
+sys.path.append(ROOT)
+# Keep soak logs and journals out of the project directory unless asked otherwise
+_tmp = tempfile.mkdtemp(prefix="soak_")
+os.environ.setdefault("BOT_LOG_PATH", os.path.join(_tmp, "bot.log"))
+os.environ.setdefault("JOURNAL_PATH", os.path.join(_tmp, "orders.journal"))
+
+from src.common import (
+    BOT_LOG_PATH,
+    BOT_BIN_PATH,
+    LOG_FORMAT,
+    OPEN_STATUSES,
+    FakeClient,
+    load_env,
+    get_client,
+    validate_symbol,
+    validate_side,
+    validate_qty,
+    validate_price,
+)
+from src.journal import open_journal
+from src.market_orders import place_market
+from src.limit_orders import place_limit
+from src.runtime import run_once
+from src.advanced.stop_limit import StopLimitStrategy
+from src.advanced.oco import place_oco
+from src.advanced.bracket import place_bracket
+from src.advanced.twap import run_twap
+from src.stubserver import wait_ready
+
+DEFAULT_MIX = "market=4,limit=3,stop_limit=1,oco=1,bracket=1"
+
+Resting = List[Tuple[str, Any]]  # (symbol, orderId) left on the book by an operation
+
+
+# --- operations: CLI-style string inputs through the validators and the real order modules ---------
+
+def op_market(client: Any, journal: Any, rng: random.Random) -> Resting:
+    # Alternate sides so the simulated position stays flat over hours
+    side = validate_side(rng.choice(("buy", "sell")))
+    place_market(client, validate_symbol("btcusdt"), side, validate_qty("0.001"))
+    return []
+
+def op_limit(client: Any, journal: Any, rng: random.Random) -> Resting:
+    price = validate_price(f"{rng.uniform(55000, 59000):.1f}")
+    resp = place_limit(client, validate_symbol("btcusdt"), validate_side("buy"), validate_qty("0.001"), price)
+    return [("BTCUSDT", resp.get("orderId"))]
+
+def op_stop_limit(client: Any, journal: Any, rng: random.Random) -> Resting:
+    stop = validate_price("59000")
+    resp = run_once(StopLimitStrategy(validate_symbol("btcusdt"), validate_side("sell"), validate_qty("0.001"),
+                                      stop, validate_price("58900")), client)
+    return [("BTCUSDT", resp.get("orderId"))]
+
+def op_oco(client: Any, journal: Any, rng: random.Random) -> Resting:
+    res = place_oco(client, validate_symbol("ethusdt"), validate_side("sell"), validate_qty("0.01"),
+                    validate_price("3100"), validate_price("2900"))
+    return [("ETHUSDT", res["tp"]["orderId"]), ("ETHUSDT", res["sl"]["orderId"])]
+
+def op_bracket(client: Any, journal: Any, rng: random.Random) -> Resting:
+    res = place_bracket(client, validate_symbol("btcusdt"), validate_side("buy"), validate_qty("0.001"), "LIMIT",
+                        validate_price("58000"), validate_price("62000"), validate_price("57000"), journal=journal)
+    return [("BTCUSDT", res[leg]["orderId"]) for leg in ("entry", "tp", "sl") if "orderId" in res.get(leg, {})]
+
+def op_twap(client: Any, journal: Any, rng: random.Random) -> Resting:
+    side = validate_side(rng.choice(("buy", "sell")))
+    run_twap(client, validate_symbol("btcusdt"), side, validate_qty("0.003"), 3, 0.0, journal=journal)
+    return []
+
+OPS: Dict[str, Callable[[Any, Any, random.Random], Resting]] = {
+    "market": op_market,
+    "limit": op_limit,
+    "stop_limit": op_stop_limit,
+    "oco": op_oco,
+    "bracket": op_bracket,
+    "twap": op_twap,
+}
+
+
+class LatencyHist:
+    """
+    Log-bucketed latency histogram (1us to 1000s, about 2.3% per bucket).
+    Memory is constant however long the run, so the harness does not show
+    up in the memory growth it is measuring.
+    """
+
+    PER_DECADE = 100
+    LO = 1e-6
+    SIZE = 9 * PER_DECADE + 1
+
+    __slots__ = ("counts", "n", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * self.SIZE
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, sec: float):
+        i = int(math.log10(max(sec, self.LO) / self.LO) * self.PER_DECADE)
+        self.counts[min(i, self.SIZE - 1)] += 1
+        self.n += 1
+        self.total += sec
+        if sec > self.max:
+            self.max = sec
+
+    def pct(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-quantile, in seconds (capped at the observed max)."""
+        if not self.n:
+            return 0.0
+        rank = q * self.n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(self.LO * 10 ** ((i + 1) / self.PER_DECADE), self.max)
+        return self.max
+
+    def summary_ms(self) -> Dict[str, float]:
+        return {"p50": round(self.pct(0.5) * 1000, 3), "p90": round(self.pct(0.9) * 1000, 3),
+                "p99": round(self.pct(0.99) * 1000, 3), "p999": round(self.pct(0.999) * 1000, 3),
+                "max": round(self.max * 1000, 3), "mean": round(self.total / self.n * 1000, 3) if self.n else 0.0}
+
+
+class Stats:
+    """Counters shared by the worker threads; `window` is reset at every report."""
+
+    def __init__(self, kinds: List[str]):
+        self.lock = threading.Lock()
+        self.latency = LatencyHist()   # from the scheduled send time (includes queueing)
+        self.service = LatencyHist()   # from the moment a worker picked the operation up
+        self.window = LatencyHist()
+        self.by_kind = {k: LatencyHist() for k in kinds}
+        self.errors_by_kind = {k: 0 for k in kinds}
+        self.errors: Dict[str, int] = {}
+        self.ok = 0
+        self.failed = 0
+        self.dropped = 0
+        self.cancels = 0
+        self.inflight = 0
+        self.window_ok = 0
+        self.window_failed = 0
+
+    def record(self, kind: str, latency: float, service: float, err: Optional[str]):
+        with self.lock:
+            self.inflight -= 1
+            self.latency.add(latency)
+            self.service.add(service)
+            self.window.add(latency)
+            self.by_kind[kind].add(service)
+            if err is None:
+                self.ok += 1
+                self.window_ok += 1
+            else:
+                self.failed += 1
+                self.window_failed += 1
+                self.errors_by_kind[kind] += 1
+                self.errors[err] = self.errors.get(err, 0) + 1
+
+    def take_window(self) -> Tuple[LatencyHist, int, int]:
+        with self.lock:
+            win, ok, failed = self.window, self.window_ok, self.window_failed
+            self.window, self.window_ok, self.window_failed = LatencyHist(), 0, 0
+        return win, ok, failed
+
+
+def error_key(e: Exception) -> str:
+    """Group errors by exchange code (or exception type) for the results file."""
+    s = str(e)
+    if "code=" in s:
+        return "code=" + s.split("code=", 1)[1].split(")", 1)[0]
+    return type(e).__name__
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in OPS:
+            raise ValueError(f"unknown operation '{name}' (choose from {', '.join(OPS)})")
+        w = float(weight or 1)
+        if w < 0:
+            raise ValueError("mix weights must be >= 0")
+        if w:
+            mix.append((name, w))
+    if not mix:
+        raise ValueError("mix has no operation with a positive weight")
+    return mix
+
+
+def parse_duration(s: str) -> float:
+    """Seconds from '90', '90s', '30m' or '2h'."""
+    s = s.strip().lower()
+    scale = {"s": 1, "m": 60, "h": 3600}.get(s[-1:], None)
+    value = float(s[:-1] if scale else s)
+    if value <= 0:
+        raise ValueError("duration must be > 0")
+    return value * (scale or 1)
+
+
+def rss_mb() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def slope_per_min(points: List[Tuple[float, float]]) -> float:
+    """Least-squares slope of (seconds, value) points, per minute."""
+    if len(points) < 2:
+        return 0.0
+    n = len(points)
+    mx = sum(t for t, _ in points) / n
+    my = sum(v for _, v in points) / n
+    var = sum((t - mx) ** 2 for t, _ in points)
+    if not var:
+        return 0.0
+    return sum((t - mx) * (v - my) for t, v in points) / var * 60
+
+
+def git_version() -> str:
+    try:
+        out = subprocess.run(["git", "-C", ROOT, "describe", "--always", "--dirty"], capture_output=True,
+                             text=True, timeout=10)
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def start_stub(args) -> Tuple[subprocess.Popen, str]:
+    """Run scripts/stub_exchange.py in its own process so its memory and log stay out of the numbers."""
+    env = dict(os.environ, BOT_LOG_PATH=os.path.join(_tmp, "stub.log"), LOG_FORMAT="json")
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "scripts", "stub_exchange.py"), "--port", "0",
+         "--latencyMs", str(args.latencyMs), "--jitterMs", str(args.jitterMs), "--errorRate", str(args.errorRate)],
+        stdout=subprocess.PIPE, text=True, env=env)
+    line = proc.stdout.readline()
+    if "http://" not in line:
+        proc.kill()
+        raise RuntimeError(f"stub exchange did not start: {line.strip()!r}")
+    return proc, line.strip().rsplit(" ", 1)[-1]
+
+
+def make_client(args) -> Any:
+    if args.target == "fake":
+        client = get_client("", "", "dryrun")
+        client.latency_ms = args.latencyMs
+        client.jitter_ms = args.jitterMs
+        client.error_rate = args.errorRate
+        return client
+    # Live code path (python-binance, HTTP) against the local stub only; real keys are never sent
+    os.environ["BINANCE_FAPI_URL"] = args.stubUrl
+    return get_client("stub", "stub", "live")
+
+
+def cancel_resting(client: Any, resting: Resting, stats: Stats):
+    """Cancel what an operation left on the book so exposure and open-order counts stay bounded."""
+    risk = getattr(client, "risk", None)
+    for symbol, order_id in resting:
+        if order_id is None:
+            continue
+        try:
+            client.futures_cancel_order(symbol=symbol, orderId=order_id)
+            if risk is not None:
+                risk.on_cancel(str(order_id))
+            with stats.lock:
+                stats.cancels += 1
+        except Exception as e:
+            with stats.lock:
+                key = "cancel " + error_key(e)
+                stats.errors[key] = stats.errors.get(key, 0) + 1
+
+
+def prune_fake_book(client: Any):
+    # The simulated exchange keeps every order it has seen; that is exchange
+    # state, not bot memory, so closed orders are dropped between reports
+    if not isinstance(client, FakeClient):
+        return
+    for oid, order in list(client.orders.items()):
+        if order["status"] not in OPEN_STATUSES:
+            client.orders.pop(oid, None)
+            if client.client_ids.get(order["clientOrderId"]) == oid:
+                client.client_ids.pop(order["clientOrderId"], None)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Load / soak test of the order pipeline against FakeClient or a local stub")
+    p.add_argument("--target", choices=["fake", "stub"], default="fake",
+                   help="fake: in-process FakeClient; stub: python-binance over HTTP to scripts/stub_exchange.py")
+    p.add_argument("--stubUrl", help="Use an already running stub exchange instead of starting one")
+    p.add_argument("--rate", type=float, default=50.0, help="Operations per second, open loop (default 50)")
+    p.add_argument("--duration", default="60s", help="Run time, e.g. 90s, 30m, 4h (default 60s)")
+    p.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted operation mix (default {DEFAULT_MIX})")
+    p.add_argument("--workers", type=int, default=16, help="Concurrent operations (default 16)")
+    p.add_argument("--latencyMs", type=float, default=20.0, help="Injected round trip per request (default 20)")
+    p.add_argument("--jitterMs", type=float, default=5.0, help="Injected random extra round trip (default 5)")
+    p.add_argument("--errorRate", type=float, default=0.0, help="Fraction of order requests failing with -1001")
+    p.add_argument("--reportSec", type=float, default=10.0, help="Seconds between progress lines (default 10)")
+    p.add_argument("--warmupSec", type=float, default=10.0, help="Excluded from the memory growth fit (default 10)")
+    p.add_argument("--traceMemory", action="store_true", help="Report the top allocation growth sites (slower)")
+    p.add_argument("--seed", type=int, default=1, help="Seed for sides, prices and the operation mix")
+    p.add_argument("--out", help="Results JSON path (default soak-<UTC time>.json in the working directory)")
+    p.add_argument("--compare", help="Earlier results JSON to print deltas against")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    try:
+        duration = parse_duration(args.duration)
+        mix = parse_mix(args.mix)
+        if args.rate <= 0:
+            raise ValueError("rate must be > 0")
+        if args.workers < 1:
+            raise ValueError("workers must be >= 1")
+        if not 0 <= args.errorRate < 1:
+            raise ValueError("errorRate must be in [0, 1)")
+        if args.stubUrl and args.target != "stub":
+            raise ValueError("--stubUrl requires --target stub")
+        baseline = None
+        if args.compare:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+    except Exception as e:
+        print(f"Input error: {e}")
+        sys.exit(1)
+
+    stub = None
+    if args.target == "stub" and not args.stubUrl:
+        stub, args.stubUrl = start_stub(args)
+    if args.target == "stub":
+        err = wait_ready(args.stubUrl)
+        if err is not None:
+            print(f"Stub exchange at {args.stubUrl} not reachable: {err}")
+            sys.exit(1)
+
+    cfg = load_env()
+    client = make_client(args)
+    journal = open_journal(cfg)
+    log_path = BOT_BIN_PATH if LOG_FORMAT == "binary" else BOT_LOG_PATH
+    journal_path = journal.path if journal is not None else ""
+    kinds = [k for k, _ in mix]
+    weights = [w for _, w in mix]
+    stats = Stats(kinds)
+    rng = random.Random(args.seed)
+    thread_rng = threading.local()
+
+    def run_op(kind: str, t_sched: float):
+        r = getattr(thread_rng, "rng", None)
+        if r is None:
+            r = thread_rng.rng = random.Random(rng.random())
+        t0 = time.perf_counter()
+        err = None
+        resting: Resting = []
+        try:
+            resting = OPS[kind](client, journal, r)
+        except Exception as e:
+            err = error_key(e)
+        t1 = time.perf_counter()
+        stats.record(kind, t1 - t_sched, t1 - t0, err)
+        cancel_resting(client, resting, stats)
+
+    print(f"Soak: target={args.target}{' ' + args.stubUrl if args.target == 'stub' else ''} rate={args.rate:g}/s "
+          f"duration={duration:g}s workers={args.workers} RTT={args.latencyMs:g}+{args.jitterMs:g}ms "
+          f"errors={args.errorRate:g} mix={','.join(f'{k}={w:g}' for k, w in mix)}")
+    print(f"log={log_path} journal={journal_path or 'off'}")
+    print(f"{'t s':>7} | {'ops/s':>7} | {'ok':>7} | {'err':>5} | {'drop':>5} | {'p50 ms':>7} | {'p99 ms':>8} | "
+          f"{'RSS MB':>7} | {'log MB':>7}")
+
+    pool = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="soak")
+    max_inflight = args.workers * 4
+    log0, journal0 = file_size(log_path), file_size(journal_path)
+    intervals: List[Dict[str, Any]] = []
+    rss_points: List[Tuple[float, float]] = []
+    snap0 = None
+    started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    start = time.perf_counter()
+    end = start + duration
+    next_report = start + args.reportSec
+    warm = False
+    step = 1.0 / args.rate
+    t_next = start
+    try:
+        while t_next < end:
+            now = time.perf_counter()
+            if now < t_next:
+                time.sleep(min(t_next - now, 0.05))
+                continue
+            kind = rng.choices(kinds, weights)[0]
+            with stats.lock:
+                full = stats.inflight >= max_inflight
+                if full:
+                    stats.dropped += 1
+                else:
+                    stats.inflight += 1
+            if not full:
+                # Open loop: latency is measured from t_next, so falling behind shows up as queueing
+                pool.submit(run_op, kind, t_next)
+            t_next += step
+
+            if now >= next_report:
+                elapsed = now - start
+                win, ok, failed = stats.take_window()
+                prune_fake_book(client)
+                rss = rss_mb()
+                log_mb = (file_size(log_path) - log0) / 2 ** 20
+                with stats.lock:
+                    dropped = stats.dropped
+                row = {"t": round(elapsed, 1), "opsPerSec": round((ok + failed) / args.reportSec, 2), "ok": ok,
+                       "errors": failed, "dropped": dropped, "p50Ms": round(win.pct(0.5) * 1000, 3),
+                       "p99Ms": round(win.pct(0.99) * 1000, 3), "rssMb": round(rss, 2), "logMb": round(log_mb, 3)}
+                intervals.append(row)
+                print(f"{row['t']:>7.0f} | {row['opsPerSec']:>7.1f} | {ok:>7} | {failed:>5} | {dropped:>5} | "
+                      f"{row['p50Ms']:>7.2f} | {row['p99Ms']:>8.2f} | {rss:>7.1f} | {log_mb:>7.2f}", flush=True)
+                if elapsed >= args.warmupSec:
+                    if not warm:
+                        warm = True
+                        if args.traceMemory:
+                            tracemalloc.start(10)
+                            snap0 = tracemalloc.take_snapshot()
+                    rss_points.append((elapsed, rss))
+                next_report += args.reportSec
+    except KeyboardInterrupt:
+        print("Interrupted: draining in-flight operations")
+    pool.shutdown(wait=True)
+    wall = time.perf_counter() - start
+    prune_fake_book(client)
+    if journal is not None:
+        journal.sync()
+    rss_points.append((wall, rss_mb()))
+
+    top = []
+    if snap0 is not None:
+        diff = tracemalloc.take_snapshot().compare_to(snap0, "lineno")
+        top = [{"site": str(d.traceback[0]), "sizeKb": round(d.size_diff / 1024, 1), "count": d.count_diff}
+               for d in diff[:10]]
+        tracemalloc.stop()
+
+    ops = stats.ok + stats.failed
+    log_bytes = file_size(log_path) - log0
+    journal_bytes = file_size(journal_path) - journal0
+    results = {
+        "version": git_version(),
+        "python": platform.python_version(),
+        "started": started,
+        "config": {"target": args.target, "rate": args.rate, "durationS": duration, "mix": dict(mix),
+                   "workers": args.workers, "latencyMs": args.latencyMs, "jitterMs": args.jitterMs,
+                   "errorRate": args.errorRate, "logFormat": LOG_FORMAT, "journal": journal is not None},
+        "summary": {"wallS": round(wall, 3), "ops": ops, "ok": stats.ok, "errors": stats.failed,
+                    "dropped": stats.dropped, "cancels": stats.cancels,
+                    "throughputOps": round(ops / wall, 3),
+                    "latencyMs": stats.latency.summary_ms(), "serviceMs": stats.service.summary_ms(),
+                    "errorsByCode": stats.errors},
+        "byType": {k: {"ops": h.n, "errors": stats.errors_by_kind[k], **h.summary_ms()}
+                   for k, h in stats.by_kind.items()},
+        "memory": {"rssStartMb": round(rss_points[0][1], 2), "rssEndMb": round(rss_points[-1][1], 2),
+                   "growthKbPerMin": round(slope_per_min(rss_points) * 1024, 1), "top": top},
+        "logs": {"path": log_path, "bytes": log_bytes, "bytesPerOp": round(log_bytes / ops, 1) if ops else 0.0,
+                 "mbPerHour": round(log_bytes / 2 ** 20 / wall * 3600, 2),
+                 "journalBytes": journal_bytes, "journalBytesPerOp": round(journal_bytes / ops, 1) if ops else 0.0},
+        "intervals": intervals,
+    }
+
+    if journal is not None:
+        journal.close()
+    if stub is not None:
+        stub.terminate()
+        stub.wait(timeout=10)
+
+    out = args.out or f"soak-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    s, lat = results["summary"], results["summary"]["latencyMs"]
+    print(f"\n{ops} ops in {wall:.1f}s = {s['throughputOps']:.1f} ops/s ({stats.failed} errors, "
+          f"{stats.dropped} dropped, {stats.cancels} cancels)")
+    print(f"latency ms: p50 {lat['p50']:.2f} | p90 {lat['p90']:.2f} | p99 {lat['p99']:.2f} | "
+          f"p99.9 {lat['p999']:.2f} | max {lat['max']:.2f}")
+    print(f"{'operation':>10} | {'ops':>7} | {'err':>5} | {'p50 ms':>7} | {'p99 ms':>8} | {'max ms':>8}")
+    for k, row in results["byType"].items():
+        print(f"{k:>10} | {row['ops']:>7} | {row['errors']:>5} | {row['p50']:>7.2f} | {row['p99']:>8.2f} | "
+              f"{row['max']:>8.2f}")
+    if stats.errors:
+        print("errors: " + ", ".join(f"{k} x{v}" for k, v in sorted(stats.errors.items(), key=lambda kv: -kv[1])))
+    m, lg = results["memory"], results["logs"]
+    print(f"memory: RSS {m['rssStartMb']:.1f} -> {m['rssEndMb']:.1f} MB, growth {m['growthKbPerMin']:.1f} KB/min")
+    for site in top:
+        print(f"  {site['sizeKb']:>9.1f} KB {site['count']:>+7} blocks  {site['site']}")
+    print(f"log: {lg['bytes'] / 2 ** 20:.2f} MB, {lg['bytesPerOp']:.0f} B/op, {lg['mbPerHour']:.1f} MB/hour | "
+          f"journal: {lg['journalBytesPerOp']:.0f} B/op")
+    print(f"results: {out}")
+
+    if baseline is not None:
+        b = baseline
+        rows = [
+            ("throughput ops/s", b["summary"]["throughputOps"], s["throughputOps"]),
+            ("p50 ms", b["summary"]["latencyMs"]["p50"], lat["p50"]),
+            ("p99 ms", b["summary"]["latencyMs"]["p99"], lat["p99"]),
+            ("service p50 ms", b["summary"]["serviceMs"]["p50"], s["serviceMs"]["p50"]),
+            ("RSS growth KB/min", b["memory"]["growthKbPerMin"], m["growthKbPerMin"]),
+            ("log B/op", b["logs"]["bytesPerOp"], lg["bytesPerOp"]),
+        ]
+        print(f"\nvs {args.compare} ({b.get('version', '?')} -> {results['version']})")
+        print(f"{'metric':>18} | {'baseline':>10} | {'this run':>10} | {'change':>8}")
+        for name, old, new in rows:
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            print(f"{name:>18} | {old:>10.2f} | {new:>10.2f} | {change:>8}")
+
+if __name__ == "__main__":
+    main()
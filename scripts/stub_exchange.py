@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+import argparse
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stubserver import StubExchange, serve, base_url
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Local futures REST stand-in with injected latency and errors")
+    p.add_argument("--host", default="127.0.0.1", help="Bind address (default 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8765, help="Port (default 8765, 0 = any free port)")
+    p.add_argument("--latencyMs", type=float, default=0.0, help="Added round trip per request (default 0)")
+    p.add_argument("--jitterMs", type=float, default=0.0, help="Random extra round trip, up to this (default 0)")
+    p.add_argument("--errorRate", type=float, default=0.0, help="Fraction of orders failing with -1001 (default 0)")
+    p.add_argument("--markPrice", type=float, default=60000.0, help="Mark price served by premiumIndex")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    if not 0 <= args.errorRate < 1:
+        print("Input error: errorRate must be in [0, 1)")
+        sys.exit(1)
+    exchange = StubExchange(args.latencyMs, args.jitterMs, args.errorRate, args.markPrice)
+    server = serve(exchange, args.host, args.port)
+    # The soak harness reads this line to find the port
+    print(f"Stub exchange listening on {base_url(server)}", flush=True)
+    print("Point the bot at it with MODE=live BINANCE_FAPI_URL=<url> (Ctrl+C stops)", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    server.shutdown()
+    print(f"Served {exchange.requests} requests")
+
+if __name__ == "__main__":
+    main()
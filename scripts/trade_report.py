@@ -0,0 +1,53 @@
+import os
+import sys
+import argparse
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from src.common import BOT_LOG_PATH
+from src.journal import JOURNAL_PATH
+from src.analytics import load_log, load_journal, execution_quality, order_type_stats
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Execution quality report: shortfall, VWAP, fill/retry rates, latency")
+    p.add_argument("--journal", default=os.getenv("JOURNAL_PATH") or JOURNAL_PATH, help="Order intent journal")
+    p.add_argument("--log", default=BOT_LOG_PATH, help="bot.log path (for retry counts)")
+    p.add_argument("--market", help="Optional market trades CSV with ts (ms), price, qty columns for VWAP comparison")
+    p.add_argument("--out", help="Optional CSV path for the per-linkId report")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.journal):
+        print(f"Journal not found: {args.journal}")
+        return
+
+    legs = load_journal(args.journal)
+    if legs.empty:
+        print("No journal entries to analyse.")
+        return
+    log = load_log(args.log) if os.path.exists(args.log) else None
+    market = None
+    if args.market:
+        market = pd.read_csv(args.market).sort_values("ts")
+        market["ts"] = market["ts"] / 1000.0
+
+    links = execution_quality(legs, market=market)
+    types = order_type_stats(legs, log)
+
+    with pd.option_context("display.width", 200, "display.max_columns", 30, "display.float_format", "{:.4f}".format):
+        print("Per-linkId execution quality:")
+        print(links)
+        print()
+        print("Per order type:")
+        print(types)
+
+    if args.out:
+        links.to_csv(args.out)
+        print(f"Wrote {len(links)} rows to {args.out}")
+
+if __name__ == "__main__":
+    main()
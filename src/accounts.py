@@ -0,0 +1,145 @@
+"""
+Daksh Binance Futures Trading Bot
+Multi-account / sub-account fan-out
+
+Loads N credential sets from .env, keeps one pooled client per account
+(each with its own time sync, risk limits and rate limiter) and runs one
+logical order on every account concurrently with per-account sizing.
+Each account logs to its own bot.<account>.log and orders.<account>.journal.
+"""
+
+import os
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.common import get_client, load_env, set_log_account, log_info, log_error
+from src.journal import open_journal
+
+ACCOUNT_NAME_CHARS = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_")
+
+
+def load_accounts(mode: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Reads BINANCE_ACCOUNTS=main,sub1,... and for each NAME:
+    BINANCE_API_KEY_<NAME>, BINANCE_API_SECRET_<NAME> and optional
+    ACCOUNT_SIZE_<NAME> (quantity multiplier, default 1.0). Keys are only
+    required outside dryrun (mode defaults to MODE).
+    """
+    live = (mode or load_env()["MODE"]).lower() != "dryrun"
+    names = [n.strip() for n in os.getenv("BINANCE_ACCOUNTS", "").split(",") if n.strip()]
+    if not names:
+        raise ValueError("BINANCE_ACCOUNTS is not set (e.g. BINANCE_ACCOUNTS=main,sub1)")
+    accounts = []
+    for name in names:
+        key = name.upper()
+        if not set(key) <= ACCOUNT_NAME_CHARS:
+            raise ValueError(f"account name must be letters, digits or _: {name}")
+        try:
+            size = float(os.getenv(f"ACCOUNT_SIZE_{key}", "1"))
+        except ValueError:
+            raise ValueError(f"ACCOUNT_SIZE_{key} must be a number")
+        if not size > 0 or math.isinf(size):
+            raise ValueError(f"ACCOUNT_SIZE_{key} must be > 0")
+        if live:
+            missing = [v for v in (f"BINANCE_API_KEY_{key}", f"BINANCE_API_SECRET_{key}") if not os.getenv(v)]
+            if missing:
+                raise ValueError(f"{', '.join(missing)} not set for account {name}")
+        accounts.append({
+            "name": name.lower(),
+            "API_KEY": os.getenv(f"BINANCE_API_KEY_{key}", ""),
+            "API_SECRET": os.getenv(f"BINANCE_API_SECRET_{key}", ""),
+            "size": size,
+        })
+    return accounts
+
+
+class AccountPool:
+    """
+    One long-lived client (and journal) per account, created on first use.
+    `factory(account, mode)` builds the client; defaults to get_client.
+    """
+
+    def __init__(
+        self,
+        accounts: List[Dict[str, Any]],
+        mode: Optional[str] = None,
+        factory: Optional[Callable[[Dict[str, Any], str], Any]] = None,
+    ):
+        self.cfg = load_env()
+        self.accounts = accounts
+        self.mode = mode or self.cfg["MODE"]
+        self.factory = factory or (lambda acct, mode: get_client(acct["API_KEY"], acct["API_SECRET"], mode))
+        self.clients: Dict[str, Any] = {}
+        self.journals: Dict[str, Any] = {}
+
+    def client(self, name: str) -> Any:
+        if name not in self.clients:
+            acct = next(a for a in self.accounts if a["name"] == name)
+            self.clients[name] = self.factory(acct, self.mode)
+        return self.clients[name]
+
+    def journal(self, name: str) -> Any:
+        if name not in self.journals:
+            self.journals[name] = open_journal(self.cfg, account=name)
+        return self.journals[name]
+
+    def connect(self):
+        """Build every client concurrently (time sync and risk bootstrap are network-bound)."""
+        missing = [a["name"] for a in self.accounts if a["name"] not in self.clients]
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing), thread_name_prefix="connect") as pool:
+                list(pool.map(self.client, missing))
+        for acct in self.accounts:
+            self.journal(acct["name"])
+
+    def close(self):
+        for journal in self.journals.values():
+            if journal is not None:
+                journal.close()
+        for client in self.clients.values():
+            sync = getattr(client, "time_sync", None)
+            if sync is not None:
+                sync.stop()
+        self.journals = {}
+
+    def fan_out(self, fn: Callable[..., Any], qty: float, step_size: float = 0.001) -> Dict[str, Dict[str, Any]]:
+        """
+        Runs fn(client, qty * account.size, journal) on every account in parallel,
+        with the scaled quantity rounded down to step_size. Returns {account:
+        {"result": ...}, {"error": ...} or {"skipped": ...}}; an account whose
+        quantity rounds to zero is skipped, and one account failing never
+        stops the others.
+        """
+        self.connect()
+
+        def run(acct: Dict[str, Any]) -> Dict[str, Any]:
+            name = acct["name"]
+            set_log_account(name)
+            try:
+                # The epsilon keeps 0.0011000000000000001 / 0.001 from flooring to a lot too few
+                lots = math.floor(qty * acct["size"] / step_size + 1e-9)
+                if lots < 1:
+                    reason = f"quantity {qty * acct['size']:.10g} is below one step ({step_size:g})"
+                    log_info({"action": "fan_out", "qty": qty * acct["size"], "result": "skipped",
+                              "message": reason})
+                    return {"skipped": reason}
+                result = fn(self.client(name), round(lots * step_size, 10), self.journal(name))
+                return {"result": result}
+            except Exception as e:
+                log_error({"action": "fan_out", "result": "error", "error": str(e)})
+                return {"error": str(e)}
+            finally:
+                set_log_account(None)
+
+        with ThreadPoolExecutor(max_workers=len(self.accounts), thread_name_prefix="account") as pool:
+            results = dict(zip((a["name"] for a in self.accounts), pool.map(run, self.accounts)))
+
+        log_info({
+            "action": "fan_out",
+            "accounts": len(results),
+            "ok": sum(1 for r in results.values() if "result" in r),
+            "skipped": sum(1 for r in results.values() if "skipped" in r),
+            "result": "ok",
+        })
+        return results
@@ -1,7 +1,7 @@
 import sys
 import os
 import argparse
-import uuid
+from typing import Any, Dict, List, Optional
 
 # Ensure project root is on path to import src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -15,8 +15,11 @@ from src.common import (
     validate_price,
     log_info,
     log_error,
-    place_order_with_retry,  # NEW
+    mark_price,
 )
+from src.journal import open_journal, place_leg
+from src.runtime import run_once
+from src.advanced.oco import OcoStrategy
 
 def parse_args():
     p = argparse.ArgumentParser(description="Bracket Order: Entry + TP + SL (Futures)")
@@ -30,6 +33,241 @@ def parse_args():
     p.add_argument("--stopLimitPrice", help="Optional Stop-Limit price (float). If omitted, uses STOP_MARKET")
     return p.parse_args()
 
+def build_bracket_legs(
+    symbol: str,
+    entry_side: str,
+    qty: float,
+    entry_type: str,
+    entry_price: Optional[float],
+    tp_price: float,
+    sl_trigger: float,
+    sl_limit: Optional[float],
+    link_id: str,
+) -> List[Dict[str, Any]]:
+    """Entry, TP and SL requests in send order."""
+    # Exit side is the opposite of entry
+    exit_side = "SELL" if entry_side == "BUY" else "BUY"
+
+    entry_req = {
+        "symbol": symbol,
+        "side": entry_side,
+        "type": entry_type,
+        "quantity": qty,
+    }
+    if entry_type == "LIMIT":
+        entry_req["price"] = entry_price
+        entry_req["timeInForce"] = "GTC"
+    entry_req["newClientOrderId"] = f"{link_id}-ENTRY"
+
+    tp_req = {
+        "symbol": symbol,
+        "side": exit_side,
+        "type": "TAKE_PROFIT",
+        "reduceOnly": True,
+        "quantity": qty,
+        "price": tp_price,
+        "timeInForce": "GTC",
+        "workingType": "CONTRACT_PRICE",
+        "newClientOrderId": f"{link_id}-TP",
+    }
+
+    # Stop Loss: STOP_MARKET or STOP with limit price
+    if sl_limit:
+        sl_req = {
+            "symbol": symbol,
+            "side": exit_side,
+            "type": "STOP",
+            "reduceOnly": True,
+            "quantity": qty,
+            "price": sl_limit,
+            "stopPrice": sl_trigger,
+            "timeInForce": "GTC",
+            "workingType": "CONTRACT_PRICE",
+            "newClientOrderId": f"{link_id}-SL",
+        }
+    else:
+        sl_req = {
+            "symbol": symbol,
+            "side": exit_side,
+            "type": "STOP_MARKET",
+            "reduceOnly": True,
+            "quantity": qty,
+            "stopPrice": sl_trigger,
+            "workingType": "CONTRACT_PRICE",
+            "newClientOrderId": f"{link_id}-SL",
+        }
+    return [entry_req, tp_req, sl_req]
+
+class BracketStrategy(OcoStrategy):
+    """
+    Entry, then the TP/SL exit pair. Raises if the entry fails; TP/SL
+    failures are logged and reported in the result as {"error": ...}.
+    With watch=True the exits are supervised like an OcoStrategy: the first
+    to fill cancels the other.
+    """
+
+    kind = "BRACKET"
+    prefix = "BRK"
+
+    def __init__(self, symbol: str, entry_side: str, qty: float, entry_type: str, entry_price: Optional[float],
+                 tp_price: float, sl_trigger: float, sl_limit: Optional[float] = None,
+                 link_id: Optional[str] = None, watch: bool = False):
+        exit_side = "SELL" if entry_side == "BUY" else "BUY"
+        super().__init__(symbol, exit_side, qty, tp_price, sl_trigger, sl_limit, link_id=link_id, watch=watch)
+        self.entry_side = entry_side
+        self.entry_type = entry_type
+        self.entry_price = entry_price
+
+    async def start(self):
+        symbol, qty, link_id, journal = self.symbol, self.qty, self.link_id, self.journal
+        entry_side, entry_type, entry_price = self.entry_side, self.entry_type, self.entry_price
+        tp_price, sl_trigger, sl_limit = self.tp, self.sp, self.sl_limit
+        entry_req, tp_req, sl_req = build_bracket_legs(
+            symbol, entry_side, qty, entry_type, entry_price, tp_price, sl_trigger, sl_limit, link_id
+        )
+        exit_side = tp_req["side"]
+        if journal is not None:
+            arrival = await self.call(mark_price, self.client, symbol)
+            await self.call(journal.plan, link_id, [entry_req, tp_req, sl_req], strategy="BRACKET",
+                            meta={"arrivalPrice": arrival})
+        result: Dict[str, Any] = {"linkId": link_id}
+        self.placed = result
+
+        # 1) Place entry
+        try:
+            entry_resp = await self.call(place_leg, self.client, journal, link_id, entry_req)
+            entry_id = entry_resp.get("orderId")
+            log_info({
+                "action": "place_entry",
+                "type": entry_type,
+                "symbol": symbol,
+                "side": entry_side,
+                "qty": qty,
+                "price": entry_price,
+                "linkId": link_id,
+                "orderId": entry_id,
+                "result": "ok",
+            })
+            result["entry"] = {"orderId": entry_id}
+        except Exception as e:
+            log_error({
+                "action": "place_entry",
+                "type": entry_type,
+                "symbol": symbol,
+                "side": entry_side,
+                "qty": qty,
+                "price": entry_price,
+                "linkId": link_id,
+                "result": "error",
+                "error": str(e),
+            })
+            if journal is not None:
+                # Exits must never be sent for an entry that did not go out
+                await self.call(journal.cancel, link_id, tp_req["newClientOrderId"])
+                await self.call(journal.cancel, link_id, sl_req["newClientOrderId"])
+                await self.call(journal.done, link_id, status="failed")
+            raise
+
+        # 2) Place Take-Profit
+        try:
+            tp_resp = await self.call(place_leg, self.client, journal, link_id, tp_req)
+            tp_id = tp_resp.get("orderId")
+            log_info({
+                "action": "place_exit_tp",
+                "symbol": symbol,
+                "side": exit_side,
+                "qty": qty,
+                "price": tp_price,
+                "linkId": link_id,
+                "orderId": tp_id,
+                "result": "ok",
+            })
+            result["tp"] = {"orderId": tp_id}
+            self.sent.add("TP")
+        except Exception as e:
+            log_error({
+                "action": "place_exit_tp",
+                "symbol": symbol,
+                "side": exit_side,
+                "qty": qty,
+                "price": tp_price,
+                "linkId": link_id,
+                "result": "error",
+                "error": str(e),
+            })
+            # Continue to attempt SL placement for completeness
+            result["tp"] = {"error": str(e)}
+
+        if self.filled:
+            # The TP filled before the SL went out: a lone SL would open a new position
+            log_info({"action": "place_exit_sl", "symbol": symbol, "side": exit_side, "qty": qty,
+                      "stopPrice": sl_trigger, "linkId": link_id, "result": "skipped",
+                      "message": "take-profit filled before the stop-loss was sent"})
+            result["sl"] = {"skipped": "TP filled"}
+            if journal is not None:
+                await self.call(journal.cancel, link_id, sl_req["newClientOrderId"])
+                await self.call(journal.done, link_id)
+            return
+
+        # 3) Place Stop Loss
+        try:
+            sl_resp = await self.call(place_leg, self.client, journal, link_id, sl_req)
+            sl_id = sl_resp.get("orderId")
+            log_info({
+                "action": "place_exit_sl",
+                "symbol": symbol,
+                "side": exit_side,
+                "qty": qty,
+                "stopPrice": sl_trigger,
+                "stopLimitPrice": sl_limit,
+                "linkId": link_id,
+                "orderId": sl_id,
+                "result": "ok",
+            })
+            result["sl"] = {"orderId": sl_id}
+            await self._sl_acked()
+        except Exception as e:
+            log_error({
+                "action": "place_exit_sl",
+                "symbol": symbol,
+                "side": exit_side,
+                "qty": qty,
+                "stopPrice": sl_trigger,
+                "stopLimitPrice": sl_limit,
+                "linkId": link_id,
+                "result": "error",
+                "error": str(e),
+            })
+            result["sl"] = {"error": str(e)}
+
+        if journal is not None:
+            await self.call(journal.done, link_id)
+        # Only a complete pair can be supervised; a lone exit just rests
+        if not self.watch or "error" in result["tp"] or "error" in result["sl"]:
+            self.finish(result)
+
+def place_bracket(
+    client: Any,
+    symbol: str,
+    entry_side: str,
+    qty: float,
+    entry_type: str,
+    entry_price: Optional[float],
+    tp_price: float,
+    sl_trigger: float,
+    sl_limit: Optional[float] = None,
+    link_id: Optional[str] = None,
+    journal: Any = None,
+) -> Dict[str, Any]:
+    """
+    Places entry, then TP, then SL (one-shot launcher around BracketStrategy).
+    Raises if the entry fails; TP/SL failures are logged and reported in the
+    result as {"error": ...}.
+    """
+    strategy = BracketStrategy(symbol, entry_side, qty, entry_type, entry_price, tp_price, sl_trigger, sl_limit,
+                               link_id=link_id)
+    return run_once(strategy, client, journal)
+
 def main():
     args = parse_args()
     cfg = load_env()
@@ -54,151 +292,29 @@ def main():
         print(f"Input error: {e}")
         sys.exit(1)
 
-    # Exit side is the opposite of entry
-    exit_side = "SELL" if entry_side == "BUY" else "BUY"
-
     client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
-    link_id = f"BRK-{uuid.uuid4().hex[:8]}"
+    journal = open_journal(cfg)
 
-    # 1) Place entry
     try:
-        entry_req = {
-            "symbol": symbol,
-            "side": entry_side,
-            "type": entry_type,
-            "quantity": qty,
-        }
-        if entry_type == "LIMIT":
-            entry_req["price"] = entry_price
-            entry_req["timeInForce"] = "GTC"
-
-        entry_req["newClientOrderId"] = f"{link_id}-ENTRY"
-        entry_resp = place_order_with_retry(client, entry_req)  # UPDATED
-
-        entry_id = entry_resp.get("orderId")
-        log_info({
-            "action": "place_entry",
-            "type": entry_type,
-            "symbol": symbol,
-            "side": entry_side,
-            "qty": qty,
-            "price": entry_price,
-            "linkId": link_id,
-            "orderId": entry_id,
-            "result": "ok",
-        })
-        print(f"OK: Entry placed ({entry_type}) orderId={entry_id}, linkId={link_id}")
+        result = place_bracket(
+            client, symbol, entry_side, qty, entry_type, entry_price,
+            tp_price, sl_trigger, sl_limit, journal=journal,
+        )
     except Exception as e:
-        log_error({
-            "action": "place_entry",
-            "type": entry_type,
-            "symbol": symbol,
-            "side": entry_side,
-            "qty": qty,
-            "price": entry_price,
-            "linkId": link_id,
-            "result": "error",
-            "error": str(e),
-        })
         print(f"Entry failed: {e}")
         sys.exit(1)
+    finally:
+        if journal is not None:
+            journal.close()
 
-    # 2) Place Take-Profit
-    try:
-        tp_req = {
-            "symbol": symbol,
-            "side": exit_side,
-            "type": "TAKE_PROFIT",
-            "reduceOnly": True,
-            "quantity": qty,
-            "price": tp_price,
-            "timeInForce": "GTC",
-            "workingType": "CONTRACT_PRICE",
-            "newClientOrderId": f"{link_id}-TP",
-        }
-        tp_resp = place_order_with_retry(client, tp_req)  # UPDATED
-        tp_id = tp_resp.get("orderId")
-        log_info({
-            "action": "place_exit_tp",
-            "symbol": symbol,
-            "side": exit_side,
-            "qty": qty,
-            "price": tp_price,
-            "linkId": link_id,
-            "orderId": tp_id,
-            "result": "ok",
-        })
-        print(f"OK: TP placed orderId={tp_id}")
-    except Exception as e:
-        log_error({
-            "action": "place_exit_tp",
-            "symbol": symbol,
-            "side": exit_side,
-            "qty": qty,
-            "price": tp_price,
-            "linkId": link_id,
-            "result": "error",
-            "error": str(e),
-        })
-        print(f"TP failed: {e}")
-        # Continue to attempt SL placement for completeness
-
-    # 3) Place Stop Loss (STOP_MARKET or STOP with limit price)
-    try:
-        if sl_limit:
-            sl_req = {
-                "symbol": symbol,
-                "side": exit_side,
-                "type": "STOP",
-                "reduceOnly": True,
-                "quantity": qty,
-                "price": sl_limit,
-                "stopPrice": sl_trigger,
-                "timeInForce": "GTC",
-                "workingType": "CONTRACT_PRICE",
-                "newClientOrderId": f"{link_id}-SL",
-            }
+    print(f"OK: Entry placed ({entry_type}) orderId={result['entry']['orderId']}, linkId={result['linkId']}")
+    for leg, label in (("tp", "TP"), ("sl", "SL")):
+        if "error" in result[leg]:
+            print(f"{label} failed: {result[leg]['error']}")
         else:
-            sl_req = {
-                "symbol": symbol,
-                "side": exit_side,
-                "type": "STOP_MARKET",
-                "reduceOnly": True,
-                "quantity": qty,
-                "stopPrice": sl_trigger,
-                "workingType": "CONTRACT_PRICE",
-                "newClientOrderId": f"{link_id}-SL",
-            }
-
-        sl_resp = place_order_with_retry(client, sl_req)  # UPDATED
-        sl_id = sl_resp.get("orderId")
-        log_info({
-            "action": "place_exit_sl",
-            "symbol": symbol,
-            "side": exit_side,
-            "qty": qty,
-            "stopPrice": sl_trigger,
-            "stopLimitPrice": sl_limit,
-            "linkId": link_id,
-            "orderId": sl_id,
-            "result": "ok",
-        })
-        print(f"OK: SL placed orderId={sl_id}")
-    except Exception as e:
-        log_error({
-            "action": "place_exit_sl",
-            "symbol": symbol,
-            "side": exit_side,
-            "qty": qty,
-            "stopPrice": sl_trigger,
-            "stopLimitPrice": sl_limit,
-            "linkId": link_id,
-            "result": "error",
-            "error": str(e),
-        })
-        print(f"SL failed: {e}")
-
-    print("Note: Auto-cancel on fill is not implemented; document this in README as intentional for this version.")
+            print(f"OK: {label} placed orderId={result[leg]['orderId']}")
+
+    print("Note: This one-shot launcher does not auto-cancel on fill; host BracketStrategy(watch=True) in the runtime for that.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,189 @@
+import sys
+import os
+import time
+import argparse
+import uuid
+from typing import Any, Dict, List, Tuple
+
+# Add project root to path so we can import src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.common import (
+    load_env,
+    get_client,
+    validate_symbol,
+    validate_qty,
+    validate_price,
+    log_info,
+    log_error,
+    cancel_batch_with_retry,
+    place_batch_with_retry,
+)
+
+PLACE_BATCH = 5    # futures batchOrders limit
+CANCEL_BATCH = 10  # futures cancel-multiple limit
+
+Level = Tuple[str, int]  # (side, price in ticks)
+
+
+def build_ladder(center: float, step: float, levels: int, qty: float, tick: float) -> Dict[Level, float]:
+    """
+    Desired ladder: `levels` BUYs strictly below center and `levels` SELLs
+    strictly above it. Levels sit on absolute multiples of `step`, so moving
+    the center by one step changes only the levels at the edges and the one
+    crossing the center; everything else keeps resting.
+    """
+    c = int(round(center / tick))
+    st = max(1, int(round(step / tick)))
+    b0 = ((c - 1) // st) * st
+    s0 = -((-(c + 1)) // st) * st
+    ladder: Dict[Level, float] = {}
+    for i in range(levels):
+        if b0 - i * st > 0:
+            ladder[("BUY", b0 - i * st)] = qty
+        ladder[("SELL", s0 + i * st)] = qty
+    return ladder
+
+
+def diff_ladder(desired: Dict[Level, float], resting: Dict[Level, Dict[str, Any]]) -> Tuple[List[Level], List[Level]]:
+    """Minimal (cancel, place) sets turning `resting` into `desired`; unchanged levels are left alone."""
+    cancel = [lv for lv, o in resting.items() if desired.get(lv) != o["qty"]]
+    place = [lv for lv, q in desired.items() if lv not in resting or resting[lv]["qty"] != q]
+    return cancel, place
+
+
+class GridStrategy:
+    """Keeps a ladder of LIMIT GTC orders resting and re-quotes it incrementally."""
+
+    def __init__(self, client: Any, symbol: str, step: float, levels: int, qty: float, tick: float,
+                 link_id: str = ""):
+        self.client = client
+        self.symbol = symbol
+        self.step = step
+        self.levels = levels
+        self.qty = qty
+        self.tick = tick
+        self.link_id = link_id or f"GRID-{uuid.uuid4().hex[:8]}"
+        self.resting: Dict[Level, Dict[str, Any]] = {}
+        self.seq = 0
+        self.requests = 0
+
+    def _cid(self, level: Level) -> str:
+        self.seq += 1
+        return f"{self.link_id}-{level[0][0]}{level[1]}-{self.seq:x}"
+
+    def requote(self, center: float) -> Dict[str, int]:
+        desired = build_ladder(center, self.step, self.levels, self.qty, self.tick)
+        cancel, place = diff_ladder(desired, self.resting)
+        requests_before = self.requests
+        self._cancel(cancel)
+        placed = self._place([(lv, desired[lv]) for lv in place])
+        stats = {"cancelled": len(cancel), "placed": placed, "kept": len(self.resting) - placed,
+                 "requests": self.requests - requests_before}
+        log_info({"action": "grid_requote", "symbol": self.symbol, "center": center, "linkId": self.link_id,
+                  **stats, "result": "ok"})
+        return stats
+
+    def _cancel(self, levels: List[Level]):
+        for i in range(0, len(levels), CANCEL_BATCH):
+            chunk = levels[i:i + CANCEL_BATCH]
+            cids = [self.resting[lv]["cid"] for lv in chunk]
+            self.requests += 1
+            try:
+                resp = cancel_batch_with_retry(self.client, self.symbol, cids)
+            except Exception as e:
+                log_error({"action": "grid_cancel", "symbol": self.symbol, "linkId": self.link_id,
+                           "count": len(chunk), "result": "error", "error": str(e)})
+                continue
+            risk = getattr(self.client, "risk", None)
+            for lv, item in zip(chunk, resp):
+                # An "unknown order" reply means it already filled or was cancelled: forget it either way
+                order = self.resting.pop(lv)
+                if risk is not None and "orderId" not in item and order.get("orderId") is not None:
+                    risk.on_cancel(str(order["orderId"]))
+
+    def _place(self, levels: List[Tuple[Level, float]]) -> int:
+        placed = 0
+        for i in range(0, len(levels), PLACE_BATCH):
+            chunk = levels[i:i + PLACE_BATCH]
+            reqs = [{
+                "symbol": self.symbol,
+                "side": lv[0],
+                "type": "LIMIT",
+                "timeInForce": "GTC",
+                "quantity": q,
+                "price": round(lv[1] * self.tick, 10),
+                "newClientOrderId": self._cid(lv),
+            } for lv, q in chunk]
+            self.requests += 1
+            try:
+                resp = place_batch_with_retry(self.client, reqs)
+            except Exception as e:
+                log_error({"action": "grid_place", "symbol": self.symbol, "linkId": self.link_id,
+                           "count": len(chunk), "result": "error", "error": str(e)})
+                continue
+            for (lv, q), req, item in zip(chunk, reqs, resp):
+                if "orderId" in item:
+                    self.resting[lv] = {"cid": req["newClientOrderId"], "orderId": item["orderId"], "qty": q}
+                    placed += 1
+                else:
+                    log_error({"action": "grid_place", "symbol": self.symbol, "linkId": self.link_id,
+                               "side": lv[0], "price": req["price"], "result": "error", "error": item.get("msg")})
+        return placed
+
+    def on_fill(self, cid: str):
+        """Forget a level whose order filled so the next requote re-places it."""
+        for lv, o in list(self.resting.items()):
+            if o["cid"] == cid:
+                del self.resting[lv]
+                return
+
+    def cancel_all(self) -> int:
+        levels = list(self.resting)
+        self._cancel(levels)
+        return len(levels)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Grid / ladder of LIMIT orders around a center price")
+    p.add_argument("symbol", help="e.g., BTCUSDT")
+    p.add_argument("quantity", help="Quantity per level (float)")
+    p.add_argument("--center", required=True, help="Center price (float)")
+    p.add_argument("--step", required=True, help="Price distance between levels (float)")
+    p.add_argument("--levels", type=int, default=10, help="Levels per side (default 10)")
+    p.add_argument("--tickSize", default="0.1", help="Symbol tick size (default 0.1)")
+    p.add_argument("--recenter", nargs="*", default=[], help="Further center prices to re-quote to, in order")
+    p.add_argument("--cancel", action="store_true", help="Cancel the whole grid at the end")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    cfg = load_env()
+    try:
+        symbol = validate_symbol(args.symbol)
+        qty = validate_qty(args.quantity)
+        center = validate_price(args.center)
+        step = validate_price(args.step)
+        tick = validate_price(args.tickSize)
+        recenters = [validate_price(c) for c in args.recenter]
+        if args.levels < 1:
+            raise ValueError("levels must be >= 1")
+        if step < tick:
+            raise ValueError("step must be >= tickSize")
+    except Exception as e:
+        log_error({"action": "validate", "type": "GRID", "error": str(e)})
+        print(f"Input error: {e}")
+        sys.exit(1)
+
+    client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
+    grid = GridStrategy(client, symbol, step, args.levels, qty, tick)
+    for c in [center] + recenters:
+        t0 = time.perf_counter()
+        stats = grid.requote(c)
+        print(f"center={c}: placed={stats['placed']} cancelled={stats['cancelled']} kept={stats['kept']} "
+              f"requests={stats['requests']} ({(time.perf_counter() - t0) * 1000:.1f}ms) linkId={grid.link_id}")
+    if args.cancel:
+        print(f"Cancelled {grid.cancel_all()} resting orders")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import sys
+import os
+import json
+import asyncio
+import argparse
+import tracemalloc
+from typing import Any, Dict, List
+
+# Add project root to path so we can import src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.common import (
+    load_env,
+    get_client,
+    validate_symbol,
+    validate_side,
+    validate_qty,
+    validate_price,
+    log_error,
+)
+from src.journal import open_journal
+from src.runtime import Runtime, Strategy
+from src.advanced.twap import TwapStrategy
+from src.advanced.bracket import BracketStrategy
+from src.advanced.oco import OcoStrategy
+from src.advanced.stop_limit import StopLimitStrategy
+
+
+def _opt_price(spec: Dict[str, Any], key: str):
+    return validate_price(spec[key]) if spec.get(key) is not None else None
+
+
+def build_strategy(spec: Dict[str, Any]) -> Strategy:
+    """
+    One strategy from a spec dict; field names follow the CLI flags, e.g.
+    {"type": "BRACKET", "symbol": "BTCUSDT", "side": "BUY", "quantity": 0.01,
+     "takeProfit": 61000, "stopPrice": 59000, "watch": true}.
+    """
+    kind = str(spec.get("type", "")).upper()
+    symbol = validate_symbol(spec["symbol"])
+    side = validate_side(spec["side"])
+    qty = validate_qty(spec["quantity"])
+    if kind == "TWAP":
+        slices = int(spec.get("slices", 5))
+        if slices < 1:
+            raise ValueError("slices must be >= 1")
+        return TwapStrategy(symbol, side, qty, slices, float(spec.get("intervalSec", 10)))
+    if kind == "BRACKET":
+        entry_type = str(spec.get("entryType", "MARKET")).upper()
+        if entry_type == "LIMIT" and spec.get("price") is None:
+            raise ValueError("price is required when entryType=LIMIT")
+        return BracketStrategy(symbol, side, qty, entry_type, _opt_price(spec, "price"),
+                               validate_price(spec["takeProfit"]), validate_price(spec["stopPrice"]),
+                               _opt_price(spec, "stopLimitPrice"), watch=bool(spec.get("watch", False)))
+    if kind == "OCO":
+        return OcoStrategy(symbol, side, qty, validate_price(spec["takeProfit"]), validate_price(spec["stopPrice"]),
+                           _opt_price(spec, "stopLimitPrice"), watch=bool(spec.get("watch", False)))
+    if kind == "STOP_LIMIT":
+        return StopLimitStrategy(symbol, side, qty, validate_price(spec["stopPrice"]),
+                                 validate_price(spec["limitPrice"]), spec.get("timeInForce", "GTC"))
+    raise ValueError(f"unknown strategy type: {spec.get('type')}")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Host many strategies in one process on a shared client")
+    p.add_argument("specs", help="JSON file with a list of strategy specs (type, symbol, side, quantity, ...)")
+    p.add_argument("--workers", type=int, default=16, help="Threads for blocking exchange calls (default 16)")
+    p.add_argument("--traceMemory", action="store_true", help="Attribute allocated memory per strategy (slower)")
+    return p.parse_args()
+
+async def host(rt: Runtime, strategies: List[Strategy]):
+    try:
+        await rt.run(strategies)
+    finally:
+        await rt.shutdown()
+
+def main():
+    args = parse_args()
+    cfg = load_env()
+    try:
+        with open(args.specs, "r", encoding="utf-8") as f:
+            specs = json.load(f)
+        if not isinstance(specs, list) or not specs:
+            raise ValueError("specs must be a non-empty JSON list")
+        strategies = [build_strategy(spec) for spec in specs]
+        if args.workers < 1:
+            raise ValueError("workers must be >= 1")
+    except Exception as e:
+        log_error({"action": "validate", "type": "HOST", "error": str(e)})
+        print(f"Input error: {e}")
+        sys.exit(1)
+
+    client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
+    journal = open_journal(cfg)
+    if args.traceMemory:
+        tracemalloc.start()
+    rt = Runtime(client, journal, max_workers=args.workers, trace_memory=args.traceMemory)
+    twm = None
+    try:
+        if not hasattr(client, "add_listener"):
+            # Fills reach watched brackets/OCOs through the shared user stream
+            from binance import ThreadedWebsocketManager
+            twm = ThreadedWebsocketManager(api_key=cfg["API_KEY"], api_secret=cfg["API_SECRET"])
+            twm.start()
+            twm.start_futures_user_socket(callback=rt.publish)
+        print(f"Hosting {len(strategies)} strategies (Ctrl+C stops the ones still running)")
+        asyncio.run(host(rt, strategies))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if twm is not None:
+            twm.stop()
+        if journal is not None:
+            journal.close()
+
+    print(f"{'linkId':>16} | {'strategy':>10} | {'status':>8} | {'cpu ms':>8} | {'calls':>5} | {'events':>6}"
+          + (f" | {'alloc KB':>8}" if args.traceMemory else ""))
+    for link_id, st in rt.stats(strategies).items():
+        print(f"{link_id:>16} | {st['strategy']:>10} | {st['status']:>8} | {st['cpuMs']:>8.2f} | {st['calls']:>5} | "
+              f"{st['events']:>6}" + (f" | {st['allocKb']:>8.1f}" if args.traceMemory else ""))
+
+if __name__ == "__main__":
+    main()
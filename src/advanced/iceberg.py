@@ -0,0 +1,278 @@
+import sys
+import os
+import time
+import uuid
+import random
+import argparse
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add project root to path so we can import src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.common import (
+    load_env,
+    get_client,
+    validate_symbol,
+    validate_side,
+    validate_qty,
+    validate_price,
+    log_info,
+    log_error,
+    mark_price,
+)
+from src.journal import open_journal, place_leg
+
+
+class IcebergOrder:
+    """
+    Works `total_qty` as a LIMIT GTC iceberg: only one slice of about
+    `visible_qty` rests on the book, the rest is a hidden reserve.
+
+    Refills are driven by the user data stream: when an ORDER_TRADE_UPDATE
+    reports the resting slice FILLED, the next slice is sent from inside the
+    event handler, so the refill gap is one order round trip and no polling
+    requests are made. Quantities and prices are held as integer lots/ticks.
+
+    size_jitter: each slice is visible_qty * (1 +/- up to size_jitter).
+    price_jitter_ticks: each slice is priced up to that many ticks less
+    aggressive than `price` (never through it).
+
+    Raises ValueError if total_qty or visible_qty rounds to less than one lot.
+    """
+
+    def __init__(self, client: Any, symbol: str, side: str, total_qty: float, visible_qty: float, price: float,
+                 tick_size: float = 0.1, step_size: float = 0.001, size_jitter: float = 0.0,
+                 price_jitter_ticks: int = 0, seed: Optional[int] = None, link_id: Optional[str] = None,
+                 journal: Any = None):
+        self.client = client
+        self.symbol = symbol
+        self.side = side
+        self.tick = tick_size
+        self.step = step_size
+        self.total = int(round(total_qty / step_size))
+        self.visible = int(round(visible_qty / step_size))
+        if self.total < 1:
+            raise ValueError(f"total quantity {total_qty} is less than one lot ({step_size})")
+        if self.visible < 1:
+            raise ValueError(f"visible quantity {visible_qty} is less than one lot ({step_size})")
+        self.price = int(round(price / tick_size))
+        self.size_jitter = size_jitter
+        self.price_jitter_ticks = price_jitter_ticks
+        self.rng = random.Random(seed)
+        self.link_id = link_id or f"ICE-{uuid.uuid4().hex[:8]}"
+        self.journal = journal
+
+        self.sent = 0        # lots released from the reserve so far
+        self.filled = 0.0    # executed quantity across all slices
+        self.seq = 0
+        self.cid: Optional[str] = None   # resting slice
+        self.slice_qty = 0.0
+        self.status = "new"
+        self.requests = 0
+        self.refill_ms: List[float] = []
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+
+    def _next_slice(self) -> Tuple[Dict[str, Any], int]:
+        lots = self.visible
+        if self.size_jitter:
+            lots = int(round(lots * (1 + self.rng.uniform(-self.size_jitter, self.size_jitter))))
+        # Jitter never rounds a slice to zero; the last slice is exactly what is left of the reserve
+        lots = min(max(1, lots), self.total - self.sent)
+        px = self.price
+        if self.price_jitter_ticks:
+            k = self.rng.randint(0, self.price_jitter_ticks)
+            px = px - k if self.side == "BUY" else px + k
+        self.seq += 1
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "type": "LIMIT",
+            "timeInForce": "GTC",
+            "quantity": validate_qty(round(lots * self.step, 10)),
+            "price": validate_price(round(px * self.tick, 10)),
+            "newClientOrderId": f"{self.link_id}-I{self.seq}",
+        }, lots
+
+    def _refill(self):
+        req, lots = self._next_slice()
+        if self.journal is not None:
+            if self.seq == 1:
+                # Later slices are appended with replan; recovery re-sends only an unacked slice
+                self.journal.plan(self.link_id, [req], strategy="ICEBERG",
+                                  meta={"totalQty": round(self.total * self.step, 10),
+                                        "visibleQty": round(self.visible * self.step, 10),
+                                        "arrivalPrice": mark_price(self.client, self.symbol)})
+            else:
+                self.journal.replan(self.link_id, req)
+        self.requests += 1
+        try:
+            resp = place_leg(self.client, self.journal, self.link_id, req)
+        except Exception as e:
+            log_error({"action": "iceberg_slice", "symbol": self.symbol, "side": self.side, "linkId": self.link_id,
+                       "sliceIndex": self.seq, "qty": req["quantity"], "price": req["price"],
+                       "result": "error", "error": str(e)})
+            self._finish("failed")
+            return
+        self.sent += lots
+        self.cid = req["newClientOrderId"]
+        self.slice_qty = req["quantity"]
+        log_info({"action": "iceberg_slice", "symbol": self.symbol, "side": self.side, "linkId": self.link_id,
+                  "sliceIndex": self.seq, "qty": req["quantity"], "price": req["price"],
+                  "reserve": round((self.total - self.sent) * self.step, 10),
+                  "orderId": resp.get("orderId"), "result": "ok"})
+
+    def start(self) -> "IcebergOrder":
+        """Send the first visible slice. Subscribe on_event to the user stream before calling."""
+        log_info({"action": "iceberg_start", "symbol": self.symbol, "side": self.side,
+                  "totalQty": round(self.total * self.step, 10),
+                  "visibleQty": round(self.visible * self.step, 10),
+                  "price": round(self.price * self.tick, 10), "linkId": self.link_id})
+        with self._lock:
+            self.status = "working"
+            self._refill()
+        return self
+
+    def on_event(self, msg: Dict[str, Any]):
+        """User data stream callback (python-binance futures user socket or FakeClient listener)."""
+        data = msg.get("data", msg)
+        if data.get("e") != "ORDER_TRADE_UPDATE":
+            return
+        o = data["o"]
+        t0 = time.perf_counter()
+        with self._lock:
+            if self.status != "working" or o.get("c") != self.cid:
+                return
+            state = o.get("X")
+            if o.get("x") == "TRADE":
+                last = float(o.get("l") or 0)
+                self.filled += last
+                risk = getattr(self.client, "risk", None)
+                if risk is not None:
+                    # Release the slice's resting notional before the refill is risk-checked
+                    risk.on_fill(self.symbol, self.side, last, float(o.get("L") or 0) or None,
+                                 order_id=str(o.get("i")), closed=state == "FILLED")
+            if state == "FILLED":
+                if self.sent >= self.total:
+                    self._finish("complete")
+                    return
+                self._refill()
+                self.refill_ms.append((time.perf_counter() - t0) * 1000)
+            elif state in ("CANCELED", "EXPIRED", "REJECTED"):
+                # The slice was removed outside the executor; stop rather than fight it
+                log_error({"action": "iceberg_slice", "linkId": self.link_id, "cid": self.cid, "status": state,
+                           "result": "error", "error": "resting slice removed"})
+                self._finish("cancelled")
+
+    def cancel(self) -> bool:
+        """Cancel the resting slice and abandon the reserve."""
+        with self._lock:
+            if self.status != "working":
+                return False
+            self.requests += 1
+            try:
+                resp = self.client.futures_cancel_order(symbol=self.symbol, origClientOrderId=self.cid)
+                risk = getattr(self.client, "risk", None)
+                if risk is not None:
+                    risk.on_cancel(str(resp.get("orderId")))
+            except Exception as e:
+                log_error({"action": "iceberg_cancel", "linkId": self.link_id, "cid": self.cid,
+                           "result": "error", "error": str(e)})
+            self._finish("cancelled")
+            return True
+
+    def _finish(self, status: str):
+        self.status = status
+        if self.journal is not None:
+            self.journal.done(self.link_id, status=status)
+        log_info({"action": "iceberg_complete", "symbol": self.symbol, "side": self.side, "linkId": self.link_id,
+                  "status": status, "filledQty": round(self.filled, 10),
+                  "totalQty": round(self.total * self.step, 10),
+                  "slices": self.seq, "requests": self.requests, "result": "ok" if status == "complete" else status})
+        self.finished.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.finished.wait(timeout)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Work a LIMIT order as an iceberg: show one slice, refill on fills")
+    p.add_argument("symbol", help="e.g., BTCUSDT")
+    p.add_argument("side", help="BUY or SELL")
+    p.add_argument("quantity", help="Total quantity (float)")
+    p.add_argument("price", help="Limit price (float)")
+    p.add_argument("--visible", required=True, help="Visible slice quantity (float)")
+    p.add_argument("--sizeJitter", type=float, default=0.0, help="Randomize slice size by +/- this fraction (0..0.9)")
+    p.add_argument("--priceJitterTicks", type=int, default=0, help="Price slices up to N ticks passive of price")
+    p.add_argument("--tickSize", default="0.1", help="Symbol tick size (default 0.1)")
+    p.add_argument("--stepSize", default="0.001", help="Symbol lot step size (default 0.001)")
+    p.add_argument("--seed", type=int, help="Seed for the randomization")
+    p.add_argument("--simulateFills", action="store_true", help="Dryrun only: fill each slice as soon as it rests")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    cfg = load_env()
+    try:
+        symbol = validate_symbol(args.symbol)
+        side = validate_side(args.side)
+        qty = validate_qty(args.quantity)
+        price = validate_price(args.price)
+        visible = validate_qty(args.visible)
+        tick = validate_price(args.tickSize)
+        step = validate_qty(args.stepSize)
+        if visible > qty:
+            raise ValueError("visible must be <= quantity")
+        if not 0 <= args.sizeJitter < 1:
+            raise ValueError("sizeJitter must be in [0, 1)")
+        if args.priceJitterTicks < 0:
+            raise ValueError("priceJitterTicks must be >= 0")
+        if args.simulateFills and cfg["MODE"].lower() != "dryrun":
+            raise ValueError("--simulateFills requires MODE=dryrun")
+    except Exception as e:
+        log_error({"action": "validate", "type": "ICEBERG", "error": str(e)})
+        print(f"Input error: {e}")
+        sys.exit(1)
+
+    client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
+    try:
+        ice = IcebergOrder(client, symbol, side, qty, visible, price, tick_size=tick, step_size=step,
+                           size_jitter=args.sizeJitter, price_jitter_ticks=args.priceJitterTicks, seed=args.seed)
+    except ValueError as e:
+        log_error({"action": "validate", "type": "ICEBERG", "error": str(e)})
+        print(f"Input error: {e}")
+        sys.exit(1)
+    ice.journal = journal = open_journal(cfg)
+    twm = None
+    try:
+        if hasattr(client, "add_listener"):
+            client.add_listener(ice.on_event)
+        else:
+            # Subscribe before the first slice goes out so no fill can be missed
+            from binance import ThreadedWebsocketManager
+            twm = ThreadedWebsocketManager(api_key=cfg["API_KEY"], api_secret=cfg["API_SECRET"])
+            twm.start()
+            twm.start_futures_user_socket(callback=ice.on_event)
+        ice.start()
+        print(f"Iceberg {ice.link_id}: {side} {qty} {symbol} @ {price}, showing ~{visible}")
+        if args.simulateFills:
+            while ice.status == "working":
+                client.fill(origClientOrderId=ice.cid)
+        else:
+            print("Waiting for fills (Ctrl+C cancels the resting slice)")
+            while not ice.wait(0.5):
+                pass
+    except KeyboardInterrupt:
+        ice.cancel()
+    finally:
+        if twm is not None:
+            twm.stop()
+        if journal is not None:
+            journal.close()
+    avg = sum(ice.refill_ms) / len(ice.refill_ms) if ice.refill_ms else 0.0
+    print(f"{ice.status}: filled {ice.filled:.8g}/{qty} in {ice.seq} slices, {ice.requests} requests, "
+          f"avg refill {avg:.2f}ms")
+
+if __name__ == "__main__":
+    main()
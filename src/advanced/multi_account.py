@@ -0,0 +1,98 @@
+import sys
+import os
+import argparse
+
+# Add project root to path so we can import src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.common import (
+    validate_symbol,
+    validate_side,
+    validate_qty,
+    validate_price,
+    log_error,
+)
+from src.accounts import load_accounts, AccountPool
+from src.advanced.bracket import place_bracket
+from src.advanced.twap import run_twap
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Fan one bracket or TWAP out to every account in BINANCE_ACCOUNTS")
+    p.add_argument("--stepSize", default="0.001", help="Symbol lot step size; scaled quantities round down to it")
+    sub = p.add_subparsers(dest="strategy", required=True)
+
+    b = sub.add_parser("bracket", help="Entry + TP + SL on every account")
+    b.add_argument("symbol", help="e.g., BTCUSDT")
+    b.add_argument("side", help="BUY or SELL for the ENTRY side")
+    b.add_argument("quantity", help="Base entry quantity, scaled by ACCOUNT_SIZE_<NAME>")
+    b.add_argument("--entryType", default="MARKET", choices=["MARKET", "LIMIT"], help="Entry order type (default MARKET)")
+    b.add_argument("--price", help="Entry limit price if entryType=LIMIT")
+    b.add_argument("--takeProfit", required=True, help="Take Profit price (float)")
+    b.add_argument("--stopPrice", required=True, help="Stop trigger price (float)")
+    b.add_argument("--stopLimitPrice", help="Optional Stop-Limit price (float). If omitted, uses STOP_MARKET")
+
+    t = sub.add_parser("twap", help="TWAP parent on every account")
+    t.add_argument("symbol", help="e.g., BTCUSDT")
+    t.add_argument("side", help="BUY or SELL")
+    t.add_argument("quantity", help="Base total quantity, scaled by ACCOUNT_SIZE_<NAME>")
+    t.add_argument("--slices", type=int, default=5, help="Number of slices (default: 5)")
+    t.add_argument("--intervalSec", type=int, default=10, help="Seconds between slices (default: 10)")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    try:
+        accounts = load_accounts()
+        step = validate_qty(args.stepSize)
+        symbol = validate_symbol(args.symbol)
+        side = validate_side(args.side)
+        qty = validate_qty(args.quantity)
+        if args.strategy == "bracket":
+            entry_type = args.entryType.upper()
+            if entry_type == "LIMIT":
+                if args.price is None:
+                    raise ValueError("price is required when entryType=LIMIT")
+                entry_price = validate_price(args.price)
+            else:
+                entry_price = None
+            tp_price = validate_price(args.takeProfit)
+            sl_trigger = validate_price(args.stopPrice)
+            sl_limit = validate_price(args.stopLimitPrice) if args.stopLimitPrice else None
+            fn = lambda client, q, journal: place_bracket(
+                client, symbol, side, q, entry_type, entry_price, tp_price, sl_trigger, sl_limit, journal=journal
+            )
+        else:
+            if args.slices < 1:
+                raise ValueError("slices must be >= 1")
+            if args.intervalSec < 1:
+                raise ValueError("intervalSec must be >= 1")
+            fn = lambda client, q, journal: run_twap(
+                client, symbol, side, q, args.slices, args.intervalSec, journal=journal
+            )
+    except Exception as e:
+        log_error({"action": "validate", "type": "MULTI_ACCOUNT", "error": str(e)})
+        print(f"Input error: {e}")
+        sys.exit(1)
+
+    pool = AccountPool(accounts)
+    try:
+        results = pool.fan_out(fn, qty, step_size=step)
+    finally:
+        pool.close()
+
+    failed = skipped = 0
+    for name, res in results.items():
+        if "error" in res:
+            failed += 1
+            print(f"[{name}] FAILED: {res['error']}")
+        elif "skipped" in res:
+            skipped += 1
+            print(f"[{name}] SKIPPED: {res['skipped']}")
+        else:
+            print(f"[{name}] OK: linkId={res['result']['linkId']}")
+    print(f"{len(results) - failed - skipped}/{len(results)} accounts OK" + (f", {skipped} skipped" if skipped else ""))
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
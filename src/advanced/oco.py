@@ -1,7 +1,8 @@
 import sys
 import os
+import re
 import argparse
-import uuid
+from typing import Any, Dict, List, Optional, Set
 
 # Add project root to path so we can import from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -17,6 +18,7 @@ from src.common import (
     log_error,
     place_order_with_retry,  # NEW
 )
+from src.runtime import Strategy, run_once
 
 def parse_args():
     p = argparse.ArgumentParser(description="Emulated OCO for Futures (TP + SL paired)")
@@ -28,6 +30,184 @@ def parse_args():
     p.add_argument("--stopLimitPrice", help="Optional SL limit price (float). If omitted, use STOP_MARKET")
     return p.parse_args()
 
+def build_oco_legs(symbol: str, side: str, qty: float, tp: float, sp: float, sl_limit: Optional[float],
+                   link_id: str) -> List[Dict[str, Any]]:
+    """TP and SL requests (reduceOnly, exit side) in send order."""
+    tp_req = {
+        "symbol": symbol,
+        "side": side,
+        "type": "TAKE_PROFIT",
+        "reduceOnly": True,
+        "quantity": qty,
+        "price": tp,
+        "timeInForce": "GTC",
+        "workingType": "CONTRACT_PRICE",
+        "newClientOrderId": f"{link_id}-TP",
+    }
+
+    # Stop Loss order
+    if sl_limit:
+        sl_req = {
+            "symbol": symbol,
+            "side": side,
+            "type": "STOP",
+            "reduceOnly": True,
+            "quantity": qty,
+            "price": sl_limit,
+            "stopPrice": sp,
+            "timeInForce": "GTC",
+            "workingType": "CONTRACT_PRICE",
+            "newClientOrderId": f"{link_id}-SL",
+        }
+    else:
+        sl_req = {
+            "symbol": symbol,
+            "side": side,
+            "type": "STOP_MARKET",
+            "reduceOnly": True,
+            "quantity": qty,
+            "stopPrice": sp,
+            "workingType": "CONTRACT_PRICE",
+            "newClientOrderId": f"{link_id}-SL",
+        }
+    return [tp_req, sl_req]
+
+
+class OcoStrategy(Strategy):
+    """
+    TP + SL exit pair. With watch=True the strategy stays hosted after
+    placing both legs and cancels the sibling as soon as the user data
+    stream reports one leg FILLED (true one-cancels-other); otherwise it
+    finishes once both legs are resting.
+    """
+
+    kind = "OCO"
+    prefix = "OCO"
+
+    def __init__(self, symbol: str, side: str, qty: float, tp: float, sp: float, sl_limit: Optional[float] = None,
+                 link_id: Optional[str] = None, watch: bool = False):
+        super().__init__(link_id)
+        self.symbol = symbol
+        self.side = side
+        self.qty = qty
+        self.tp = tp
+        self.sp = sp
+        self.sl_limit = sl_limit
+        self.watch = watch
+        self.symbols = [symbol]
+        self.placed: Dict[str, Any] = {}
+        self.sent: Set[str] = set()         # exit legs the exchange has acked
+        self.filled: Optional[str] = None   # first exit leg reported FILLED (watch mode)
+        self.sl_cid = f"{self.link_id}-SL"  # current SL client id; a trailing stop replaces it as -SL<n>
+
+    async def start(self):
+        tp_req, sl_req = build_oco_legs(self.symbol, self.side, self.qty, self.tp, self.sp, self.sl_limit,
+                                        self.link_id)
+        try:
+            tp_resp = await self.call(place_order_with_retry, self.client, tp_req)
+            self.sent.add("TP")
+            if self.filled:
+                # The TP filled before the SL went out: a lone SL would open a new position
+                log_info({"action": "place_oco", "symbol": self.symbol, "side": self.side, "qty": self.qty,
+                          "takeProfit": self.tp, "stopPrice": self.sp, "linkId": self.link_id,
+                          "tpOrderId": tp_resp.get("orderId"), "result": "skipped",
+                          "message": "take-profit filled before the stop-loss was sent"})
+                return
+            sl_resp = await self.call(place_order_with_retry, self.client, sl_req)
+        except Exception as e:
+            log_error({
+                "action": "place_oco",
+                "symbol": self.symbol,
+                "side": self.side,
+                "qty": self.qty,
+                "takeProfit": self.tp,
+                "stopPrice": self.sp,
+                "stopLimitPrice": self.sl_limit,
+                "result": "error",
+                "error": str(e),
+            })
+            raise
+
+        log_info({
+            "action": "place_oco",
+            "symbol": self.symbol,
+            "side": self.side,
+            "qty": self.qty,
+            "takeProfit": self.tp,
+            "stopPrice": self.sp,
+            "stopLimitPrice": self.sl_limit,
+            "result": "ok",
+            "linkId": self.link_id,
+            "tpOrderId": tp_resp.get("orderId"),
+            "slOrderId": sl_resp.get("orderId"),
+        })
+        self.placed = {"linkId": self.link_id, "tp": {"orderId": tp_resp.get("orderId")},
+                       "sl": {"orderId": sl_resp.get("orderId")}}
+        await self._sl_acked()
+        if not self.watch:
+            self.finish(self.placed)
+
+    async def _sl_acked(self):
+        self.sent.add("SL")
+        if self.filled == "TP":
+            # The TP filled while the SL was in flight, before on_event could cancel it
+            await self._cancel_leg("SL")
+
+    def sl_replaced(self, cid: str):
+        """
+        TrailingEngine on_amend hook: the SL now rests under `cid`. Called from the
+        trailing worker thread, so a TP that filled mid-amend is handled here too.
+        """
+        self.sl_cid = cid
+        self.sent.add("SL")
+        if self.filled == "TP":
+            self._cancel_cid(cid)
+
+    async def _cancel_leg(self, leg: str):
+        cid = self.sl_cid if leg == "SL" else f"{self.link_id}-{leg}"
+        await self.call(self._cancel_cid, cid)
+
+    def _cancel_cid(self, cid: str):
+        try:
+            resp = self.client.futures_cancel_order(symbol=self.symbol, origClientOrderId=cid)
+            risk = getattr(self.client, "risk", None)
+            if risk is not None:
+                risk.on_cancel(str(resp.get("orderId")))
+        except Exception as e:
+            # -2011: the sibling already filled or was cancelled elsewhere
+            log_error({"action": "cancel_sibling", "symbol": self.symbol, "linkId": self.link_id, "cid": cid,
+                       "result": "error", "error": str(e)})
+
+    async def on_event(self, event: Dict[str, Any]):
+        o = event["o"]
+        if not self.watch or o.get("X") != "FILLED":
+            return
+        leg = o["c"].rpartition("-")[2]
+        if re.fullmatch(r"SL\d+", leg):
+            leg = "SL"  # a trailed stop: TrailingEngine re-places it as -SL1, -SL2, ...
+        sibling = {"TP": "SL", "SL": "TP"}.get(leg)
+        if sibling is None or self.filled:
+            return  # entry fill (bracket): exits are already resting
+        # Set before any await: start() checks it before sending or after acking the SL
+        self.filled = leg
+        cancelled = None
+        if sibling in self.sent:
+            await self._cancel_leg(sibling)
+            cancelled = sibling
+        log_info({"action": "exit_filled", "symbol": self.symbol, "linkId": self.link_id, "filled": leg,
+                  "cancelled": cancelled, "result": "ok"})
+        self.finish({**self.placed, "exit": leg})
+
+    async def stop(self):
+        # Exits stay resting: they protect the position after the runtime exits
+        self.finish(self.placed, status="stopped")
+
+
+def place_oco(client: Any, symbol: str, side: str, qty: float, tp: float, sp: float,
+              sl_limit: Optional[float] = None, link_id: Optional[str] = None) -> Dict[str, Any]:
+    """Place one TP/SL pair (one-shot launcher around OcoStrategy). Raises if either leg fails."""
+    return run_once(OcoStrategy(symbol, side, qty, tp, sp, sl_limit, link_id=link_id), client)
+
 def main():
     args = parse_args()
     cfg = load_env()
@@ -47,84 +227,15 @@ def main():
         sys.exit(1)
 
     client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
-    link_id = f"OCO-{uuid.uuid4().hex[:8]}"
 
     try:
-        # Take Profit order
-        tp_type = "TAKE_PROFIT" if sl_limit else "TAKE_PROFIT"
-        tp_req = {
-            "symbol": symbol,
-            "side": side,
-            "type": tp_type,
-            "reduceOnly": True,
-            "quantity": qty,
-            "price": tp,
-            "timeInForce": "GTC",
-            "workingType": "CONTRACT_PRICE",
-            "newClientOrderId": f"{link_id}-TP",
-        }
-        tp_resp = place_order_with_retry(client, tp_req)  # UPDATED
-
-        # Stop Loss order
-        if sl_limit:
-            sl_type = "STOP"
-            sl_req = {
-                "symbol": symbol,
-                "side": side,
-                "type": sl_type,
-                "reduceOnly": True,
-                "quantity": qty,
-                "price": sl_limit,
-                "stopPrice": sp,
-                "timeInForce": "GTC",
-                "workingType": "CONTRACT_PRICE",
-                "newClientOrderId": f"{link_id}-SL",
-            }
-        else:
-            sl_type = "STOP_MARKET"
-            sl_req = {
-                "symbol": symbol,
-                "side": side,
-                "type": sl_type,
-                "reduceOnly": True,
-                "quantity": qty,
-                "stopPrice": sp,
-                "workingType": "CONTRACT_PRICE",
-                "newClientOrderId": f"{link_id}-SL",
-            }
-
-        sl_resp = place_order_with_retry(client, sl_req)  # UPDATED
-
-        log_info({
-            "action": "place_oco",
-            "symbol": symbol,
-            "side": side,
-            "qty": qty,
-            "takeProfit": tp,
-            "stopPrice": sp,
-            "stopLimitPrice": sl_limit,
-            "result": "ok",
-            "linkId": link_id,
-            "tpOrderId": tp_resp.get("orderId"),
-            "slOrderId": sl_resp.get("orderId"),
-        })
-
-        print(f"OK: OCO linkId={link_id} TP orderId={tp_resp.get('orderId')} SL orderId={sl_resp.get('orderId')}")
-        print("Note: In this simple emulation, auto-cancel on fill is not implemented. Document this in README.")
+        result = place_oco(client, symbol, side, qty, tp, sp, sl_limit)
     except Exception as e:
-        log_error({
-            "action": "place_oco",
-            "symbol": symbol,
-            "side": side,
-            "qty": qty,
-            "takeProfit": tp,
-            "stopPrice": sp,
-            "stopLimitPrice": sl_limit,
-            "result": "error",
-            "error": str(e),
-        })
         print(f"OCO failed: {e}")
         sys.exit(1)
 
+    print(f"OK: OCO linkId={result['linkId']} TP orderId={result['tp']['orderId']} SL orderId={result['sl']['orderId']}")
+    print("Note: This one-shot launcher does not auto-cancel on fill; host OcoStrategy(watch=True) in the runtime for that.")
+
 if __name__ == "__main__":
     main()
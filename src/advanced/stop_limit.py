@@ -1,6 +1,7 @@
 import sys
 import os
 import argparse
+from typing import Optional
 
 # Add project root to path so we can import from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -16,6 +17,7 @@ from src.common import (
     log_error,
     place_order_with_retry,  # NEW
 )
+from src.runtime import Strategy, run_once
 
 def parse_args():
     p = argparse.ArgumentParser(description="Place a STOP-LIMIT futures order (GTC)")
@@ -27,6 +29,69 @@ def parse_args():
     p.add_argument("--timeInForce", default="GTC", choices=["GTC", "IOC", "FOK"], help="Time in force (default GTC)")
     return p.parse_args()
 
+class StopLimitStrategy(Strategy):
+    """A single STOP (stop-limit) order; finishes as soon as the order is acknowledged."""
+
+    kind = "STOP_LIMIT"
+    prefix = "STP"
+
+    def __init__(self, symbol: str, side: str, qty: float, stop_price: float, limit_price: float, tif: str = "GTC",
+                 link_id: Optional[str] = None):
+        super().__init__(link_id)
+        self.symbol = symbol
+        self.side = side
+        self.qty = qty
+        self.stop_price = stop_price
+        self.limit_price = limit_price
+        self.tif = tif
+        self.symbols = [symbol]
+
+    async def start(self):
+        symbol, side, qty, tif = self.symbol, self.side, self.qty, self.tif
+        stop_price, limit_price = self.stop_price, self.limit_price
+        try:
+            # Futures STOP-LIMIT uses type="STOP" with price as limit and stopPrice as trigger
+            req = {
+                "symbol": symbol,
+                "side": side,
+                "type": "STOP",
+                "timeInForce": tif,
+                "quantity": qty,
+                "price": limit_price,
+                "stopPrice": stop_price,
+                "workingType": "CONTRACT_PRICE",  # simple default
+                "newClientOrderId": f"{self.link_id}-STOP",
+            }
+            resp = await self.call(place_order_with_retry, self.client, req)
+            log_info({
+                "action": "place_order",
+                "type": "STOP_LIMIT",
+                "symbol": symbol,
+                "side": side,
+                "qty": qty,
+                "stopPrice": stop_price,
+                "limitPrice": limit_price,
+                "tif": tif,
+                "result": "ok",
+                "linkId": self.link_id,
+                "orderId": resp.get("orderId"),
+            })
+        except Exception as e:
+            log_error({
+                "action": "place_order",
+                "type": "STOP_LIMIT",
+                "symbol": symbol,
+                "side": side,
+                "qty": qty,
+                "stopPrice": stop_price,
+                "limitPrice": limit_price,
+                "tif": tif,
+                "result": "error",
+                "error": str(e),
+            })
+            raise
+        self.finish(resp)
+
 def main():
     args = parse_args()
     cfg = load_env()
@@ -53,46 +118,11 @@ def main():
     client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
 
     try:
-        # Futures STOP-LIMIT uses type="STOP" with price as limit and stopPrice as trigger
-        req = {
-            "symbol": symbol,
-            "side": side,
-            "type": "STOP",
-            "timeInForce": tif,
-            "quantity": qty,
-            "price": limit_price,
-            "stopPrice": stop_price,
-            "workingType": "CONTRACT_PRICE",  # simple default
-        }
-        resp = place_order_with_retry(client, req)  # UPDATED
-        log_info({
-            "action": "place_order",
-            "type": "STOP_LIMIT",
-            "symbol": symbol,
-            "side": side,
-            "qty": qty,
-            "stopPrice": stop_price,
-            "limitPrice": limit_price,
-            "tif": tif,
-            "result": "ok",
-            "orderId": resp.get("orderId"),
-        })
-        print(f"OK: STOP-LIMIT {side} {qty} {symbol}, stop={stop_price}, limit={limit_price}, tif={tif}, orderId={resp.get('orderId')}")
+        resp = run_once(StopLimitStrategy(symbol, side, qty, stop_price, limit_price, tif), client)
     except Exception as e:
-        log_error({
-            "action": "place_order",
-            "type": "STOP_LIMIT",
-            "symbol": symbol,
-            "side": side,
-            "qty": qty,
-            "stopPrice": stop_price,
-            "limitPrice": limit_price,
-            "tif": tif,
-            "result": "error",
-            "error": str(e),
-        })
         print(f"Order failed: {e}")
         sys.exit(1)
+    print(f"OK: STOP-LIMIT {side} {qty} {symbol}, stop={stop_price}, limit={limit_price}, tif={tif}, orderId={resp.get('orderId')}")
 
 if __name__ == "__main__":
     main()
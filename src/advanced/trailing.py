@@ -0,0 +1,387 @@
+import sys
+import os
+import csv
+import json
+import math
+import time
+import queue
+import argparse
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# Add project root to path so we can import src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.common import (
+    load_env,
+    get_client,
+    validate_symbol,
+    validate_side,
+    validate_qty,
+    validate_price,
+    log_info,
+    log_error,
+    place_order_with_retry,
+)
+
+
+class TrailingStop:
+    """Trailing state for one bracket. Prices are held as integer ticks."""
+
+    __slots__ = ("link_id", "symbol", "exit_side", "qty", "tick", "trail_ticks", "threshold",
+                 "best", "stop", "pending", "in_flight", "last_amend", "seq", "cid", "amends", "triggered",
+                 "working_type", "limit_offset", "on_amend")
+
+    def __init__(self, link_id: str, symbol: str, exit_side: str, qty: float, stop_price: float,
+                 trail: float, tick_size: float, threshold_ticks: int, cid: str,
+                 working_type: str = "CONTRACT_PRICE", limit_price: Optional[float] = None,
+                 on_amend: Optional[Callable[[str], None]] = None):
+        self.link_id = link_id
+        self.symbol = symbol
+        self.exit_side = exit_side      # SELL protects a long, BUY protects a short
+        self.qty = qty
+        self.tick = tick_size
+        self.trail_ticks = int(round(trail / tick_size))
+        self.threshold = threshold_ticks
+        self.stop = int(round(stop_price / tick_size))
+        self.best: Optional[int] = None
+        self.pending: Optional[int] = None  # desired stop not yet sent (coalesced)
+        self.in_flight: Optional[int] = None  # stop being placed by the amend worker
+        self.last_amend = float("-inf")
+        self.seq = 0
+        self.cid = cid
+        self.amends = 0
+        self.triggered = False
+        self.working_type = working_type  # kept from the bracket's SL leg on every replacement
+        # A STOP (stop-limit) leg keeps its limit the same distance from the trigger; None = STOP_MARKET
+        self.limit_offset = None if limit_price is None else int(round(limit_price / tick_size)) - self.stop
+        self.on_amend = on_amend  # called with the new client id after each replacement
+
+    def working(self) -> int:
+        """The furthest stop already wanted, sent or resting; new stops are measured from it."""
+        if self.pending is not None:
+            return self.pending
+        return self.in_flight if self.in_flight is not None else self.stop
+
+    def request(self, stop: int, cid: str) -> Dict[str, Any]:
+        req = {
+            "symbol": self.symbol,
+            "side": self.exit_side,
+            "type": "STOP_MARKET" if self.limit_offset is None else "STOP",
+            "reduceOnly": True,
+            "quantity": self.qty,
+            "stopPrice": round(stop * self.tick, 10),
+            "workingType": self.working_type,
+            "newClientOrderId": cid,
+        }
+        if self.limit_offset is not None:
+            req["price"] = round((stop + self.limit_offset) * self.tick, 10)
+            req["timeInForce"] = "GTC"
+        return req
+
+
+class TrailingEngine:
+    """
+    Trails the stop leg of many brackets from a mark-price feed.
+
+    A new stop is only wanted when it would move at least `threshold_ticks`
+    in the protective direction. Amends per link are coalesced: at most one
+    per `min_amend_interval` seconds, and only the latest wanted stop is sent.
+    With client=None the engine only records amends (offline backtest).
+
+    With background=True amends are sent by a worker thread, so a slow amend
+    (network, retry backoff) never holds up the mark-price callback or the
+    other links; a link with an amend in flight waits for it, and whatever
+    stop was wanted meanwhile is sent as soon as it completes.
+    """
+
+    def __init__(self, client: Any = None, min_amend_interval: float = 1.0, background: bool = False):
+        self.client = client
+        self.min_amend_interval = min_amend_interval
+        self.by_link: Dict[str, TrailingStop] = {}
+        self.by_symbol: Dict[str, List[TrailingStop]] = defaultdict(list)
+        self.dirty: Set[str] = set()
+        self.updates = 0
+        self.amends_sent = 0
+        self._lock = threading.Lock()  # marks and the amend worker share the per-link state
+        self._queue: Optional["queue.Queue"] = None
+        self._worker: Optional[threading.Thread] = None
+        if background and client is not None:
+            self._queue = queue.Queue()
+            self._worker = threading.Thread(target=self._work, name="trail-amend", daemon=True)
+            self._worker.start()
+
+    def add(self, link_id: str, symbol: str, exit_side: str, qty: float, stop_price: float,
+            trail: float, tick_size: float, threshold_ticks: int = 1, cid: Optional[str] = None,
+            working_type: str = "CONTRACT_PRICE", limit_price: Optional[float] = None,
+            on_amend: Optional[Callable[[str], None]] = None) -> TrailingStop:
+        """
+        Trail a resting stop. limit_price keeps a STOP (stop-limit) leg a STOP,
+        moving its limit with the trigger. on_amend(new_cid) lets the owner of
+        the leg (e.g. a watched OcoStrategy) follow the replacement.
+        """
+        st = TrailingStop(link_id, symbol, exit_side, qty, stop_price, trail, tick_size,
+                          threshold_ticks, cid or f"{link_id}-SL", working_type, limit_price, on_amend)
+        self.by_link[link_id] = st
+        self.by_symbol[symbol].append(st)
+        return st
+
+    def remove(self, link_id: str):
+        st = self.by_link.pop(link_id, None)
+        if st is not None:
+            self.by_symbol[st.symbol].remove(st)
+            self.dirty.discard(link_id)
+
+    def on_mark(self, symbol: str, price: float, now: Optional[float] = None):
+        with self._lock:
+            self._on_mark(symbol, price, time.monotonic() if now is None else now)
+
+    def _on_mark(self, symbol: str, price: float, now: float):
+        self.updates += 1
+        for st in self.by_symbol.get(symbol, ()):
+            if st.triggered:
+                continue
+            if st.exit_side == "SELL":
+                px = math.floor(price / st.tick + 1e-9)
+                if px <= st.stop:
+                    self._triggered(st, price)
+                    continue
+                if st.best is None or px > st.best:
+                    st.best = px
+                    want = px - st.trail_ticks
+                    if want - st.working() >= st.threshold:
+                        st.pending = want
+                        self.dirty.add(st.link_id)
+            else:
+                px = math.ceil(price / st.tick - 1e-9)
+                if px >= st.stop:
+                    self._triggered(st, price)
+                    continue
+                if st.best is None or px < st.best:
+                    st.best = px
+                    want = px + st.trail_ticks
+                    if st.working() - want >= st.threshold:
+                        st.pending = want
+                        self.dirty.add(st.link_id)
+        if self.dirty:
+            self.flush(now)
+
+    def flush(self, now: float):
+        sent = []
+        for link_id in self.dirty:
+            st = self.by_link[link_id]
+            if st.in_flight is None and now - st.last_amend >= self.min_amend_interval:
+                new_stop = st.in_flight = st.pending
+                st.pending = None
+                st.last_amend = now
+                st.seq += 1
+                new_cid = f"{st.link_id}-SL{st.seq}"
+                if self._queue is not None:
+                    self._queue.put((st, new_stop, new_cid))
+                else:
+                    self._amend(st, new_stop, new_cid)
+                sent.append(link_id)
+        self.dirty.difference_update(sent)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                st = job[0]
+                self._amend(*job)
+                with self._lock:
+                    if st.link_id in self.dirty:
+                        self.flush(time.monotonic())
+            except Exception as e:
+                log_error({"action": "trail_amend", "linkId": job[0].link_id, "result": "error", "error": str(e)})
+            finally:
+                self._queue.task_done()
+
+    def drain(self):
+        """Wait until every queued amend has been sent (background mode)."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._queue is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._queue = None
+
+    def _amend(self, st: TrailingStop, new_stop: int, new_cid: str):
+        try:
+            self._replace(st, new_stop, new_cid)
+        finally:
+            st.in_flight = None
+
+    def _replace(self, st: TrailingStop, new_stop: int, new_cid: str):
+        old_cid = st.cid
+        req = st.request(new_stop, new_cid)
+        stop_price = req["stopPrice"]
+        if self.client is not None:
+            # Futures cannot modify a stop in place. Place the new stop before
+            # cancelling the old one so the position is never unprotected; both are
+            # reduceOnly, so a brief overlap cannot open a new position.
+            try:
+                place_order_with_retry(self.client, req)
+            except Exception as e:
+                log_error({"action": "trail_amend", "linkId": st.link_id, "stopPrice": stop_price,
+                           "result": "error", "error": str(e)})
+                return
+            try:
+                resp = self.client.futures_cancel_order(symbol=st.symbol, origClientOrderId=old_cid)
+                risk = getattr(self.client, "risk", None)
+                if risk is not None:
+                    risk.on_cancel(str(resp.get("orderId")))
+            except Exception as e:
+                log_error({"action": "trail_cancel", "linkId": st.link_id, "cid": old_cid,
+                           "result": "error", "error": str(e)})
+            log_info({"action": "trail_amend", "linkId": st.link_id, "symbol": st.symbol,
+                      "stopPrice": stop_price, "result": "ok"})
+        st.stop = new_stop
+        st.cid = new_cid
+        st.amends += 1
+        self.amends_sent += 1
+        if st.on_amend is not None:
+            st.on_amend(new_cid)
+
+    def _triggered(self, st: TrailingStop, price: float):
+        st.triggered = True
+        self.dirty.discard(st.link_id)
+        if self.client is not None:
+            log_info({"action": "trail_triggered", "linkId": st.link_id, "symbol": st.symbol,
+                      "stopPrice": round(st.stop * st.tick, 10), "markPrice": price})
+
+    def on_message(self, msg: Dict[str, Any]):
+        """Callback for python-binance mark price sockets (raw or combined-stream payloads)."""
+        data = msg.get("data", msg)
+        if data.get("e") == "markPriceUpdate":
+            self.on_mark(data["s"], float(data["p"]))
+
+
+def read_prices(path: str) -> Iterator[Tuple[float, str, float]]:
+    """
+    Yields (ts_seconds, symbol, price) from a recorded file: CSV with
+    ts,symbol,price columns (ts in ms) or JSON lines of markPriceUpdate messages.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield float(row["ts"]) / 1000, row["symbol"], float(row["price"])
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                data = json.loads(line)
+                data = data.get("data", data)
+                yield float(data["E"]) / 1000, data["s"], float(data["p"])
+
+
+def replay(engine: TrailingEngine, path: str) -> int:
+    """Drive the engine from a recorded price file using recorded timestamps. Returns updates processed."""
+    n = 0
+    for ts, symbol, price in read_prices(path):
+        engine.on_mark(symbol, price, now=ts)
+        n += 1
+    return n
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Trail the stop leg of a bracket from the mark price stream")
+    p.add_argument("symbol", help="e.g., BTCUSDT")
+    p.add_argument("side", help="Exit side of the stop: SELL protects a long, BUY protects a short")
+    p.add_argument("quantity", help="Stop quantity (float)")
+    p.add_argument("--stopPrice", required=True, help="Current stop trigger price (float)")
+    p.add_argument("--trail", required=True, help="Trail distance in price units (float)")
+    p.add_argument("--tickSize", default="0.1", help="Symbol tick size (default 0.1)")
+    p.add_argument("--thresholdTicks", type=int, default=5, help="Minimum stop move in ticks before amending (default 5)")
+    p.add_argument("--minAmendSec", type=float, default=1.0, help="Minimum seconds between amends (default 1.0)")
+    p.add_argument("--stopLimitPrice", help="Limit price if the stop leg is a STOP (stop-limit); kept the same "
+                                            "distance from the trigger on every amend")
+    p.add_argument("--workingType", default="CONTRACT_PRICE", choices=("CONTRACT_PRICE", "MARK_PRICE"),
+                   help="Trigger price of the bracket's SL leg, kept on every amend (default CONTRACT_PRICE)")
+    p.add_argument("--linkId", help="Bracket linkId whose {linkId}-SL stop is trailed (live mode)")
+    p.add_argument("--replay", help="Backtest offline from a recorded price file (.csv or .jsonl)")
+    p.add_argument("--pollMs", type=float, default=50.0,
+                   help="Snapshot poll interval when MARKET_SHM is set (default 50)")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    cfg = load_env()
+    try:
+        symbol = validate_symbol(args.symbol)
+        side = validate_side(args.side)
+        qty = validate_qty(args.quantity)
+        stop_price = validate_price(args.stopPrice)
+        trail = validate_price(args.trail)
+        tick = validate_price(args.tickSize)
+        sl_limit = validate_price(args.stopLimitPrice) if args.stopLimitPrice else None
+        if args.thresholdTicks < 1:
+            raise ValueError("thresholdTicks must be >= 1")
+        if not args.replay and not args.linkId:
+            raise ValueError("linkId is required unless --replay is given")
+    except Exception as e:
+        log_error({"action": "validate", "type": "TRAILING", "error": str(e)})
+        print(f"Input error: {e}")
+        sys.exit(1)
+
+    if args.replay:
+        engine = TrailingEngine(client=None, min_amend_interval=args.minAmendSec)
+        st = engine.add("BACKTEST", symbol, side, qty, stop_price, trail, tick, args.thresholdTicks)
+        t0 = time.perf_counter()
+        n = replay(engine, args.replay)
+        elapsed = time.perf_counter() - t0
+        print(f"Replayed {n} updates in {elapsed:.3f}s: {st.amends} amends, "
+              f"final stop={st.stop * tick:.8g}, triggered={st.triggered}")
+        return
+
+    client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
+    # Amends go out from a worker thread, never from inside the price callback
+    engine = TrailingEngine(client=client, min_amend_interval=args.minAmendSec, background=True)
+    engine.add(args.linkId, symbol, side, qty, stop_price, trail, tick, args.thresholdTicks,
+               working_type=args.workingType, limit_price=sl_limit)
+    log_info({"action": "trail_start", "symbol": symbol, "side": side, "qty": qty, "stopPrice": stop_price,
+              "trail": trail, "linkId": args.linkId})
+
+    state = engine.by_link[args.linkId]
+    market = getattr(client, "market", None)
+    if market is not None:
+        # The host's feeder already holds the stream: follow the shared snapshot instead
+        print(f"Trailing {args.linkId} on {symbol} mark price from snapshot {market.name} (Ctrl+C to stop)")
+        last_seq = 0
+        try:
+            while not state.triggered:
+                snap = market.get(symbol)
+                if snap is not None and snap.seq != last_seq and not math.isnan(snap.mark):
+                    last_seq = snap.seq
+                    engine.on_mark(symbol, snap.mark)
+                time.sleep(args.pollMs / 1000)
+            print("Stop triggered; trailing finished")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            engine.close()
+        return
+
+    from binance import ThreadedWebsocketManager
+    twm = ThreadedWebsocketManager(api_key=cfg["API_KEY"], api_secret=cfg["API_SECRET"])
+    twm.start()
+    twm.start_symbol_mark_price_socket(callback=engine.on_message, symbol=symbol, fast=True)
+    print(f"Trailing {args.linkId} on {symbol} mark price (Ctrl+C to stop)")
+    try:
+        while not state.triggered:
+            time.sleep(0.5)
+        print("Stop triggered; trailing finished")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        twm.stop()
+        engine.close()
+
+if __name__ == "__main__":
+    main()
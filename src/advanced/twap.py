@@ -1,8 +1,8 @@
 import sys
 import os
 import argparse
-import time
-import uuid
+import asyncio
+from typing import Any, Callable, Dict, Optional
 
 # Add project root to path so we can import from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -15,8 +15,10 @@ from src.common import (
     validate_qty,
     log_info,
     log_error,
-    place_order_with_retry,
+    mark_price,
 )
+from src.journal import open_journal, place_leg
+from src.runtime import Strategy, run_once
 
 def parse_args():
     p = argparse.ArgumentParser(description="TWAP (Time-Weighted Average Price) execution")
@@ -27,6 +29,166 @@ def parse_args():
     p.add_argument("--intervalSec", type=int, default=10, help="Seconds between slices (default: 10)")
     return p.parse_args()
 
+class TwapStrategy(Strategy):
+    """
+    Executes total_qty as `slices` MARKET orders spaced interval_sec apart.
+    Failed slices are logged and skipped; the final slice absorbs the remainder.
+    Waiting between slices is an asyncio sleep, so a hosted TWAP costs no thread.
+    """
+
+    kind = "TWAP"
+    prefix = "TWAP"
+
+    def __init__(self, symbol: str, side: str, total_qty: float, slices: int, interval_sec: float,
+                 link_id: Optional[str] = None):
+        super().__init__(link_id)
+        self.symbol = symbol
+        self.side = side
+        self.total_qty = total_qty
+        self.slices = slices
+        self.interval_sec = interval_sec
+        self.symbols = [symbol]
+        self.executed_qty = 0.0
+
+    async def start(self):
+        symbol, side, total_qty, slices, interval_sec = (
+            self.symbol, self.side, self.total_qty, self.slices, self.interval_sec)
+        link_id, journal, say = self.link_id, self.journal, self.say
+
+        # Calculate slice size
+        slice_qty = total_qty / slices
+
+        log_info({
+            "action": "twap_start",
+            "symbol": symbol,
+            "side": side,
+            "totalQty": total_qty,
+            "slices": slices,
+            "sliceQty": slice_qty,
+            "intervalSec": interval_sec,
+            "linkId": link_id,
+        })
+
+        if journal is not None:
+            # One durable write covers every slice; recovery replays the rest at the same spacing
+            planned = [{
+                "symbol": symbol,
+                "side": side,
+                "type": "MARKET",
+                "quantity": slice_qty if i < slices else total_qty - slice_qty * (slices - 1),
+                "newClientOrderId": f"{link_id}-S{i}",
+            } for i in range(1, slices + 1)]
+            # The decision-time mark is the arrival price that shortfall is measured against
+            arrival = await self.call(mark_price, self.client, symbol)
+            # Forced writes fsync, so they run on the call pool rather than the event loop
+            await self.call(journal.plan, link_id, planned, strategy="TWAP",
+                            meta={"intervalSec": interval_sec, "arrivalPrice": arrival})
+
+        say(f"Starting TWAP: {total_qty} {symbol} {side} over {slices} slices, {interval_sec}s apart")
+        say(f"Each slice: ~{slice_qty:.6f} | LinkId: {link_id}")
+
+        for slice_idx in range(1, slices + 1):
+            try:
+                # Use exact slice quantity except for last slice (handle rounding)
+                if slice_idx == slices:
+                    current_qty = total_qty - self.executed_qty  # Remainder
+                else:
+                    current_qty = slice_qty
+
+                if current_qty <= 0:
+                    if journal is not None:
+                        await self.call(journal.cancel, link_id, f"{link_id}-S{slice_idx}")
+                    say(f"Slice {slice_idx}/{slices}: Skipped (quantity {current_qty:.6f} <= 0)")
+                    continue
+
+                req = {
+                    "symbol": symbol,
+                    "side": side,
+                    "type": "MARKET",
+                    "quantity": current_qty,
+                    "newClientOrderId": f"{link_id}-S{slice_idx}",
+                }
+                if journal is not None and slice_idx == slices and current_qty != planned[-1]["quantity"]:
+                    await self.call(journal.replan, link_id, req)
+
+                resp = await self.call(place_leg, self.client, journal, link_id, req)
+                order_id = resp.get("orderId")
+                self.executed_qty += current_qty
+
+                log_info({
+                    "action": "twap_slice",
+                    "symbol": symbol,
+                    "side": side,
+                    "sliceIndex": slice_idx,
+                    "totalSlices": slices,
+                    "qty": current_qty,
+                    "executedQty": self.executed_qty,
+                    "linkId": link_id,
+                    "orderId": order_id,
+                    "result": "ok",
+                })
+
+                say(f"Slice {slice_idx}/{slices}: {current_qty:.6f} {symbol} {side} → orderId={order_id}")
+
+                # Wait before next slice (except for last one)
+                if slice_idx < slices:
+                    say(f"Waiting {interval_sec}s before next slice...")
+                    await asyncio.sleep(interval_sec)
+
+            except Exception as e:
+                log_error({
+                    "action": "twap_slice",
+                    "symbol": symbol,
+                    "side": side,
+                    "sliceIndex": slice_idx,
+                    "totalSlices": slices,
+                    "qty": current_qty,
+                    "linkId": link_id,
+                    "result": "error",
+                    "error": str(e),
+                })
+                say(f"Slice {slice_idx}/{slices} failed: {e}")
+                # Continue with remaining slices
+
+        log_info({
+            "action": "twap_complete",
+            "symbol": symbol,
+            "side": side,
+            "totalQty": total_qty,
+            "executedQty": self.executed_qty,
+            "slices": slices,
+            "linkId": link_id,
+            "result": "ok",
+        })
+        if journal is not None:
+            await self.call(journal.done, link_id)
+
+        say(f"TWAP complete: {self.executed_qty:.6f}/{total_qty:.6f} executed, linkId={link_id}")
+        self.finish({"linkId": link_id, "executedQty": self.executed_qty, "totalQty": total_qty})
+
+    async def stop(self):
+        # Deliberately stopped: recovery must not send the remaining slices
+        if self.journal is not None:
+            await self.call(self.journal.done, self.link_id, status="stopped")
+        self.finish({"linkId": self.link_id, "executedQty": self.executed_qty, "totalQty": self.total_qty},
+                    status="stopped")
+
+
+def run_twap(
+    client: Any,
+    symbol: str,
+    side: str,
+    total_qty: float,
+    slices: int,
+    interval_sec: float,
+    link_id: Optional[str] = None,
+    journal: Any = None,
+    on_progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Run one TWAP to completion (one-shot launcher around TwapStrategy)."""
+    strategy = TwapStrategy(symbol, side, total_qty, slices, interval_sec, link_id=link_id)
+    return run_once(strategy, client, journal, on_progress=on_progress)
+
 def main():
     args = parse_args()
     cfg = load_env()
@@ -49,97 +211,12 @@ def main():
         sys.exit(1)
 
     client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
-    link_id = f"TWAP-{uuid.uuid4().hex[:8]}"
-    
-    # Calculate slice size
-    slice_qty = total_qty / slices
-    executed_qty = 0.0
-    
-    log_info({
-        "action": "twap_start",
-        "symbol": symbol,
-        "side": side,
-        "totalQty": total_qty,
-        "slices": slices,
-        "sliceQty": slice_qty,
-        "intervalSec": interval_sec,
-        "linkId": link_id,
-    })
-    
-    print(f"Starting TWAP: {total_qty} {symbol} {side} over {slices} slices, {interval_sec}s apart")
-    print(f"Each slice: ~{slice_qty:.6f} | LinkId: {link_id}")
-    
-    for slice_idx in range(1, slices + 1):
-        try:
-            # Use exact slice quantity except for last slice (handle rounding)
-            if slice_idx == slices:
-                current_qty = total_qty - executed_qty  # Remainder
-            else:
-                current_qty = slice_qty
-            
-            if current_qty <= 0:
-                print(f"Slice {slice_idx}/{slices}: Skipped (quantity {current_qty:.6f} <= 0)")
-                continue
-                
-            req = {
-                "symbol": symbol,
-                "side": side,
-                "type": "MARKET",
-                "quantity": current_qty,
-                "newClientOrderId": f"{link_id}-S{slice_idx}",
-            }
-            
-            resp = place_order_with_retry(client, req)
-            order_id = resp.get("orderId")
-            executed_qty += current_qty
-            
-            log_info({
-                "action": "twap_slice",
-                "symbol": symbol,
-                "side": side,
-                "sliceIndex": slice_idx,
-                "totalSlices": slices,
-                "qty": current_qty,
-                "executedQty": executed_qty,
-                "linkId": link_id,
-                "orderId": order_id,
-                "result": "ok",
-            })
-            
-            print(f"Slice {slice_idx}/{slices}: {current_qty:.6f} {symbol} {side} → orderId={order_id}")
-            
-            # Wait before next slice (except for last one)
-            if slice_idx < slices:
-                print(f"Waiting {interval_sec}s before next slice...")
-                time.sleep(interval_sec)
-                
-        except Exception as e:
-            log_error({
-                "action": "twap_slice",
-                "symbol": symbol,
-                "side": side,
-                "sliceIndex": slice_idx,
-                "totalSlices": slices,
-                "qty": current_qty,
-                "linkId": link_id,
-                "result": "error",
-                "error": str(e),
-            })
-            print(f"Slice {slice_idx}/{slices} failed: {e}")
-            # Continue with remaining slices
-    
-    log_info({
-        "action": "twap_complete",
-        "symbol": symbol,
-        "side": side,
-        "totalQty": total_qty,
-        "executedQty": executed_qty,
-        "slices": slices,
-        "linkId": link_id,
-        "result": "ok",
-    })
-    
-    print(f"TWAP complete: {executed_qty:.6f}/{total_qty:.6f} executed, linkId={link_id}")
+    journal = open_journal(cfg)
+    try:
+        run_twap(client, symbol, side, total_qty, slices, interval_sec, journal=journal, on_progress=print)
+    finally:
+        if journal is not None:
+            journal.close()
 
 if __name__ == "__main__":
     main()
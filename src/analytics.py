@@ -0,0 +1,217 @@
+"""
+Daksh Binance Futures Trading Bot
+Post-trade analytics over bot.log and the order intent journal
+
+Records are parsed once into pandas/NumPy columns; every metric after that
+(per-linkId shortfall, VWAP comparison, retry and fill rates, latency
+percentiles) is a vectorized group-by, not a per-row Python loop.
+"""
+
+import json
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.logschema import read_records
+
+# Field aliases seen in bot.log: top-level on strategy records, nested under
+# "request" on FakeClient records and under "req" on retry records
+LOG_FIELDS = ["symbol", "side", "type", "quantity", "price", "stopPrice"]
+
+
+def _read_jsonl(path: str) -> List[dict]:
+    out = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith("{"):
+                continue
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                continue
+    return out
+
+
+def load_log(path: str) -> pd.DataFrame:
+    """bot.log (or a binary bot.bin) as a flat frame with symbol/side/type/qty/price coalesced across record shapes."""
+    df = pd.json_normalize(list(read_records(path)))
+    if df.empty:
+        return pd.DataFrame(columns=["ts", "level", "action", "linkId"] + LOG_FIELDS)
+    for field in LOG_FIELDS:
+        col = df[field] if field in df else pd.Series(np.nan, index=df.index, dtype=object)
+        for prefix in ("request.", "req."):
+            if prefix + field in df:
+                col = col.combine_first(df[prefix + field])
+        df[field] = col
+    if "qty" in df:
+        df["quantity"] = df["qty"].combine_first(df["quantity"])
+    df["ts"] = pd.to_datetime(df["ts"], utc=True, errors="coerce")
+    for col in ("quantity", "price", "stopPrice", "attempt"):
+        if col in df:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def load_journal(path: str) -> pd.DataFrame:
+    """
+    One row per planned leg of orders.journal, joined with its last outcome:
+    linkId, cid, strategy, arrivalPrice (link meta), symbol, side, type, qty,
+    price, tPlan, tDone, outcome (ack/fail/cancel/NaN), status, avgPrice,
+    executedQty, latencyMs.
+    """
+    df = pd.json_normalize(_read_jsonl(path))
+    return legs_frame(df)
+
+
+def legs_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Build the per-leg frame from normalized journal records (also used by benchmarks)."""
+    if df.empty:
+        return pd.DataFrame(columns=["linkId", "cid", "strategy", "arrivalPrice", "symbol", "side", "type", "qty",
+                                     "price", "tPlan", "tDone", "outcome", "avgPrice", "executedQty", "latencyMs"])
+    if "meta.arrivalPrice" not in df:
+        df = df.assign(**{"meta.arrivalPrice": np.nan})
+    links = (df.loc[df["op"] == "link", ["linkId", "strategy", "meta.arrivalPrice"]]
+             .drop_duplicates("linkId", keep="last")
+             .rename(columns={"meta.arrivalPrice": "arrivalPrice"}))
+    # Join on integer codes: factorizing the client ids once is far cheaper than string merges
+    df = df.assign(key=pd.factorize(df["cid"])[0])
+    plans = df.loc[df["op"] == "plan"].drop_duplicates("key", keep="last")
+    legs = pd.DataFrame({
+        "key": plans["key"].to_numpy(),
+        "linkId": plans["linkId"].to_numpy(),
+        "cid": plans["cid"].to_numpy(),
+        "symbol": plans["req.symbol"].to_numpy(),
+        "side": plans["req.side"].to_numpy(),
+        "type": plans["req.type"].to_numpy(),
+        "qty": pd.to_numeric(plans["req.quantity"], errors="coerce").to_numpy(),
+        "price": pd.to_numeric(plans.get("req.price", pd.Series(np.nan, index=plans.index)), errors="coerce").to_numpy(),
+        "tPlan": plans["t"].to_numpy(dtype=float),
+    })
+    outcome_cols = [c for c in ("key", "op", "t", "status", "avgPrice", "executedQty", "latencyMs") if c in df]
+    outcomes = (df.loc[df["op"].isin(["ack", "fail", "cancel"]), outcome_cols]
+                .drop_duplicates("key", keep="last")
+                .rename(columns={"op": "outcome", "t": "tDone"}))
+    legs = legs.merge(outcomes, on="key", how="left").merge(links, on="linkId", how="left").drop(columns="key")
+    for col in ("arrivalPrice", "avgPrice", "executedQty", "latencyMs"):
+        legs[col] = pd.to_numeric(legs[col], errors="coerce") if col in legs else np.nan
+    return legs
+
+
+def _fill_price(legs: pd.DataFrame) -> np.ndarray:
+    """Exchange avgPrice where reported, else the limit price of the leg."""
+    avg = legs["avgPrice"].to_numpy(dtype=float)
+    return np.where(np.isfinite(avg) & (avg > 0), avg, legs["price"].to_numpy(dtype=float))
+
+
+def _fill_qty(legs: pd.DataFrame) -> np.ndarray:
+    """executedQty where reported, else the planned qty of acknowledged MARKET legs (resting legs: 0)."""
+    exe = legs["executedQty"].to_numpy(dtype=float)
+    filled = ((legs["outcome"] == "ack") & (legs["type"] == "MARKET")).to_numpy()
+    return np.where(np.isfinite(exe), exe, np.where(filled, legs["qty"].to_numpy(dtype=float), 0.0))
+
+
+def market_vwap(market: pd.DataFrame, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """
+    VWAP of market trades (columns ts [s], price, qty; sorted by ts) over each
+    [start, end] window, via prefix sums and two searchsorted calls.
+    """
+    ts = market["ts"].to_numpy(dtype=float)
+    pv = np.concatenate(([0.0], np.cumsum(market["price"].to_numpy(dtype=float) * market["qty"].to_numpy(dtype=float))))
+    v = np.concatenate(([0.0], np.cumsum(market["qty"].to_numpy(dtype=float))))
+    lo = np.searchsorted(ts, start, side="left")
+    hi = np.searchsorted(ts, end, side="right")
+    vol = v[hi] - v[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(vol > 0, (pv[hi] - pv[lo]) / vol, np.nan)
+
+
+def execution_quality(
+    legs: pd.DataFrame,
+    arrival: Optional[pd.Series] = None,
+    market: Optional[pd.DataFrame] = None,
+    entry_types: Iterable[str] = ("MARKET", "LIMIT"),
+) -> pd.DataFrame:
+    """
+    Per-linkId execution report over the entry/slice legs (exits excluded).
+
+    arrival: optional Series linkId -> arrival price; defaults to the mark
+    price the strategy journaled when it planned the link (no default, so no
+    shortfall, for links journaled without one).
+    market: optional trades frame (ts, price, qty) for the market VWAP over the
+    link's execution window.
+    Filled quantity does not depend on a fill price being known; the achieved
+    price averages the fills that have one.
+    shortfallBps and vwapSlippageBps are signed so that positive = cost.
+    """
+    legs = legs.loc[legs["type"].isin(list(entry_types))]
+    px = _fill_price(legs)
+    q = _fill_qty(legs)
+    priced = np.isfinite(px) & (q > 0)
+    work = pd.DataFrame({
+        "linkId": legs["linkId"].to_numpy(),
+        "sign": np.where(legs["side"].to_numpy() == "BUY", 1.0, -1.0),
+        "pq": np.where(priced, px * q, 0.0),
+        "q": q,
+        "pricedQ": np.where(priced, q, 0.0),
+        "planned": legs["qty"].to_numpy(dtype=float),
+        "arrival": legs["arrivalPrice"].to_numpy(dtype=float),
+        "tPlan": legs["tPlan"].to_numpy(dtype=float),
+        "tDone": legs["tDone"].to_numpy(dtype=float),
+    })
+    g = work.groupby("linkId", sort=False)
+    out = g.agg(
+        side=("sign", "first"),
+        legs=("q", "size"),
+        plannedQty=("planned", "sum"),
+        filledQty=("q", "sum"),
+        pricedQty=("pricedQ", "sum"),
+        notional=("pq", "sum"),
+        arrivalPrice=("arrival", "first"),
+        start=("tPlan", "min"),
+        end=("tDone", "max"),
+    )
+    strategy = legs.drop_duplicates("linkId").set_index("linkId")[["strategy", "symbol"]]
+    out = out.join(strategy)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["achievedPrice"] = np.where(out["pricedQty"] > 0, out["notional"] / out["pricedQty"], np.nan)
+        out["fillRate"] = out["filledQty"] / out["plannedQty"]
+    if arrival is not None:
+        out["arrivalPrice"] = arrival.reindex(out.index).combine_first(out["arrivalPrice"])
+    out["shortfallBps"] = out["side"] * (out["achievedPrice"] - out["arrivalPrice"]) / out["arrivalPrice"] * 1e4
+    if market is not None and len(market):
+        end = out["end"].fillna(out["start"]).to_numpy(dtype=float)
+        out["marketVwap"] = market_vwap(market, out["start"].to_numpy(dtype=float), end)
+        out["vwapSlippageBps"] = out["side"] * (out["achievedPrice"] - out["marketVwap"]) / out["marketVwap"] * 1e4
+    out["side"] = np.where(out["side"] > 0, "BUY", "SELL")
+    return out.drop(columns=["notional", "pricedQty"])
+
+
+def order_type_stats(legs: pd.DataFrame, log: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Per order type: planned/acked/failed legs, ack and fill rates, retry rate
+    (retry_attempt records in bot.log per planned leg) and latency percentiles.
+    """
+    q = _fill_qty(legs)
+    work = pd.DataFrame({
+        "type": legs["type"].to_numpy(),
+        "acked": (legs["outcome"] == "ack").to_numpy(),
+        "failed": (legs["outcome"] == "fail").to_numpy(),
+        "planned": legs["qty"].to_numpy(dtype=float),
+        "filled": q,
+        "latencyMs": legs["latencyMs"].to_numpy(dtype=float),
+    })
+    g = work.groupby("type")
+    out = g.agg(legs=("acked", "size"), acked=("acked", "sum"), failed=("failed", "sum"),
+                plannedQty=("planned", "sum"), filledQty=("filled", "sum"))
+    out["ackRate"] = out["acked"] / out["legs"]
+    out["fillRate"] = out["filledQty"] / out["plannedQty"]
+    lat = g["latencyMs"].quantile([0.5, 0.9, 0.99]).unstack()
+    lat.columns = ["latencyP50", "latencyP90", "latencyP99"]
+    out = out.join(lat).join(g["latencyMs"].max().rename("latencyMax"))
+
+    if log is not None and "action" in log and len(log):
+        retries = log.loc[log["action"] == "retry_attempt"].groupby("type").size()
+        out["retries"] = retries.reindex(out.index).fillna(0).astype(int)
+        out["retryRate"] = out["retries"] / out["legs"]
+    return out
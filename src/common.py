@@ -11,13 +11,26 @@ import re
 import json
 import uuid
 import time
+import random
+import threading
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 from dotenv import load_dotenv
 
+from src.timesync import attach_time_sync
+from src.risk import attach_risk
+from src.snapshot import attach_snapshot
+from src.logschema import encode_record, parse_record
+
 load_dotenv()
 
-BOT_LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "bot.log")
+BOT_LOG_PATH = os.getenv("BOT_LOG_PATH") or os.path.join(os.path.dirname(os.path.dirname(__file__)), "bot.log")
+# "json" (bot.log, JSON lines) or "binary" (bot.bin, smaller but slower to write; see src/logschema.py)
+LOG_FORMAT = (os.getenv("LOG_FORMAT") or "json").lower()
+# Debug/test switch: validate every record against the log schema before it is written
+LOG_VALIDATE = os.getenv("LOG_VALIDATE", "off").lower() in {"1", "on", "true", "yes"}
+BOT_BIN_PATH = os.path.splitext(BOT_LOG_PATH)[0] + ".bin"
 
 def init_logger():
     # Ensure log file exists
@@ -27,13 +40,34 @@ def init_logger():
             f.write("")
     return BOT_LOG_PATH
 
+# Set per thread/task in multi-account mode so each account logs to its own file
+_log_account: ContextVar[Optional[str]] = ContextVar("log_account", default=None)
+
+def account_path(path: str, account: Optional[str]) -> str:
+    """bot.log -> bot.<account>.log (unchanged when account is None)."""
+    if not account:
+        return path
+    base, ext = os.path.splitext(path)
+    return f"{base}.{account}{ext}"
+
+def set_log_account(account: Optional[str]):
+    _log_account.set(account)
+
 def _write_log(level: str, payload: Dict[str, Any]):
+    account = _log_account.get()
     rec = {
         "ts": datetime.utcnow().isoformat(timespec="seconds") + "Z",
         "level": level.upper(),
+        **({"account": account} if account else {}),
         **payload
     }
-    with open(BOT_LOG_PATH, "a", encoding="utf-8") as f:
+    if LOG_VALIDATE:
+        parse_record(rec)
+    if LOG_FORMAT == "binary":
+        with open(account_path(BOT_BIN_PATH, account), "ab") as f:
+            f.write(encode_record(rec))
+        return
+    with open(account_path(BOT_LOG_PATH, account), "a", encoding="utf-8") as f:
         f.write(json.dumps(rec) + "\n")
 
 def log_info(payload: Dict[str, Any]):
@@ -48,6 +82,23 @@ def load_env():
         "API_SECRET": os.getenv("BINANCE_API_SECRET", ""),
         "MODE": os.getenv("MODE", "dryrun").lower(),
         "DEFAULT_SYMBOL": os.getenv("DEFAULT_SYMBOL", "BTCUSDT"),
+        "LOG_FORMAT": LOG_FORMAT,
+        "TIME_SYNC": os.getenv("TIME_SYNC", "on").lower() not in {"0", "off", "false", "no"},
+        "TIME_SYNC_INTERVAL": float(os.getenv("TIME_SYNC_INTERVAL", "30")),
+        "RECV_WINDOW": int(os.getenv("RECV_WINDOW", "5000")),
+        "JOURNAL": os.getenv("JOURNAL", "on").lower() not in {"0", "off", "false", "no"},
+        "JOURNAL_PATH": os.getenv("JOURNAL_PATH", ""),
+        # Pre-trade risk limits; 0 disables a check
+        "MAX_NOTIONAL_PER_SYMBOL": float(os.getenv("MAX_NOTIONAL_PER_SYMBOL", "0")),
+        "MAX_NOTIONAL_PER_ACCOUNT": float(os.getenv("MAX_NOTIONAL_PER_ACCOUNT", "0")),
+        "MAX_OPEN_ORDERS": int(os.getenv("MAX_OPEN_ORDERS", "0")),
+        "MAX_ORDERS_PER_SEC": float(os.getenv("MAX_ORDERS_PER_SEC", "0")),
+        # Client-side throttle (orders/sec per client); 0 disables
+        "ORDER_RATE_LIMIT": float(os.getenv("ORDER_RATE_LIMIT", "0")),
+        # Futures REST base URL override for live mode, e.g. a local stub exchange
+        "FAPI_URL": os.getenv("BINANCE_FAPI_URL", ""),
+        # Shared-memory market snapshot written by scripts/market_feeder.py; empty disables
+        "MARKET_SHM": os.getenv("MARKET_SHM", ""),
     }
     return cfg
 
@@ -84,29 +135,284 @@ def validate_qty(qty: Any) -> float:
 def validate_price(price: Any) -> float:
     return _to_float("price", price)
 
+class RateLimiter:
+    """
+    Token bucket: refills at `rate` tokens/sec up to `burst`.
+    acquire() blocks until the requested tokens are available.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: float = 1.0) -> float:
+        """Take `cost` tokens, sleeping if needed. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return waited
+                wait = (cost - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+# Order states that are still resting on the book
+OPEN_STATUSES = ("NEW", "PARTIALLY_FILLED")
+
 class FakeClient:
-    def __init__(self):
+    def __init__(self, skew_ms: float = 0.0, jitter_ms: float = 0.0, latency_ms: float = 0.0,
+                 error_rate: float = 0.0, mark_price: float = 60000.0):
         self.mode = "dryrun"
+        # Simulated exchange clock: server = local + skew, each call delayed by up to jitter
+        self.skew_ms = skew_ms
+        self.jitter_ms = jitter_ms
+        # Fixed one-way network latency added to every call
+        self.latency_ms = latency_ms
+        # Fraction of order requests that fail with a transient -1001 (load/soak testing)
+        self.error_rate = error_rate
+        # Simulated mark price; MARKET orders fill at it
+        self.mark_price = mark_price
+        self.timestamp_offset = 0
+        # Simulated order book state, keyed by orderId and by clientOrderId
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.client_ids: Dict[str, str] = {}
+        # User data stream subscribers; fill() pushes ORDER_TRADE_UPDATE events to them
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def _server_ms(self) -> float:
+        return time.time() * 1000 + self.skew_ms
+
+    def _network_delay(self):
+        delay = self.latency_ms / 2
+        if self.jitter_ms:
+            delay += random.uniform(0, self.jitter_ms) / 2
+        if delay:
+            time.sleep(delay / 1000)
+
+    def futures_time(self) -> Dict[str, Any]:
+        self._network_delay()
+        server = int(self._server_ms())
+        self._network_delay()
+        return {"serverTime": server}
+
+    def _check_timestamp(self, recv_window: int):
+        ts = time.time() * 1000 + self.timestamp_offset
+        self._network_delay()
+        server = self._server_ms()
+        if ts - server > 1000:
+            raise Exception("APIError(code=-1021): Timestamp for this request was 1000ms ahead of the server's time.")
+        if server - ts > recv_window:
+            raise Exception("APIError(code=-1021): Timestamp for this request is outside of the recvWindow.")
+
+    def _inject_error(self):
+        if self.error_rate and random.random() < self.error_rate:
+            raise Exception("APIError(code=-1001): Internal error; unable to process your request. Please try again.")
 
     def futures_create_order(self, **kwargs) -> Dict[str, Any]:
+        self._check_timestamp(int(kwargs.get("recvWindow", 5000)))
+        self._inject_error()
+        cid = kwargs.get("newClientOrderId") or f"fake-{uuid.uuid4().hex[:12]}"
+        prev = self.client_ids.get(cid)
+        if prev is not None and self.orders[prev]["status"] in OPEN_STATUSES:
+            raise Exception("APIError(code=-4116): ClientOrderId is duplicated.")
         oid = f"FAKE-{uuid.uuid4().hex[:8]}"
+        self.orders[oid] = {
+            "orderId": oid,
+            "clientOrderId": cid,
+            "symbol": kwargs.get("symbol"),
+            "side": kwargs.get("side"),
+            "type": kwargs.get("type"),
+            "origQty": kwargs.get("quantity"),
+            "price": kwargs.get("price"),
+            "stopPrice": kwargs.get("stopPrice"),
+            "status": "FILLED" if kwargs.get("type") == "MARKET" else "NEW",
+        }
+        if kwargs.get("type") == "MARKET":
+            self.orders[oid].update(executedQty=float(kwargs.get("quantity") or 0), avgPrice=self.mark_price)
+        self.client_ids[cid] = oid
         log_info({
             "action": "place_order",
             "mode": self.mode,
             "request": kwargs,
             "orderId": oid
         })
-        return {"orderId": oid, "status": "ACK", "dryrun": True, "request": kwargs}
+        self._network_delay()
+        if kwargs.get("newOrderRespType") == "RESULT":
+            # Like the exchange: final status, executedQty and avgPrice as strings
+            order = self.orders[oid]
+            return {"orderId": oid, "clientOrderId": cid, "status": order["status"],
+                    "executedQty": str(order.get("executedQty") or 0), "avgPrice": str(order.get("avgPrice") or 0),
+                    "dryrun": True, "request": kwargs}
+        return {"orderId": oid, "clientOrderId": cid, "status": "ACK", "dryrun": True, "request": kwargs}
+
+    def futures_mark_price(self, symbol: str = "", **kwargs) -> Dict[str, Any]:
+        self._network_delay()
+        self._network_delay()
+        return {"symbol": symbol, "markPrice": str(self.mark_price)}
+
+    def _lookup(self, orderId: Optional[str] = None, origClientOrderId: Optional[str] = None) -> Dict[str, Any]:
+        oid = orderId or self.client_ids.get(origClientOrderId or "")
+        order = self.orders.get(oid) if oid else None
+        if order is None:
+            raise Exception("APIError(code=-2013): Order does not exist.")
+        return order
+
+    def futures_get_order(self, symbol: str = "", orderId: Optional[str] = None,
+                          origClientOrderId: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        self._network_delay()
+        order = dict(self._lookup(orderId, origClientOrderId))
+        self._network_delay()
+        return order
+
+    def futures_get_open_orders(self, symbol: Optional[str] = None, **kwargs):
+        self._network_delay()
+        self._network_delay()
+        return [dict(o) for o in self.orders.values()
+                if o["status"] in OPEN_STATUSES and (symbol is None or o["symbol"] == symbol)]
+
+    def futures_cancel_order(self, symbol: str = "", orderId: Optional[str] = None,
+                             origClientOrderId: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        self._network_delay()
+        order = self._lookup(orderId, origClientOrderId)
+        self._network_delay()
+        if order["status"] not in OPEN_STATUSES:
+            raise Exception("APIError(code=-2011): Unknown order sent.")
+        order["status"] = "CANCELED"
+        return dict(order)
+
+    def futures_place_batch_order(self, batchOrders, **kwargs):
+        """Up to 5 orders in one request; per-order failures come back as {"code", "msg"} items."""
+        if len(batchOrders) > 5:
+            raise Exception("APIError(code=-1130): Data sent for parameter 'batchOrders' is not valid.")
+        self._check_timestamp(int(kwargs.get("recvWindow", 5000)))
+        self._inject_error()
+        out = []
+        latency, jitter = self.latency_ms, self.jitter_ms
+        self.latency_ms = self.jitter_ms = 0.0  # one round trip for the whole batch
+        try:
+            for order in batchOrders:
+                try:
+                    out.append(self.futures_create_order(**order))
+                except Exception as e:
+                    out.append({"code": -1, "msg": str(e)})
+        finally:
+            self.latency_ms, self.jitter_ms = latency, jitter
+        self._network_delay()
+        return out
+
+    def futures_cancel_orders(self, symbol: str = "", orderidlist=None, origclientorderidlist=None, **kwargs):
+        """Up to 10 cancels in one request, same per-item result convention as batch placement.
+        Lower-case list keys as with python-binance, which only JSON-encodes those spellings."""
+        ids = [("orderId", i) for i in (orderidlist or [])] + \
+              [("origClientOrderId", c) for c in (origclientorderidlist or [])]
+        if len(ids) > 10:
+            raise Exception("APIError(code=-1130): Data sent for parameter 'orderIdList' is not valid.")
+        self._network_delay()
+        out = []
+        for key, val in ids:
+            try:
+                order = self._lookup(**{key: val})
+                if order["status"] not in OPEN_STATUSES:
+                    raise Exception("APIError(code=-2011): Unknown order sent.")
+                order["status"] = "CANCELED"
+                out.append(dict(order))
+            except Exception as e:
+                out.append({"code": -2011, "msg": str(e)})
+        self._network_delay()
+        return out
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Subscribe to simulated user data stream events (same payloads as start_futures_user_socket)."""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def fill(self, orderId: Optional[str] = None, origClientOrderId: Optional[str] = None,
+             qty: Optional[float] = None, price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Simulate the exchange matching a resting order (fully, or `qty` of it)
+        and push the resulting ORDER_TRADE_UPDATE to every listener.
+        """
+        order = self._lookup(orderId, origClientOrderId)
+        if order["status"] not in OPEN_STATUSES:
+            raise Exception("APIError(code=-2011): Unknown order sent.")
+        orig = float(order["origQty"])
+        done = float(order.get("executedQty") or 0)
+        last = orig - done if qty is None else min(float(qty), orig - done)
+        done += last
+        order["executedQty"] = done
+        order["status"] = "FILLED" if done >= orig - 1e-12 else "PARTIALLY_FILLED"
+        order["updateTime"] = int(self._server_ms())
+        event = {
+            "e": "ORDER_TRADE_UPDATE",
+            "E": order["updateTime"],
+            "T": order["updateTime"],
+            "o": {
+                "s": order["symbol"], "c": order["clientOrderId"], "S": order["side"], "o": order["type"],
+                "q": str(orig), "p": str(order.get("price") or 0), "x": "TRADE", "X": order["status"],
+                "i": order["orderId"], "l": str(last), "z": str(done),
+                "L": str(price if price is not None else order.get("price") or 0),
+            },
+        }
+        for callback in list(self.listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                log_error({"action": "user_stream", "orderId": order["orderId"], "result": "error", "error": str(e)})
+        return event
 
 def get_client(api_key: str, api_secret: str, mode: str):
+    cfg = load_env()
     if mode.lower() == "dryrun":
-        return FakeClient()
-    from binance.client import Client
-    client = Client(api_key, api_secret)
+        client = FakeClient()
+    elif cfg["FAPI_URL"]:
+        # Futures REST stand-in (e.g. src/stub_exchange.py); skip the spot ping
+        from binance.client import Client
+        client = Client(api_key, api_secret, ping=False)
+        client.FUTURES_URL = cfg["FAPI_URL"].rstrip("/") + "/fapi"
+    else:
+        from binance.client import Client
+        client = Client(api_key, api_secret)
+    # Signed requests are stamped with the synced clock, pre-checked against
+    # the account's risk limits and throttled by place_order_with_retry
+    attach_time_sync(client, cfg)
+    attach_risk(client, cfg)
+    if cfg["ORDER_RATE_LIMIT"]:
+        client.rate_limiter = RateLimiter(cfg["ORDER_RATE_LIMIT"])
+    try:
+        attach_snapshot(client, cfg)
+    except (OSError, ValueError) as e:
+        # No feeder running: mark prices come from REST as before
+        log_error({"action": "snapshot_attach", "name": cfg["MARKET_SHM"], "result": "error", "error": str(e)})
     return client
 
+def mark_price(client: Any, symbol: str) -> Optional[float]:
+    """
+    Current mark price for symbol: the shared-memory snapshot when attached,
+    else one REST lookup. None if neither is available (never raises).
+    """
+    market = getattr(client, "market", None)
+    if market is not None:
+        price = market.mark(symbol)
+        if price:
+            return price
+    try:
+        return float(client.futures_mark_price(symbol=symbol)["markPrice"]) or None
+    except Exception as e:
+        log_error({"action": "mark_price", "symbol": symbol, "result": "error", "error": str(e)})
+        return None
+
 import time
-from typing import Callable, Dict, Any, Tuple
+from typing import Callable, Dict, Any, List, Tuple
 
 RETRY_ERRORS = {
     "-1001",   # DISCONNECTED
@@ -132,6 +438,19 @@ def place_order_with_retry(client: Any, req: Dict[str, Any], max_retries: int =
     """
     attempt = 0
     last_err = None
+    time_sync = getattr(client, "time_sync", None)
+    risk = getattr(client, "risk", None)
+    limiter = getattr(client, "rate_limiter", None)
+    if risk is not None:
+        try:
+            risk.check(req)
+        except Exception as e:
+            log_error({
+                "action": "risk_reject",
+                "error": str(e),
+                "req": {k: v for k, v in req.items() if k != "newClientOrderId"},
+            })
+            raise
     while attempt <= max_retries:
         try:
             if attempt > 0:
@@ -140,8 +459,10 @@ def place_order_with_retry(client: Any, req: Dict[str, Any], max_retries: int =
                     "attempt": attempt,
                     "req": {k: v for k, v in req.items() if k != "newClientOrderId"},
                 })
-            resp = client.futures_create_order(**req)
-            return resp
+            if limiter is not None:
+                limiter.acquire()
+            send_req = time_sync.stamp(req) if time_sync is not None else req
+            resp = client.futures_create_order(**send_req)
         except Exception as e:
             last_err = e
             is_transient = _is_transient_error(e)
@@ -154,13 +475,111 @@ def place_order_with_retry(client: Any, req: Dict[str, Any], max_retries: int =
             })
             if attempt == max_retries or not is_transient:
                 break
+            if time_sync is not None and "-1021" in str(e):
+                # Clock skew: resync and retry straight away instead of backing off
+                time_sync.sample()
+                attempt += 1
+                continue
             # Exponential backoff: 0.5s, 1s, 2s...
             sleep_s = base_delay * (2 ** attempt)
             time.sleep(sleep_s)
             attempt += 1
             continue
+        # Outside the try: a bookkeeping error must never trigger a re-send
+        if risk is not None:
+            risk.on_ack(req, resp)
+        return resp
     # If here, all attempts failed
     raise last_err if last_err else RuntimeError("Unknown error placing order")
 
+def place_batch_with_retry(client: Any, reqs: List[Dict[str, Any]], max_retries: int = 3,
+                           base_delay: float = 0.5) -> List[Dict[str, Any]]:
+    """
+    Places up to 5 orders in one batch request with the same risk checks,
+    throttling, clock stamping and retry policy as place_order_with_retry.
+    Returns one item per req: the order, or {"code", "msg"} if that order was rejected.
+    Retries re-send the whole batch; every req should carry a newClientOrderId
+    so orders that already went through are rejected as duplicates.
+    """
+    time_sync = getattr(client, "time_sync", None)
+    risk = getattr(client, "risk", None)
+    limiter = getattr(client, "rate_limiter", None)
+    if risk is not None:
+        try:
+            # All or nothing: each order is checked on top of the ones before it in the batch
+            risk.check_batch(reqs)
+        except Exception as e:
+            log_error({"action": "risk_reject", "error": str(e),
+                       "reqs": [{k: v for k, v in req.items() if k != "newClientOrderId"} for req in reqs]})
+            raise
+    # batchOrders is JSON-encoded by the client; the exchange expects string values, lower-case booleans
+    batch = [{k: str(v).lower() if isinstance(v, bool) else str(v) for k, v in req.items()} for req in reqs]
+    attempt = 0
+    while True:
+        try:
+            if attempt > 0:
+                log_info({"action": "retry_attempt", "attempt": attempt, "batch": len(reqs)})
+            if limiter is not None:
+                limiter.acquire()
+            params = time_sync.stamp({}) if time_sync is not None else {}
+            resp = client.futures_place_batch_order(batchOrders=batch, **params)
+            break
+        except Exception as e:
+            is_transient = _is_transient_error(e)
+            log_error({"action": "batch_attempt_failed", "attempt": attempt, "transient": is_transient,
+                       "error": str(e), "batch": len(reqs)})
+            if attempt == max_retries or not is_transient:
+                raise
+            if time_sync is not None and "-1021" in str(e):
+                time_sync.sample()
+            else:
+                time.sleep(base_delay * (2 ** attempt))
+            attempt += 1
+    if risk is not None:
+        for req, item in zip(reqs, resp):
+            if "orderId" in item:
+                risk.on_ack(req, item)
+    return resp
+
+def cancel_batch_with_retry(client: Any, symbol: str, cids: List[str], max_retries: int = 3,
+                            base_delay: float = 0.5) -> List[Dict[str, Any]]:
+    """
+    Cancels up to 10 orders by clientOrderId in one request with the same
+    throttling, clock stamping and retry policy as place_batch_with_retry.
+    Returns one item per cid: the cancelled order, or {"code", "msg"}.
+    Retries re-send the whole batch; cancels that already went through come
+    back as -2011, which callers treat as gone.
+    """
+    time_sync = getattr(client, "time_sync", None)
+    risk = getattr(client, "risk", None)
+    limiter = getattr(client, "rate_limiter", None)
+    attempt = 0
+    while True:
+        try:
+            if attempt > 0:
+                log_info({"action": "retry_attempt", "attempt": attempt, "batch": len(cids)})
+            if limiter is not None:
+                limiter.acquire()
+            params = time_sync.stamp({}) if time_sync is not None else {}
+            # Lower-case list key: python-binance only JSON-encodes that spelling
+            resp = client.futures_cancel_orders(symbol=symbol, origclientorderidlist=cids, **params)
+            break
+        except Exception as e:
+            is_transient = _is_transient_error(e)
+            log_error({"action": "batch_attempt_failed", "attempt": attempt, "transient": is_transient,
+                       "error": str(e), "batch": len(cids)})
+            if attempt == max_retries or not is_transient:
+                raise
+            if time_sync is not None and "-1021" in str(e):
+                time_sync.sample()
+            else:
+                time.sleep(base_delay * (2 ** attempt))
+            attempt += 1
+    if risk is not None:
+        for item in resp:
+            if "orderId" in item:
+                risk.on_cancel(str(item["orderId"]))
+    return resp
+
 # Initialize logger on import
 init_logger()
@@ -0,0 +1,266 @@
+"""
+Daksh Binance Futures Trading Bot
+Historical kline / aggTrade downloader with a memory-mapped column store
+
+Each dataset is a directory of append-only fixed-width little-endian column
+files (int64 ts, float64 OHLCV, ...). Readers np.memmap the columns and
+slice a time range with searchsorted, so reads are zero-copy. Downloads are
+fetched in parallel chunks, appended strictly in time order, resume from
+the last stored row and share a weight-based rate limiter.
+"""
+
+import os
+import json
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.common import RateLimiter, log_info
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+FAPI_URL = "https://fapi.binance.com"
+
+KLINE_COLUMNS = [("ts", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"), ("volume", "<f8")]
+AGG_TRADE_COLUMNS = [("ts", "<i8"), ("id", "<i8"), ("price", "<f8"), ("qty", "<f8"), ("buyer_maker", "<i1")]
+
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000,
+    "8h": 28_800_000, "12h": 43_200_000, "1d": 86_400_000,
+}
+KLINE_LIMIT = 1500          # weight 10 per request at this size
+AGG_TRADE_LIMIT = 1000      # weight 20 per request
+AGG_TRADE_WINDOW_MS = 3_600_000  # startTime/endTime may span at most one hour
+# USD-M request weight budget is 2400/minute; stay under it
+DEFAULT_WEIGHT_PER_SEC = 30.0
+
+
+class ColumnStore:
+    """
+    Append-only fixed-width columns in one directory, one file per column.
+
+    A crash can leave columns with different lengths; opening the store for
+    writing truncates every column back to the shortest one, so a half-written
+    append simply disappears and the download resumes before it. A read-only
+    store (readonly=True) never touches the files: it sees the rows that all
+    columns have, so it can be opened while a download is appending.
+    """
+
+    def __init__(self, path: str, columns: List[Tuple[str, str]], readonly: bool = False):
+        self.path = path
+        self.columns = [(name, np.dtype(dt)) for name, dt in columns]
+        self.readonly = readonly
+        if readonly:
+            self.rows = self._complete_rows()
+        else:
+            os.makedirs(path, exist_ok=True)
+            self.rows = self._repair()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _complete_rows(self) -> int:
+        counts = []
+        for name, dt in self.columns:
+            f = self._file(name)
+            counts.append(os.path.getsize(f) // dt.itemsize if os.path.exists(f) else 0)
+        return min(counts)
+
+    def _repair(self) -> int:
+        rows = self._complete_rows()
+        for name, dt in self.columns:
+            f = self._file(name)
+            if not os.path.exists(f):
+                open(f, "wb").close()
+            if os.path.getsize(f) != rows * dt.itemsize:
+                os.truncate(f, rows * dt.itemsize)
+        return rows
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def refresh(self) -> int:
+        """Read-only stores: pick up rows appended by the writer since opening."""
+        if self.readonly:
+            self.rows = self._complete_rows()
+        return self.rows
+
+    def append(self, cols: Dict[str, np.ndarray]):
+        if self.readonly:
+            raise ValueError(f"{self.path} is open read-only")
+        n = len(cols["ts"])
+        if n == 0:
+            return
+        for name, dt in self.columns:
+            with open(self._file(name), "ab") as f:
+                f.write(np.ascontiguousarray(cols[name], dtype=dt).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.rows += n
+
+    def last(self, name: str) -> Optional[Any]:
+        if self.rows == 0:
+            return None
+        dt = dict(self.columns)[name]
+        return np.fromfile(self._file(name), dtype=dt, count=1, offset=(self.rows - 1) * dt.itemsize)[0].item()
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only memmap of a whole column (empty array if no rows)."""
+        dt = dict(self.columns)[name]
+        if self.rows == 0:
+            return np.empty(0, dtype=dt)
+        return np.memmap(self._file(name), dtype=dt, mode="r", shape=(self.rows,))
+
+    def range(self, start_ms: int, end_ms: int) -> Dict[str, np.ndarray]:
+        """Zero-copy views of every column for rows with start_ms <= ts < end_ms."""
+        ts = self.column("ts")
+        lo = int(np.searchsorted(ts, start_ms, side="left"))
+        hi = int(np.searchsorted(ts, end_ms, side="left"))
+        return {name: self.column(name)[lo:hi] for name, _ in self.columns}
+
+
+class FapiHttp:
+    """Minimal public-endpoint GET client with weight-based throttling and 429/5xx handling."""
+
+    def __init__(self, base_url: Optional[str] = None, weight_per_sec: float = DEFAULT_WEIGHT_PER_SEC,
+                 timeout: float = 10.0, max_retries: int = 5):
+        self.base_url = (base_url or os.getenv("BINANCE_FAPI_URL") or FAPI_URL).rstrip("/")
+        self.limiter = RateLimiter(weight_per_sec, burst=weight_per_sec * 2)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.requests = 0
+
+    def get(self, path: str, params: Dict[str, Any], weight: int = 1) -> Any:
+        url = f"{self.base_url}{path}?{urllib.parse.urlencode(params)}"
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(weight)
+            self.requests += 1
+            try:
+                with urllib.request.urlopen(url, timeout=self.timeout) as resp:
+                    return json.loads(resp.read())
+            except urllib.error.HTTPError as e:
+                if e.code in (418, 429):
+                    # Exchange asked us to back off; honour Retry-After
+                    wait = float(e.headers.get("Retry-After") or 2 ** attempt)
+                elif e.code >= 500:
+                    wait = 0.5 * 2 ** attempt
+                else:
+                    raise
+            except (urllib.error.URLError, TimeoutError, ConnectionError):
+                wait = 0.5 * 2 ** attempt
+            if attempt == self.max_retries:
+                break
+            time.sleep(wait)
+        raise RuntimeError(f"GET {path} failed after {self.max_retries + 1} attempts")
+
+
+def _ordered_parallel(fetch: Callable[[Any], Dict[str, np.ndarray]], chunks: List[Any], workers: int):
+    """Yield fetch(chunk) results in chunk order while up to `workers` fetches run ahead."""
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="history") as pool:
+        pending = deque()
+        it = iter(chunks)
+        for chunk in it:
+            pending.append(pool.submit(fetch, chunk))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            yield pending.popleft().result()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append(pool.submit(fetch, nxt))
+
+
+def klines_store(symbol: str, interval: str, root: str = DATA_DIR, readonly: bool = False) -> ColumnStore:
+    """Open for writing (the downloader) or, with readonly=True, for analysis alongside a running download."""
+    return ColumnStore(os.path.join(root, symbol, f"klines_{interval}"), KLINE_COLUMNS, readonly)
+
+
+def agg_trades_store(symbol: str, root: str = DATA_DIR, readonly: bool = False) -> ColumnStore:
+    return ColumnStore(os.path.join(root, symbol, "aggtrades"), AGG_TRADE_COLUMNS, readonly)
+
+
+def download_klines(symbol: str, interval: str, start_ms: int, end_ms: int, root: str = DATA_DIR,
+                    http: Optional[FapiHttp] = None, workers: int = 4) -> int:
+    """Append closed klines with open time in [start_ms, end_ms). Resumes after the last stored row."""
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"interval must be one of {', '.join(INTERVAL_MS)}")
+    step = INTERVAL_MS[interval]
+    store = klines_store(symbol, interval, root)
+    http = http or FapiHttp()
+    last = store.last("ts")
+    if last is not None:
+        start_ms = max(start_ms, last + step)
+    end_ms = min(end_ms, int(time.time() * 1000) // step * step)  # never store the open candle
+    if start_ms >= end_ms:
+        return 0
+
+    span = step * KLINE_LIMIT
+    chunks = [(s, min(s + span, end_ms)) for s in range(start_ms, end_ms, span)]
+
+    def fetch(chunk: Tuple[int, int]) -> Dict[str, np.ndarray]:
+        s, e = chunk
+        rows = http.get("/fapi/v1/klines", {"symbol": symbol, "interval": interval, "startTime": s,
+                                            "endTime": e - 1, "limit": KLINE_LIMIT}, weight=10)
+        arr = np.array([r[:6] for r in rows], dtype=float).reshape(-1, 6)
+        ts = arr[:, 0].astype(np.int64)
+        keep = (ts >= s) & (ts < e)
+        return {"ts": ts[keep], "open": arr[keep, 1], "high": arr[keep, 2], "low": arr[keep, 3],
+                "close": arr[keep, 4], "volume": arr[keep, 5]}
+
+    added = 0
+    for cols in _ordered_parallel(fetch, chunks, workers):
+        store.append(cols)
+        added += len(cols["ts"])
+    log_info({"action": "history_klines", "symbol": symbol, "interval": interval, "rows": added,
+              "requests": len(chunks), "result": "ok"})
+    return added
+
+
+def download_agg_trades(symbol: str, start_ms: int, end_ms: int, root: str = DATA_DIR,
+                        http: Optional[FapiHttp] = None, workers: int = 4) -> int:
+    """Append aggTrades with T in [start_ms, end_ms). Resumes after the last stored trade id."""
+    store = agg_trades_store(symbol, root)
+    http = http or FapiHttp()
+    last_ts, last_id = store.last("ts"), store.last("id")
+    if last_ts is not None:
+        start_ms = max(start_ms, last_ts)
+    if start_ms >= end_ms:
+        return 0
+    chunks = [(s, min(s + AGG_TRADE_WINDOW_MS, end_ms)) for s in range(start_ms, end_ms, AGG_TRADE_WINDOW_MS)]
+
+    def fetch(chunk: Tuple[int, int]) -> Dict[str, np.ndarray]:
+        s, e = chunk
+        pages = []
+        params: Dict[str, Any] = {"symbol": symbol, "startTime": s, "endTime": e - 1, "limit": AGG_TRADE_LIMIT}
+        while True:
+            page = http.get("/fapi/v1/aggTrades", params, weight=20)
+            pages.extend(page)
+            # A full page may be truncated: continue by trade id until past the window
+            if len(page) < AGG_TRADE_LIMIT or page[-1]["T"] >= e:
+                break
+            params = {"symbol": symbol, "fromId": page[-1]["a"] + 1, "limit": AGG_TRADE_LIMIT}
+        ts = np.fromiter((t["T"] for t in pages), dtype=np.int64, count=len(pages))
+        ids = np.fromiter((t["a"] for t in pages), dtype=np.int64, count=len(pages))
+        keep = (ts >= s) & (ts < e)
+        if last_id is not None:
+            keep &= ids > last_id
+        return {
+            "ts": ts[keep],
+            "id": ids[keep],
+            "price": np.fromiter((float(t["p"]) for t in pages), dtype=np.float64, count=len(pages))[keep],
+            "qty": np.fromiter((float(t["q"]) for t in pages), dtype=np.float64, count=len(pages))[keep],
+            "buyer_maker": np.fromiter((t["m"] for t in pages), dtype=np.int8, count=len(pages))[keep],
+        }
+
+    added = 0
+    for cols in _ordered_parallel(fetch, chunks, workers):
+        store.append(cols)
+        added += len(cols["ts"])
+    log_info({"action": "history_aggtrades", "symbol": symbol, "rows": added, "result": "ok"})
+    return added
@@ -0,0 +1,301 @@
+"""
+Daksh Binance Futures Trading Bot
+Write-ahead intent journal and crash recovery for multi-leg orders
+
+Every leg of a bracket/TWAP is written here with its newClientOrderId before
+it is sent, and its ack/failure after. After a crash, `recover` replays the
+journal, asks the exchange about every leg without a durable ack, and then
+resumes or cancels whatever is left.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.common import log_info, log_error, place_order_with_retry, account_path
+
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "orders.journal")
+
+
+class IntentJournal:
+    """
+    Append-only JSON-lines journal.
+
+    Plan records are fsynced before the caller sends anything (that is the
+    write-ahead guarantee). Ack/fail records are group-committed: fsync runs
+    once per `batch_size` records or `flush_interval` seconds, so a crash can
+    lose several acks at once. That is harmless because recovery looks up
+    every unacknowledged leg on the exchange by client id. A record torn by
+    a crash is cut off on open, so the next record starts on its own line.
+    """
+
+    def __init__(self, path: str = JOURNAL_PATH, batch_size: int = 64, flush_interval: float = 0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        dropped = _truncate_torn_tail(path)
+        if dropped:
+            log_error({"action": "journal_repair", "path": path, "droppedBytes": dropped, "result": "ok"})
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._buf: List[bytes] = []
+        self._first_pending = 0.0
+        self._lock = threading.Lock()
+
+    def _append(self, recs: List[Dict[str, Any]], force: bool = False):
+        now = time.time()
+        with self._lock:
+            if not self._buf:
+                self._first_pending = now
+            for rec in recs:
+                rec["t"] = round(now, 3)
+                self._buf.append((json.dumps(rec, separators=(",", ":")) + "\n").encode("utf-8"))
+            if force or len(self._buf) >= self.batch_size or now - self._first_pending >= self.flush_interval:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buf:
+            return
+        os.write(self._fd, b"".join(self._buf))
+        os.fsync(self._fd)
+        self._buf = []
+
+    def plan(self, link_id: str, legs: List[Dict[str, Any]], strategy: str, meta: Optional[Dict[str, Any]] = None):
+        """Durably record a link and all of its planned legs (in send order)."""
+        recs: List[Dict[str, Any]] = [{"op": "link", "linkId": link_id, "strategy": strategy, "meta": meta or {}}]
+        for req in legs:
+            recs.append({"op": "plan", "linkId": link_id, "cid": req["newClientOrderId"], "req": req})
+        self._append(recs, force=True)
+
+    def replan(self, link_id: str, req: Dict[str, Any]):
+        """Durably replace a planned leg's request (same client id) before sending it."""
+        self._append([{"op": "plan", "linkId": link_id, "cid": req["newClientOrderId"], "req": req}], force=True)
+
+    def ack(self, link_id: str, cid: str, resp: Dict[str, Any], latency_ms: Optional[float] = None):
+        self._append([{
+            "op": "ack",
+            "linkId": link_id,
+            "cid": cid,
+            "orderId": resp.get("orderId"),
+            "status": resp.get("status"),
+            "avgPrice": resp.get("avgPrice"),
+            "executedQty": resp.get("executedQty"),
+            "latencyMs": latency_ms,
+        }])
+
+    def fail(self, link_id: str, cid: str, error: str):
+        self._append([{"op": "fail", "linkId": link_id, "cid": cid, "error": error}])
+
+    def cancel(self, link_id: str, cid: str):
+        self._append([{"op": "cancel", "linkId": link_id, "cid": cid}])
+
+    def done(self, link_id: str, status: str = "complete"):
+        self._append([{"op": "done", "linkId": link_id, "status": status}], force=True)
+
+    def sync(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        self.sync()
+        os.close(self._fd)
+
+
+def _truncate_torn_tail(path: str, chunk: int = 4096) -> int:
+    """Cut the file back to its last newline. Returns the number of bytes dropped."""
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - chunk)
+            f.seek(start)
+            i = f.read(end - start).rfind(b"\n")
+            if i >= 0:
+                end = start + i + 1
+                break
+            end = start
+        if end == size:
+            return 0
+        # The torn record never finished its fsync, so its caller never acted on it
+        f.truncate(end)
+        f.flush()
+        os.fsync(f.fileno())
+    return size - end
+
+
+def open_journal(cfg: Dict[str, Any], account: Optional[str] = None) -> Optional[IntentJournal]:
+    """Journal for cfg; each account gets its own file so recovery uses the right credentials."""
+    if not cfg.get("JOURNAL", True):
+        return None
+    return IntentJournal(account_path(cfg.get("JOURNAL_PATH") or JOURNAL_PATH, account))
+
+
+def place_leg(client: Any, journal: Optional[IntentJournal], link_id: str, req: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    place_order_with_retry plus the journal ack/fail record for the leg. Legs
+    ask for RESULT acks, so the ack carries the fill (executedQty, avgPrice)
+    rather than just the order id.
+    """
+    if "newOrderRespType" not in req:
+        req = {**req, "newOrderRespType": "RESULT"}
+    if journal is None:
+        return place_order_with_retry(client, req)
+    cid = req["newClientOrderId"]
+    t0 = time.perf_counter()
+    try:
+        resp = place_order_with_retry(client, req)
+    except Exception as e:
+        journal.fail(link_id, cid, str(e))
+        raise
+    journal.ack(link_id, cid, resp, latency_ms=round((time.perf_counter() - t0) * 1000, 3))
+    return resp
+
+
+def load_state(path: str = JOURNAL_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    Replay the journal into per-link state:
+    {linkId: {"strategy", "meta", "done", "legs": [cid...], "reqs": {cid: req}, "status": {cid: op}}}
+    A torn final line (crash mid-write) is ignored.
+    """
+    links: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return links
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            op = rec.get("op")
+            lid = rec.get("linkId")
+            if op == "link":
+                links[lid] = {"strategy": rec.get("strategy"), "meta": rec.get("meta") or {}, "done": False,
+                              "legs": [], "reqs": {}, "status": {}}
+                continue
+            link = links.get(lid)
+            if link is None:
+                continue
+            if op == "plan":
+                if rec["cid"] not in link["reqs"]:
+                    link["legs"].append(rec["cid"])
+                link["reqs"][rec["cid"]] = rec["req"]
+                link["status"][rec["cid"]] = "planned"
+            elif op in ("ack", "fail", "cancel"):
+                link["status"][rec["cid"]] = op
+            elif op == "done":
+                link["done"] = True
+    return links
+
+
+def pending_links(links: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {lid: link for lid, link in links.items()
+            if not link["done"] and any(link["status"][cid] == "planned" for cid in link["legs"])}
+
+
+def _exchange_has(client: Any, req: Dict[str, Any], open_cids: set) -> bool:
+    """Whether the leg reached the exchange. Only -2013 means no; any other lookup error propagates."""
+    cid = req["newClientOrderId"]
+    if cid in open_cids:
+        return True
+    try:
+        client.futures_get_order(symbol=req["symbol"], origClientOrderId=cid)
+        return True
+    except Exception as e:
+        if "-2013" in str(e):
+            return False
+        raise
+
+
+def recover(client: Any, journal: IntentJournal, policy: str = "resume") -> Dict[str, Any]:
+    """
+    Reconcile unfinished links with the exchange.
+
+    Acks are group-committed, so any number of unacknowledged legs may have
+    reached the exchange: each one is looked up by client id. Legs go out
+    strictly in plan order, so a leg missing from the exchange but followed
+    by one that is there was sent and rejected; only legs after the last one
+    found are unsent. A link whose lookups fail is left for the next run.
+    policy="resume" sends the unsent legs; policy="cancel" cancels the link's
+    resting orders and abandons the rest.
+    """
+    if policy not in ("resume", "cancel"):
+        raise ValueError("policy must be resume or cancel")
+    links = pending_links(load_state(journal.path))
+    summary = {"links": len(links), "found": 0, "resent": 0, "cancelled": 0, "failed": 0, "skipped": 0}
+    if not links:
+        return summary
+    open_cids = {o.get("clientOrderId") for o in client.futures_get_open_orders()}
+
+    for lid, link in links.items():
+        pending = [cid for cid in link["legs"] if link["status"][cid] == "planned"]
+        try:
+            sent = [_exchange_has(client, link["reqs"][cid], open_cids) for cid in pending]
+        except Exception as e:
+            # Resending on a failed lookup could duplicate a filled leg
+            log_error({"action": "journal_recover", "linkId": lid, "result": "error", "error": str(e)})
+            summary["skipped"] += 1
+            continue
+        last = max((i for i, has in enumerate(sent) if has), default=-1)
+        for cid, has in zip(pending[:last + 1], sent):
+            if has:
+                journal.ack(lid, cid, {"status": "RECOVERED"})
+                summary["found"] += 1
+            else:
+                journal.fail(lid, cid, "not on exchange; a later leg was sent")
+        pending = pending[last + 1:]
+
+        if policy == "cancel":
+            risk = getattr(client, "risk", None)
+            for cid in link["legs"]:
+                if cid in open_cids:
+                    try:
+                        resp = client.futures_cancel_order(symbol=link["reqs"][cid]["symbol"], origClientOrderId=cid)
+                        if risk is not None:
+                            risk.on_cancel(str(resp.get("orderId")))
+                    except Exception as e:
+                        log_error({"action": "recover_cancel", "linkId": lid, "cid": cid, "error": str(e)})
+            for cid in pending:
+                journal.cancel(lid, cid)
+                summary["cancelled"] += 1
+            journal.done(lid, status="cancelled")
+            continue
+
+        spacing = float(link["meta"].get("intervalSec", 0) or 0)
+        for i, cid in enumerate(pending):
+            if i and spacing:
+                time.sleep(spacing)
+            try:
+                place_leg(client, journal, lid, link["reqs"][cid])
+                summary["resent"] += 1
+            except Exception:
+                summary["failed"] += 1
+        journal.done(lid, status="recovered")
+
+    journal.sync()
+    log_info({"action": "journal_recover", "policy": policy, **summary})
+    return summary
+
+
+def compact(path: str = JOURNAL_PATH) -> int:
+    """Rewrite the journal keeping only records of unfinished links. Returns records kept."""
+    if not os.path.exists(path):
+        return 0
+    keep_links = set(pending_links(load_state(path)))
+    tmp = path + ".tmp"
+    kept = 0
+    with open(path, "r", encoding="utf-8") as src, open(tmp, "w", encoding="utf-8") as dst:
+        for line in src:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get("linkId") in keep_links:
+                dst.write(line)
+                kept += 1
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(tmp, path)
+    return kept
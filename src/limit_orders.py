@@ -1,6 +1,7 @@
 import sys
 import os
 import argparse
+from typing import Any, Dict
 
 # Add project root to path so we can import from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -25,27 +26,14 @@ def parse_args():
     p.add_argument("price", help="Limit price (float)")
     return p.parse_args()
 
-def main():
-    args = parse_args()
-    cfg = load_env()
-    try:
-        symbol = validate_symbol(args.symbol)
-        side = validate_side(args.side)
-        qty = validate_qty(args.quantity)
-        price = validate_price(args.price)
-    except Exception as e:
-        log_error({"action": "validate", "type": "LIMIT", "error": str(e)})
-        print(f"Input error: {e}")
-        sys.exit(1)
-
-    client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
-
+def place_limit(client: Any, symbol: str, side: str, qty: float, price: float, tif: str = "GTC") -> Dict[str, Any]:
+    """Place one LIMIT order through the retry wrapper and log the outcome. Raises on failure."""
     try:
         req = {
             "symbol": symbol,
             "side": side,
             "type": "LIMIT",
-            "timeInForce": "GTC",
+            "timeInForce": tif,
             "quantity": qty,
             "price": price,
         }
@@ -57,11 +45,11 @@ def main():
             "side": side,
             "qty": qty,
             "price": price,
-            "tif": "GTC",
+            "tif": tif,
             "result": "ok",
             "orderId": resp.get("orderId"),
         })
-        print(f"OK: LIMIT {side} {qty} {symbol} @ {price}, orderId={resp.get('orderId')}")
+        return resp
     except Exception as e:
         log_error({
             "action": "place_order",
@@ -70,12 +58,33 @@ def main():
             "side": side,
             "qty": qty,
             "price": price,
-            "tif": "GTC",
+            "tif": tif,
             "result": "error",
             "error": str(e),
         })
+        raise
+
+def main():
+    args = parse_args()
+    cfg = load_env()
+    try:
+        symbol = validate_symbol(args.symbol)
+        side = validate_side(args.side)
+        qty = validate_qty(args.quantity)
+        price = validate_price(args.price)
+    except Exception as e:
+        log_error({"action": "validate", "type": "LIMIT", "error": str(e)})
+        print(f"Input error: {e}")
+        sys.exit(1)
+
+    client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
+
+    try:
+        resp = place_limit(client, symbol, side, qty, price)
+    except Exception as e:
         print(f"Order failed: {e}")
         sys.exit(1)
+    print(f"OK: LIMIT {side} {qty} {symbol} @ {price}, orderId={resp.get('orderId')}")
 
 if __name__ == "__main__":
     main()
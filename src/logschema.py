@@ -0,0 +1,331 @@
+"""
+Daksh Binance Futures Trading Bot
+Structured log schema and compact binary log encoding
+
+bot.log records are typed on read: every record validates into a
+LogRecord subclass chosen by its "action" (order, retry, slice or
+strategy lifecycle). Order fields are coalesced from the top level and
+from the nested "request"/"req" dicts, so every order record exposes
+symbol/side/type/qty/price no matter which module wrote it.
+
+The binary form is a sequence of length-prefixed frames: a fixed
+little-endian header (ts, level, qty, price, stopPrice, string lengths),
+the common string fields, and any remaining fields as compact JSON.
+Order fields nested under "request"/"req" are lifted into the fixed slots
+and a flag records where to put them back.
+Conversion in either direction is lossless apart from numbers in the
+fixed slots coming back as floats.
+
+The binary form is a size option, not a speed one: frames are about 40%
+smaller than JSON lines, but most records still carry a JSON tail, so in
+pure Python they encode and decode slower than the C json module. Keep
+JSON lines for the live bot and convert to .bin for storage and shipping.
+"""
+
+import json
+import math
+import struct
+import calendar
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, Optional, Type, Union
+
+from pydantic import BaseModel, ConfigDict, model_validator
+
+BIN_MAGIC = b"DBLOG1\n\0"
+LEVELS = ("INFO", "ERROR", "WARNING", "DEBUG")
+NUM_FIELDS = ("qty", "price", "stopPrice")
+STR_FIELDS = ("action", "account", "symbol", "side", "type", "orderId", "linkId", "result", "error", "message")
+# FakeClient nests order fields under "request", the retry wrapper under "req"
+NESTED_KEYS = ("request", "req")
+NESTED_FIELDS = {"symbol": "symbol", "side": "side", "type": "type", "quantity": "qty",
+                 "price": "price", "stopPrice": "stopPrice"}
+# frame length, ts, level, flags, NUM_FIELDS, one length byte per STR_FIELDS, extras length
+FRAME = struct.Struct("<Id BB 3d 10B I")
+ABSENT = 0xFF  # string length marker for a missing field; longer strings go to the extras
+
+_LEVEL_CODES = {name: i for i, name in enumerate(LEVELS)}
+
+
+# --- typed records --------------------------------------------------------------
+
+class LogRecord(BaseModel):
+    """Fields shared by every bot.log record. Unknown fields are kept as extras."""
+
+    model_config = ConfigDict(extra="allow")
+
+    ts: str
+    level: str = "INFO"
+    action: Optional[str] = None
+    account: Optional[str] = None
+    message: Optional[str] = None
+    symbol: Optional[str] = None
+    side: Optional[str] = None
+    type: Optional[str] = None
+    qty: Optional[float] = None
+    price: Optional[float] = None
+    stopPrice: Optional[float] = None
+    orderId: Optional[Union[int, str]] = None
+    linkId: Optional[str] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _coalesce(cls, data: Any) -> Any:
+        # Strategies log order fields top-level, FakeClient nests them under
+        # "request" and the retry wrapper under "req"
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+        nested = data.get("request") or data.get("req")
+        if isinstance(nested, dict):
+            for field in ("symbol", "side", "type", "price", "stopPrice"):
+                if data.get(field) is None and nested.get(field) is not None:
+                    data[field] = nested[field]
+            if data.get("qty") is None and nested.get("quantity") is not None:
+                data["qty"] = nested["quantity"]
+        if data.get("qty") is None and data.get("quantity") is not None:
+            data["qty"] = data["quantity"]
+        return data
+
+
+class OrderEvent(LogRecord):
+    """An order placed, amended, cancelled or rejected."""
+
+    takeProfit: Optional[float] = None
+    limitPrice: Optional[float] = None
+    tif: Optional[str] = None
+
+
+class RetryEvent(LogRecord):
+    """One failed or repeated attempt inside place_order_with_retry / place_batch_with_retry."""
+
+    attempt: int = 0
+    transient: Optional[bool] = None
+
+
+class SliceEvent(LogRecord):
+    """One child order of a TWAP or iceberg parent."""
+
+    sliceIndex: Optional[int] = None
+    totalSlices: Optional[int] = None
+    executedQty: Optional[float] = None
+
+
+class StrategyEvent(LogRecord):
+    """Strategy lifecycle: start, re-quote, trigger, complete."""
+
+    totalQty: Optional[float] = None
+    executedQty: Optional[float] = None
+
+
+EVENT_TYPES: Dict[str, Type[LogRecord]] = {
+    "place_order": OrderEvent,
+    "place_entry": OrderEvent,
+    "place_exit_tp": OrderEvent,
+    "place_exit_sl": OrderEvent,
+    "place_oco": OrderEvent,
+    "grid_place": OrderEvent,
+    "grid_cancel": OrderEvent,
+    "trail_amend": OrderEvent,
+    "trail_cancel": OrderEvent,
+    "iceberg_cancel": OrderEvent,
+    "recover_cancel": OrderEvent,
+    "cancel_sibling": OrderEvent,
+    "risk_reject": OrderEvent,
+    "retry_attempt": RetryEvent,
+    "order_attempt_failed": RetryEvent,
+    "batch_attempt_failed": RetryEvent,
+    "twap_slice": SliceEvent,
+    "iceberg_slice": SliceEvent,
+    "grid_requote": StrategyEvent,
+    "trail_triggered": StrategyEvent,
+    "exit_filled": StrategyEvent,
+}
+
+
+def event_type(action: Optional[str]) -> Type[LogRecord]:
+    if action in EVENT_TYPES:
+        return EVENT_TYPES[action]
+    if action and action.endswith(("_start", "_complete")):
+        return StrategyEvent
+    return LogRecord
+
+
+def parse_record(rec: Dict[str, Any]) -> LogRecord:
+    """Validate a raw record dict into its typed event class."""
+    return event_type(rec.get("action")).model_validate(rec)
+
+
+# --- binary encoding ------------------------------------------------------------
+
+@lru_cache(maxsize=4096)
+def _ts_to_epoch(ts: str) -> float:
+    return float(calendar.timegm(datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ").timetuple()))
+
+
+@lru_cache(maxsize=4096)
+def _epoch_to_ts(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+_NUM_TYPES = (float, int)
+# field -> (is numeric, slot index); order fields of a nested request/req share these slots
+_SLOTS = {**{f: (True, i) for i, f in enumerate(NUM_FIELDS)}, **{f: (False, i) for i, f in enumerate(STR_FIELDS)}}
+_NESTED_SLOTS = {src: _SLOTS[dst] for src, dst in NESTED_FIELDS.items()}
+_ORDER_FIELDS = frozenset(NESTED_FIELDS.values())
+_NO_NUMS = (math.nan,) * len(NUM_FIELDS)
+_NO_STRS = (None,) * len(STR_FIELDS)
+_HEADER = FRAME.size - 4
+_JSON = json.JSONEncoder(separators=(",", ":"))
+_JSON_DEC = json.JSONDecoder()
+
+
+def _slot(nums: list, strs: list, slot: tuple, v: Any) -> bool:
+    """Put v into its fixed slot if the value fits."""
+    if slot[0]:
+        if type(v) in _NUM_TYPES and v == v:
+            nums[slot[1]] = float(v)
+            return True
+    elif type(v) is str:
+        b = v.encode("utf-8")
+        if len(b) < ABSENT:
+            strs[slot[1]] = b
+            return True
+    return False
+
+
+def encode_record(rec: Dict[str, Any]) -> bytes:
+    """One raw record dict as a binary frame."""
+    epoch = math.nan
+    level = ABSENT
+    nums = list(_NO_NUMS)
+    strs = list(_NO_STRS)
+    extras: Dict[str, Any] = {}
+    for k, v in rec.items():
+        slot = _SLOTS.get(k)
+        if slot is not None:
+            # _slot inlined: this loop is the per-record cost
+            if slot[0]:
+                if type(v) in _NUM_TYPES and v == v:
+                    nums[slot[1]] = float(v)
+                    continue
+            elif type(v) is str:
+                b = v.encode("utf-8")
+                if len(b) < ABSENT:
+                    strs[slot[1]] = b
+                    continue
+        elif k == "ts":
+            try:
+                epoch = _ts_to_epoch(v)
+                continue
+            except (TypeError, ValueError):
+                pass
+        elif k == "level":
+            level = _LEVEL_CODES.get(v, ABSENT)
+            if level != ABSENT:
+                continue
+        extras[k] = v
+
+    # Lift the order fields of a nested request/req into the fixed slots;
+    # the flag tells the decoder to put them back where they came from
+    flags = 0
+    if extras and _ORDER_FIELDS.isdisjoint(rec):
+        for bit, key in enumerate(NESTED_KEYS):
+            nested = extras.get(key)
+            if type(nested) is dict:
+                rest = {k: v for k, v in nested.items()
+                        if k not in _NESTED_SLOTS or not _slot(nums, strs, _NESTED_SLOTS[k], v)}
+                if rest:
+                    extras[key] = rest
+                else:
+                    del extras[key]
+                flags = 1 << bit
+                break
+
+    tail = _JSON.encode(extras).encode("utf-8") if extras else b""
+    body = b"".join([b for b in strs if b is not None]) + tail
+    lens = [ABSENT if b is None else len(b) for b in strs]
+    return FRAME.pack(_HEADER + len(body), epoch, level, flags, *nums, *lens, len(tail)) + body
+
+
+def decode_frame(buf: bytes, offset: int = 0) -> Dict[str, Any]:
+    """Decode the frame starting at offset back into a raw record dict."""
+    fields = FRAME.unpack_from(buf, offset)
+    rec: Dict[str, Any] = {}
+    if fields[1] == fields[1]:  # not NaN
+        rec["ts"] = _epoch_to_ts(fields[1])
+    if fields[2] != ABSENT:
+        rec["level"] = LEVELS[fields[2]]
+    pos = offset + FRAME.size
+    for field, n in zip(STR_FIELDS, fields[7:17]):
+        if n != ABSENT:
+            rec[field] = buf[pos:pos + n].decode("utf-8")
+            pos += n
+    for field, v in zip(NUM_FIELDS, fields[4:7]):
+        if v == v:
+            rec[field] = v
+    extras = _JSON_DEC.decode(buf[pos:pos + fields[17]].decode("utf-8")) if fields[17] else {}
+    if fields[3]:
+        key = NESTED_KEYS[fields[3].bit_length() - 1]
+        nested = {src: rec.pop(dst) for src, dst in NESTED_FIELDS.items() if dst in rec}
+        nested.update(extras.pop(key, {}))
+        rec[key] = nested
+    rec.update(extras)
+    return rec
+
+
+def iter_frames(data: bytes) -> Iterator[Dict[str, Any]]:
+    """Decode every complete frame of a binary log; a torn final frame is ignored."""
+    pos = len(BIN_MAGIC) if data.startswith(BIN_MAGIC) else 0
+    end = len(data)
+    while pos + 4 <= end:
+        (n,) = struct.unpack_from("<I", data, pos)
+        if pos + 4 + n > end:
+            break
+        yield decode_frame(data, pos)
+        pos += 4 + n
+
+
+def is_binary(path: str) -> bool:
+    return path.endswith(".bin")
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Raw record dicts from a JSON-lines or binary (.bin) log. Comment and torn lines are skipped."""
+    if is_binary(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        yield from iter_frames(data)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith("{"):
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def write_records(path: str, records: Iterable[Dict[str, Any]]) -> int:
+    """Write records as JSON lines or binary frames depending on the extension. Returns the count."""
+    n = 0
+    if is_binary(path):
+        with open(path, "wb") as f:
+            f.write(BIN_MAGIC)
+            for rec in records:
+                f.write(encode_record(rec))
+                n += 1
+        return n
+    with open(path, "w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec) + "\n")
+            n += 1
+    return n
+
+
+def convert(src: str, dst: str) -> int:
+    """bot.log <-> bot.bin (direction chosen by the file extensions)."""
+    return write_records(dst, read_records(src))
@@ -1,6 +1,7 @@
 import sys
 import os
 import argparse
+from typing import Any, Dict
 
 # Add project root to path so we can import from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,20 +24,8 @@ def parse_args():
     p.add_argument("quantity", help="Order quantity (float)")
     return p.parse_args()
 
-def main():
-    args = parse_args()
-    cfg = load_env()
-    try:
-        symbol = validate_symbol(args.symbol)
-        side = validate_side(args.side)
-        qty = validate_qty(args.quantity)
-    except Exception as e:
-        log_error({"action": "validate", "error": str(e)})
-        print(f"Input error: {e}")
-        sys.exit(1)
-
-    client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
-
+def place_market(client: Any, symbol: str, side: str, qty: float) -> Dict[str, Any]:
+    """Place one MARKET order through the retry wrapper and log the outcome. Raises on failure."""
     try:
         req = {
             "symbol": symbol,
@@ -54,7 +43,7 @@ def main():
             "result": "ok",
             "orderId": resp.get("orderId")
         })
-        print(f"OK: MARKET {side} {qty} {symbol}, orderId={resp.get('orderId')}")
+        return resp
     except Exception as e:
         log_error({
             "action": "place_order",
@@ -65,8 +54,28 @@ def main():
             "result": "error",
             "error": str(e),
         })
+        raise
+
+def main():
+    args = parse_args()
+    cfg = load_env()
+    try:
+        symbol = validate_symbol(args.symbol)
+        side = validate_side(args.side)
+        qty = validate_qty(args.quantity)
+    except Exception as e:
+        log_error({"action": "validate", "error": str(e)})
+        print(f"Input error: {e}")
+        sys.exit(1)
+
+    client = get_client(cfg["API_KEY"], cfg["API_SECRET"], cfg["MODE"])
+
+    try:
+        resp = place_market(client, symbol, side, qty)
+    except Exception as e:
         print(f"Order failed: {e}")
         sys.exit(1)
+    print(f"OK: MARKET {side} {qty} {symbol}, orderId={resp.get('orderId')}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,227 @@
+"""
+Daksh Binance Futures Trading Bot
+Pre-trade risk checks against in-memory exposure aggregates
+
+Exposure is maintained incrementally from acks, fills and cancels, so a
+check is a handful of dict lookups rather than a REST round-trip. A limit
+of 0 disables that check.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class RiskRejected(ValueError):
+    """Raised when an order would breach a configured risk limit."""
+
+
+class RiskManager:
+    def __init__(
+        self,
+        max_notional_symbol: float = 0.0,
+        max_notional_account: float = 0.0,
+        max_open_orders: int = 0,
+        max_orders_per_sec: float = 0.0,
+    ):
+        self.max_notional_symbol = max_notional_symbol
+        self.max_notional_account = max_notional_account
+        self.max_open_orders = max_open_orders
+        self.max_orders_per_sec = max_orders_per_sec
+        # Optional one-shot price lookup for symbols with no known reference price
+        self.price_source: Optional[Callable[[str], float]] = None
+        # Optional live mark lookup (shared-memory snapshot); preferred over a cached reference price
+        self.mark_source: Optional[Callable[[str], Optional[float]]] = None
+
+        self.position: Dict[str, float] = {}            # signed qty per symbol
+        self.ref_price: Dict[str, float] = {}           # last mark/fill/order price
+        self.open_orders: Dict[str, Tuple[str, float]] = {}  # orderId -> (symbol, notional)
+        self.open_notional: Dict[str, float] = {}       # non-reduceOnly resting notional per symbol
+        self.exposure: Dict[str, float] = {}            # |position| * ref + open notional
+        self.account_exposure = 0.0
+        self._sent: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, cfg: Dict[str, Any]) -> "RiskManager":
+        return cls(
+            max_notional_symbol=cfg.get("MAX_NOTIONAL_PER_SYMBOL", 0.0),
+            max_notional_account=cfg.get("MAX_NOTIONAL_PER_ACCOUNT", 0.0),
+            max_open_orders=cfg.get("MAX_OPEN_ORDERS", 0),
+            max_orders_per_sec=cfg.get("MAX_ORDERS_PER_SEC", 0.0),
+        )
+
+    # --- aggregate maintenance -------------------------------------------------
+
+    def _refresh(self, symbol: str):
+        ref = self.ref_price.get(symbol, 0.0)
+        new = abs(self.position.get(symbol, 0.0)) * ref + self.open_notional.get(symbol, 0.0)
+        self.account_exposure += new - self.exposure.get(symbol, 0.0)
+        self.exposure[symbol] = new
+
+    def _price_for(self, req: Dict[str, Any]) -> Optional[float]:
+        symbol = req["symbol"]
+        price = req.get("price") or req.get("stopPrice")
+        if not price and self.mark_source is not None:
+            mark = self.mark_source(symbol)
+            if mark:
+                if mark != self.ref_price.get(symbol):
+                    # Revalue the position at the live mark before the limit is checked
+                    self.ref_price[symbol] = mark
+                    self._refresh(symbol)
+                return mark
+        price = price or self.ref_price.get(symbol)
+        if price is None and self.price_source is not None:
+            try:
+                price = self.price_source(symbol)
+                self.ref_price[symbol] = price
+            except Exception:
+                price = None
+        return float(price) if price else None
+
+    def _growth(self, req: Dict[str, Any], pending: float = 0.0) -> float:
+        """Quantity by which req would grow |position| (negative if it shrinks it), net of pending qty."""
+        qty = float(req["quantity"])
+        pos = self.position.get(req["symbol"], 0.0) + pending
+        return abs(pos + (qty if req["side"] == "BUY" else -qty)) - abs(pos)
+
+    def set_mark(self, symbol: str, price: float):
+        with self._lock:
+            self.ref_price[symbol] = price
+            self._refresh(symbol)
+
+    def on_fill(self, symbol: str, side: str, qty: float, price: Optional[float] = None,
+                order_id: Optional[str] = None, closed: bool = True):
+        """Apply a fill. closed=False keeps a partially filled order resting."""
+        with self._lock:
+            signed = qty if side == "BUY" else -qty
+            self.position[symbol] = self.position.get(symbol, 0.0) + signed
+            if price:
+                self.ref_price[symbol] = price
+            if order_id is not None:
+                self._release(order_id, filled_notional=qty * (price or 0.0), closed=closed)
+            self._refresh(symbol)
+
+    def on_cancel(self, order_id: str):
+        with self._lock:
+            entry = self.open_orders.get(order_id)
+            if entry is not None:
+                self._release(order_id, closed=True)
+                self._refresh(entry[0])
+
+    def _release(self, order_id: str, filled_notional: float = 0.0, closed: bool = True):
+        entry = self.open_orders.get(order_id)
+        if entry is None:
+            return
+        symbol, notional = entry
+        released = notional if closed else min(notional, filled_notional)
+        self.open_notional[symbol] = self.open_notional.get(symbol, 0.0) - released
+        if closed:
+            del self.open_orders[order_id]
+        else:
+            self.open_orders[order_id] = (symbol, notional - released)
+
+    # --- pre-trade check -------------------------------------------------------
+
+    def check(self, req: Dict[str, Any]):
+        """Raise RiskRejected if req would breach a limit; otherwise count it against the rate limit."""
+        self.check_batch([req])
+
+    def check_batch(self, reqs: List[Dict[str, Any]]):
+        """
+        Check orders that will be sent together. Each one is checked with the
+        exposure and open orders of those before it added, and nothing is
+        counted against the rate limit unless every order passes.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.max_orders_per_sec:
+                while self._sent and now - self._sent[0] >= 1.0:
+                    self._sent.popleft()
+                # The batch's last order must still find room in the window
+                if len(self._sent) + len(reqs) - 1 >= self.max_orders_per_sec:
+                    raise RiskRejected(f"order rate limit reached ({self.max_orders_per_sec:g}/s)")
+
+            open_orders = len(self.open_orders)
+            added: Dict[str, float] = {}
+            pending: Dict[str, float] = {}  # signed qty of the batch's earlier orders
+            for req in reqs:
+                if req.get("type") != "MARKET":
+                    if self.max_open_orders and open_orders >= self.max_open_orders:
+                        raise RiskRejected(f"max open orders reached ({self.max_open_orders})")
+                    open_orders += 1
+
+                # reduceOnly exits can only shrink exposure
+                if req.get("reduceOnly") or not (self.max_notional_symbol or self.max_notional_account):
+                    continue
+                symbol = req["symbol"]
+                growth = self._growth(req, pending.get(symbol, 0.0))
+                qty = float(req["quantity"])
+                pending[symbol] = pending.get(symbol, 0.0) + (qty if req["side"] == "BUY" else -qty)
+                price = self._price_for(req)
+                if price is None:
+                    continue
+                add = growth * price
+                if add <= 0:
+                    # Netted against the position it only flattens; later orders in the batch see that
+                    added[symbol] = added.get(symbol, 0.0) + add
+                    continue
+                sym_after = self.exposure.get(symbol, 0.0) + added.get(symbol, 0.0) + add
+                if self.max_notional_symbol and sym_after > self.max_notional_symbol:
+                    raise RiskRejected(
+                        f"{symbol} notional {sym_after:.2f} would exceed {self.max_notional_symbol:.2f}"
+                    )
+                acct_after = self.account_exposure + sum(added.values()) + add
+                if self.max_notional_account and acct_after > self.max_notional_account:
+                    raise RiskRejected(
+                        f"account notional {acct_after:.2f} would exceed {self.max_notional_account:.2f}"
+                    )
+                added[symbol] = added.get(symbol, 0.0) + add
+            if self.max_orders_per_sec:
+                # Only the rate check trims this window; unguarded it grows by one entry per order
+                self._sent.extend([now] * len(reqs))
+
+    def on_ack(self, req: Dict[str, Any], resp: Dict[str, Any]):
+        """Account for an accepted order: MARKET fills immediately, others rest."""
+        symbol = req["symbol"]
+        qty = float(req["quantity"])
+        if req.get("type") == "MARKET":
+            price = resp.get("avgPrice")
+            self.on_fill(symbol, req["side"], qty, float(price) if price and float(price) else None)
+            return
+        with self._lock:
+            price = self._price_for(req) or 0.0
+            # Like the check: only the part that would grow the position counts as exposure
+            notional = 0.0 if req.get("reduceOnly") else max(0.0, self._growth(req)) * price
+            self.open_orders[str(resp.get("orderId"))] = (symbol, notional)
+            self.open_notional[symbol] = self.open_notional.get(symbol, 0.0) + notional
+            self._refresh(symbol)
+
+    def sync(self, client: Any):
+        """One-time bootstrap of positions and resting orders from the exchange."""
+        for p in client.futures_position_information():
+            amt = float(p.get("positionAmt", 0) or 0)
+            if amt:
+                with self._lock:
+                    self.position[p["symbol"]] = amt
+                    self.ref_price[p["symbol"]] = float(p.get("markPrice") or p.get("entryPrice") or 0)
+                    self._refresh(p["symbol"])
+        for o in client.futures_get_open_orders():
+            self.on_ack(
+                {"symbol": o["symbol"], "side": o["side"], "type": o["type"], "quantity": o["origQty"],
+                 "price": float(o.get("price") or 0) or None, "stopPrice": float(o.get("stopPrice") or 0) or None,
+                 "reduceOnly": o.get("reduceOnly", False)},
+                {"orderId": o["orderId"]},
+            )
+
+
+def attach_risk(client: Any, cfg: Dict[str, Any]) -> RiskManager:
+    """Create the account's RiskManager and expose it as client.risk."""
+    risk = RiskManager.from_env(cfg)
+    if hasattr(client, "futures_mark_price"):
+        risk.price_source = lambda symbol: float(client.futures_mark_price(symbol=symbol)["markPrice"])
+    if hasattr(client, "futures_position_information"):
+        risk.sync(client)
+    client.risk = risk
+    return risk
@@ -0,0 +1,325 @@
+"""
+Daksh Binance Futures Trading Bot
+Multi-strategy runtime
+
+Hosts many strategy instances as cooperative tasks on one asyncio loop.
+They share one client (and with it the time sync, risk manager and rate
+limiter), one intent journal, one log sink and one event stream. Blocking
+exchange calls run on a small thread pool, so a strategy waiting on the
+network or on its next slice never holds up the others. CPU time, and
+optionally net allocated memory, is metered per strategy.
+"""
+
+import abc
+import time
+import uuid
+import asyncio
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.common import log_info, log_error
+
+
+class StrategyStats:
+    """Resource use attributed to one hosted strategy."""
+
+    __slots__ = ("cpu_s", "steps", "calls", "call_wall_s", "events", "alloc_bytes")
+
+    def __init__(self):
+        self.cpu_s = 0.0         # loop-thread steps plus the strategy's exchange calls
+        self.steps = 0
+        self.calls = 0
+        self.call_wall_s = 0.0
+        self.events = 0
+        self.alloc_bytes = 0     # net, loop-thread steps only; needs trace_memory=True
+
+    def as_dict(self) -> Dict[str, Any]:
+        out = {"cpuMs": round(self.cpu_s * 1000, 3), "steps": self.steps, "calls": self.calls,
+               "callWallMs": round(self.call_wall_s * 1000, 3), "events": self.events}
+        if tracemalloc.is_tracing():
+            out["allocKb"] = round(self.alloc_bytes / 1024, 1)
+        return out
+
+
+class Strategy(abc.ABC):
+    """
+    Base class for hosted strategies.
+
+    start() sends the initial orders. It may run to completion (TWAP) or
+    return and leave the strategy waiting on on_event(); either way the
+    strategy calls finish(result) when it is done. stop() is called for
+    strategies still running when the runtime shuts down.
+    """
+
+    kind = "STRATEGY"
+    prefix = "STRAT"
+
+    def __init__(self, link_id: Optional[str] = None):
+        self.link_id = link_id or f"{self.prefix}-{uuid.uuid4().hex[:8]}"
+        self.runtime: Optional["Runtime"] = None
+        self.symbols: List[str] = []
+        self.status = "new"
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.stats = StrategyStats()
+        self._finished: Optional[asyncio.Event] = None
+
+    # --- shared services ---------------------------------------------------
+
+    @property
+    def client(self) -> Any:
+        return self.runtime.client
+
+    @property
+    def journal(self) -> Any:
+        return self.runtime.journal
+
+    async def call(self, fn: Callable[..., Any], /, *args, **kwargs) -> Any:
+        """Run a blocking exchange call on the runtime's pool, metered to this strategy."""
+        return await self.runtime.call(self, fn, *args, **kwargs)
+
+    def say(self, msg: str):
+        if self.runtime.on_progress is not None:
+            self.runtime.on_progress(msg)
+
+    # --- hooks -------------------------------------------------------------
+
+    @abc.abstractmethod
+    async def start(self):
+        """Send the initial orders; runs on the event loop, so blocking calls go through call()."""
+
+    async def on_event(self, event: Dict[str, Any]):
+        pass
+
+    async def stop(self):
+        self.finish(self.result, status="stopped")
+
+    def finish(self, result: Any = None, status: str = "complete"):
+        if self._finished is None or self._finished.is_set():
+            return
+        self.result = result
+        self.status = status
+        self._finished.set()
+
+    @property
+    def done(self) -> bool:
+        return self._finished is not None and self._finished.is_set()
+
+
+_stats_lock = threading.Lock()  # stats are also charged from the call pool's threads
+
+
+class _Metered:
+    """Drives a coroutine step by step, charging each step's thread CPU time to a strategy."""
+
+    def __init__(self, coro, stats: StrategyStats, trace: bool):
+        self.coro = coro
+        self.stats = stats
+        self.trace = trace
+
+    def __await__(self):
+        it = self.coro.__await__()
+        send, exc = None, None
+        while True:
+            t0 = time.thread_time()
+            m0 = tracemalloc.get_traced_memory()[0] if self.trace else 0
+            try:
+                yielded = it.throw(exc) if exc is not None else it.send(send)
+            except StopIteration as e:
+                self._charge(t0, m0)
+                return e.value
+            except BaseException:
+                self._charge(t0, m0)
+                raise
+            self._charge(t0, m0)
+            try:
+                send, exc = (yield yielded), None
+            except BaseException as e:
+                send, exc = None, e
+
+    def _charge(self, t0: float, m0: int):
+        cpu = time.thread_time() - t0
+        alloc = tracemalloc.get_traced_memory()[0] - m0 if self.trace else 0
+        with _stats_lock:
+            self.stats.cpu_s += cpu
+            self.stats.steps += 1
+            self.stats.alloc_bytes += alloc
+
+
+async def _metered(coro, stats: StrategyStats, trace: bool) -> Any:
+    return await _Metered(coro, stats, trace)
+
+
+class Runtime:
+    """
+    One event loop hosting many strategies with shared services.
+
+    Events (user data stream ORDER_TRADE_UPDATE, markPriceUpdate) may be
+    published from any thread. Order updates go to the strategy whose
+    linkId prefixes the clientOrderId; mark prices update the shared
+    `marks` and the risk manager and go to strategies trading the symbol.
+    """
+
+    def __init__(self, client: Any, journal: Any = None, max_workers: int = 16, trace_memory: bool = False,
+                 on_progress: Optional[Callable[[str], None]] = None):
+        self.client = client
+        self.journal = journal
+        self.on_progress = on_progress
+        self.trace_memory = trace_memory
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="runtime")
+        self.strategies: Dict[str, Strategy] = {}
+        self.marks: Dict[str, float] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        if hasattr(client, "add_listener"):
+            client.add_listener(self.publish)
+
+    # --- exchange calls ----------------------------------------------------
+
+    async def call(self, strategy: Strategy, fn: Callable[..., Any], /, *args, **kwargs) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.pool, lambda: self._timed(strategy.stats, fn, args, kwargs))
+
+    def _timed(self, stats: StrategyStats, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        t0, w0 = time.thread_time(), time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with _stats_lock:
+                stats.cpu_s += time.thread_time() - t0
+                stats.call_wall_s += time.perf_counter() - w0
+                stats.calls += 1
+
+    # --- events ------------------------------------------------------------
+
+    def publish(self, msg: Dict[str, Any]):
+        """Thread-safe entry point for stream callbacks."""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        if _running_loop() is loop:
+            self._dispatch(msg)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._dispatch, msg)
+            except RuntimeError:
+                pass  # loop closed between the check and the call
+
+    def _dispatch(self, msg: Dict[str, Any]):
+        data = msg.get("data", msg)
+        kind = data.get("e")
+        if kind == "ORDER_TRADE_UPDATE":
+            o = data["o"]
+            risk = getattr(self.client, "risk", None)
+            if risk is not None and o.get("x") == "TRADE" and o.get("o") != "MARKET":
+                # MARKET fills are already booked from the order ack
+                risk.on_fill(o["s"], o["S"], float(o.get("l") or 0), float(o.get("L") or 0) or None,
+                             order_id=str(o.get("i")), closed=o.get("X") == "FILLED")
+            st = self.strategies.get(str(o.get("c", "")).rpartition("-")[0])
+            targets = [st] if st is not None else []
+        elif kind == "markPriceUpdate":
+            symbol, price = data["s"], float(data["p"])
+            self.marks[symbol] = price
+            risk = getattr(self.client, "risk", None)
+            if risk is not None:
+                risk.set_mark(symbol, price)
+            targets = [st for st in self.strategies.values() if symbol in st.symbols]
+        else:
+            return
+        for st in targets:
+            if not st.done:
+                st.stats.events += 1
+                asyncio.ensure_future(self._guard(st, st.on_event(data)))
+
+    async def _guard(self, st: Strategy, coro):
+        try:
+            await _metered(coro, st.stats, self.trace_memory)
+        except Exception as e:
+            log_error({"action": "strategy_event", "strategy": st.kind, "linkId": st.link_id,
+                       "result": "error", "error": str(e)})
+
+    # --- lifecycle ---------------------------------------------------------
+
+    def add(self, strategy: Strategy) -> asyncio.Task:
+        """Host a strategy; must be called from the runtime's loop."""
+        self.loop = asyncio.get_running_loop()
+        strategy.runtime = self
+        strategy._finished = asyncio.Event()
+        self.strategies[strategy.link_id] = strategy
+        task = asyncio.ensure_future(self._run(strategy))
+        self._tasks[strategy.link_id] = task
+        return task
+
+    async def _run(self, st: Strategy):
+        st.status = "running"
+        log_info({"action": "strategy_start", "strategy": st.kind, "linkId": st.link_id})
+        try:
+            await _metered(st.start(), st.stats, self.trace_memory)
+            await st._finished.wait()
+        except asyncio.CancelledError:
+            st.finish(st.result, status="stopped")
+            raise
+        except Exception as e:
+            st.error = e
+            st.finish(None, status="failed")
+            log_error({"action": "strategy_failed", "strategy": st.kind, "linkId": st.link_id,
+                       "result": "error", "error": str(e)})
+        finally:
+            self.strategies.pop(st.link_id, None)
+            self._tasks.pop(st.link_id, None)
+        log_info({"action": "strategy_complete", "strategy": st.kind, "linkId": st.link_id,
+                  "status": st.status, **st.stats.as_dict(), "result": "ok" if st.status == "complete" else st.status})
+
+    async def run(self, strategies: List[Strategy]) -> List[Strategy]:
+        """Host strategies until every one has finished."""
+        tasks = [self.add(st) for st in strategies]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return strategies
+
+    async def shutdown(self):
+        """Stop every strategy still running, then release the pool."""
+        for st in list(self.strategies.values()):
+            try:
+                await _metered(st.stop(), st.stats, self.trace_memory)
+            except Exception as e:
+                log_error({"action": "strategy_stop", "strategy": st.kind, "linkId": st.link_id,
+                           "result": "error", "error": str(e)})
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if hasattr(self.client, "remove_listener"):
+            self.client.remove_listener(self.publish)
+        self.pool.shutdown(wait=True)
+
+    def stats(self, strategies: List[Strategy]) -> Dict[str, Dict[str, Any]]:
+        return {st.link_id: {"strategy": st.kind, "status": st.status, **st.stats.as_dict()} for st in strategies}
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def run_once(strategy: Strategy, client: Any, journal: Any = None,
+             on_progress: Optional[Callable[[str], None]] = None) -> Any:
+    """
+    One-shot launcher used by the CLIs and by multi-account fan-out: host a
+    single strategy until it finishes and return its result. An error in
+    start() is re-raised to the caller.
+    """
+    async def main():
+        rt = Runtime(client, journal, max_workers=1, on_progress=on_progress)
+        try:
+            await rt.run([strategy])
+        finally:
+            await rt.shutdown()
+
+    asyncio.run(main())
+    if strategy.error is not None:
+        raise strategy.error
+    return strategy.result
@@ -0,0 +1,290 @@
+"""
+Daksh Binance Futures Trading Bot
+Shared-memory market snapshot
+
+One feeder process (scripts/market_feeder.py) keeps the latest mark price,
+best bid/ask and funding rate per symbol in a named shared-memory segment;
+every bot process on the host reads it instead of holding its own market
+data subscription. Reads are plain loads from the mapped segment: no copy
+of the segment, no lock and, unless the writer is caught mid-update, no
+system call.
+
+Layout (fixed; native byte order, as the segment never leaves the host):
+  header     64 B   magic, version, capacity, symbol count, slot size, writer pid
+  directory  capacity x 16 B   ASCII symbol names, in slot order
+  slots      capacity x 64 B   one cache line per symbol:
+             seq u64 | mark, bid, ask, bidQty, askQty, funding f64 | ts ms i64
+
+Each slot is a seqlock with a single writer: the writer makes seq odd,
+writes the fields and makes seq even again. A reader copies the slot and
+re-reads seq; an odd or changed seq means it raced the writer and retries.
+Single aligned 8-byte fields (e.g. the mark alone) are never torn and need
+no retry. Each store is one memcpy inside a single C call and x86 keeps
+stores in order; on weakly ordered CPUs the seq check is best-effort.
+"""
+
+import os
+import math
+import time
+import struct
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional
+
+DEFAULT_NAME = "dbot_market"
+MAGIC = b"DBSNAP1\0"
+VERSION = 1
+# Native formats: struct reads each field with one memcpy (one aligned
+# 8-byte load); "<" formats go byte by byte, so a field could tear. The
+# writer never uses pack_into on live slots: it zeroes the target first,
+# which a reader can observe.
+HEADER = struct.Struct("8sIIIIQ")    # magic, version, capacity, count, slot size, writer pid
+HEADER_SIZE = 64
+NAME_SIZE = 16
+SLOT = struct.Struct("Q6dq")         # seq, mark, bid, ask, bidQty, askQty, funding, ts ms
+SEQ = struct.Struct("Q")
+FIELDS = struct.Struct("6dq")
+MARK = struct.Struct("d")
+COUNT = struct.Struct("I")
+COUNT_OFFSET = 16                    # offset of the count field in HEADER
+MAX_SPINS = 10000                    # a writer that died mid-update leaves seq odd forever
+YIELD_AFTER = 32                     # retries before giving the CPU back to a preempted writer
+
+MarketSnapshot = namedtuple("MarketSnapshot", "seq mark bid ask bid_qty ask_qty funding ts_ms")
+_new_snapshot = tuple.__new__  # MarketSnapshot._make without the length check
+
+_NAN = float("nan")
+_EMPTY = (_NAN, _NAN, _NAN, _NAN, _NAN, _NAN, 0)
+
+
+def _slots_offset(capacity: int) -> int:
+    end = HEADER_SIZE + capacity * NAME_SIZE
+    return (end + 63) // 64 * 64
+
+
+def segment_size(capacity: int) -> int:
+    return _slots_offset(capacity) + capacity * SLOT.size
+
+
+def _untrack(shm: shared_memory.SharedMemory):
+    # Before 3.13 the resource tracker unlinks every segment a process created
+    # or opened when it exits; the segment must outlive any one bot or feeder
+    if os.name == "posix":
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open an existing segment without handing it to this process's resource tracker."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        _untrack(shm)
+        return shm
+
+
+class SnapshotWriter:
+    """
+    The feeder side. Only one writer per segment: slots are allocated and
+    sequence numbers advanced without locking.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME, capacity: int = 256):
+        self.name = name
+        self.capacity = capacity
+        size = segment_size(capacity)
+        self.index: Dict[str, int] = {}
+        self._values: List[list] = []
+        self._seq: List[int] = []
+        self.updates = 0
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _untrack(self.shm)
+            self.buf = self.shm.buf
+            self.slots = _slots_offset(capacity)
+        except FileExistsError:
+            self.shm = _attach(name)
+            self.buf = self.shm.buf
+            self.slots = _slots_offset(capacity)
+            if self._adopt():
+                return
+            if self.shm.size < size:
+                self.close(unlink=False)
+                raise ValueError(f"existing segment {name} is too small for {capacity} symbols")
+        self.buf[:size] = bytes(size)
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, capacity, 0, SLOT.size, os.getpid())
+
+    def _adopt(self) -> bool:
+        """
+        Take over the segment of a previous feeder with the same layout. Slots
+        keep their positions, so readers that are already attached (and have
+        cached symbol offsets) carry on across a feeder restart.
+        """
+        magic, version, capacity, count, slot_size, _pid = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION or capacity != self.capacity or slot_size != SLOT.size:
+            return False
+        for i in range(count):
+            raw = bytes(self.buf[HEADER_SIZE + i * NAME_SIZE:HEADER_SIZE + (i + 1) * NAME_SIZE])
+            self.index[raw.rstrip(b"\0").decode("ascii")] = i
+            vals = SLOT.unpack_from(self.buf, self.slots + i * SLOT.size)
+            seq = vals[0] + (vals[0] & 1)  # a writer killed mid-update left it odd
+            off = self.slots + i * SLOT.size
+            self.buf[off:off + 8] = SEQ.pack(seq)
+            self._seq.append(seq)
+            self._values.append(list(vals[1:]))
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, capacity, count, SLOT.size, os.getpid())
+        return True
+
+    def _slot(self, symbol: str) -> int:
+        i = self.index.get(symbol)
+        if i is not None:
+            return i
+        i = len(self.index)
+        if i >= self.capacity:
+            raise ValueError(f"snapshot is full ({self.capacity} symbols)")
+        name = symbol.encode("ascii")
+        if len(name) > NAME_SIZE:
+            raise ValueError(f"symbol name too long: {symbol}")
+        SLOT.pack_into(self.buf, self.slots + i * SLOT.size, 0, *_EMPTY)
+        self.buf[HEADER_SIZE + i * NAME_SIZE:HEADER_SIZE + i * NAME_SIZE + len(name)] = name
+        # Publish the count last: readers only scan names below it
+        COUNT.pack_into(self.buf, COUNT_OFFSET, i + 1)
+        self.index[symbol] = i
+        self._values.append(list(_EMPTY))
+        self._seq.append(0)
+        return i
+
+    def update(self, symbol: str, mark: Optional[float] = None, bid: Optional[float] = None,
+               ask: Optional[float] = None, bid_qty: Optional[float] = None, ask_qty: Optional[float] = None,
+               funding: Optional[float] = None, ts_ms: Optional[int] = None):
+        """Publish the given fields for symbol; fields left as None keep their last value."""
+        i = self._slot(symbol)
+        vals = self._values[i]
+        if mark is not None:
+            vals[0] = mark
+        if bid is not None:
+            vals[1] = bid
+        if ask is not None:
+            vals[2] = ask
+        if bid_qty is not None:
+            vals[3] = bid_qty
+        if ask_qty is not None:
+            vals[4] = ask_qty
+        if funding is not None:
+            vals[5] = funding
+        if ts_ms is not None:
+            vals[6] = ts_ms
+        off = self.slots + i * SLOT.size
+        seq = self._seq[i] + 1
+        buf = self.buf
+        buf[off:off + 8] = SEQ.pack(seq)              # odd: update in progress
+        buf[off + 8:off + 64] = FIELDS.pack(*vals)
+        buf[off:off + 8] = SEQ.pack(seq + 1)          # even: consistent again
+        self._seq[i] = seq + 1
+        self.updates += 1
+
+    def on_message(self, msg: Dict[str, Any]):
+        """Futures stream callback: markPriceUpdate and bookTicker, plain or multiplexed."""
+        data = msg.get("data", msg)
+        kind = data.get("e")
+        if kind == "markPriceUpdate":
+            self.update(data["s"], mark=float(data["p"]),
+                        funding=float(data["r"]) if data.get("r") not in (None, "") else None,
+                        ts_ms=int(data.get("E") or 0) or None)
+        elif kind == "bookTicker":
+            self.update(data["s"], bid=float(data["b"]), bid_qty=float(data["B"]), ask=float(data["a"]),
+                        ask_qty=float(data["A"]), ts_ms=int(data.get("E") or data.get("T") or 0) or None)
+
+    def close(self, unlink: bool = False):
+        """Detach; the segment stays (and a restarted feeder adopts it) unless unlink is set."""
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            if os.name == "posix" and getattr(self.shm, "_track", True):
+                resource_tracker.register(self.shm._name, "shared_memory")  # unlink() unregisters it
+            self.shm.unlink()
+
+
+class SnapshotReader:
+    """
+    Zero-copy reader for any number of processes. Symbol lookups are cached,
+    so a read is two struct unpacks straight from the mapped segment.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        self.name = name
+        self.shm = _attach(name)
+        self.buf = self.shm.buf
+        magic, version, capacity, _count, slot_size, self.writer_pid = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION or slot_size != SLOT.size:
+            self.close()
+            raise ValueError(f"{name} is not a version {VERSION} market snapshot")
+        self.capacity = capacity
+        self.slots = _slots_offset(capacity)
+        self._offsets: Dict[str, int] = {}
+        self.retries = 0
+
+    def symbols(self) -> List[str]:
+        count = COUNT.unpack_from(self.buf, COUNT_OFFSET)[0]
+        out = []
+        for i in range(count):
+            raw = bytes(self.buf[HEADER_SIZE + i * NAME_SIZE:HEADER_SIZE + (i + 1) * NAME_SIZE])
+            out.append(raw.rstrip(b"\0").decode("ascii"))
+        return out
+
+    def _offset(self, symbol: str) -> Optional[int]:
+        off = self._offsets.get(symbol)
+        if off is None:
+            # New symbols only ever append, so a miss rescans the directory
+            for i, name in enumerate(self.symbols()):
+                self._offsets[name] = self.slots + i * SLOT.size
+            off = self._offsets.get(symbol)
+        return off
+
+    def get(self, symbol: str) -> Optional[MarketSnapshot]:
+        """Consistent copy of one symbol's slot, or None if the feeder has not published it."""
+        off = self._offsets.get(symbol) or self._offset(symbol)
+        if off is None:
+            return None
+        buf = self.buf
+        for spin in range(MAX_SPINS):
+            vals = SLOT.unpack_from(buf, off)
+            seq = vals[0]
+            if not seq & 1 and SEQ.unpack_from(buf, off)[0] == seq:
+                return _new_snapshot(MarketSnapshot, vals) if seq else None
+            self.retries += 1
+            if spin >= YIELD_AFTER:
+                # Only the contended path makes a syscall: a writer descheduled
+                # mid-update (one CPU, or an oversubscribed host) needs the CPU
+                # back before the slot can become consistent
+                time.sleep(0)
+        return None
+
+    def mark(self, symbol: str) -> Optional[float]:
+        """Latest mark price (one aligned 8-byte load, never torn); None if unknown."""
+        off = self._offsets.get(symbol) or self._offset(symbol)
+        if off is None:
+            return None
+        price = MARK.unpack_from(self.buf, off + 8)[0]
+        return None if math.isnan(price) else price
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+
+
+def attach_snapshot(client: Any, cfg: Dict[str, Any]) -> Optional[SnapshotReader]:
+    """
+    Attach the host's market snapshot (MARKET_SHM) as client.market and make
+    it the risk manager's first source of mark prices. Raises OSError if no
+    feeder has created the segment.
+    """
+    name = cfg.get("MARKET_SHM")
+    if not name:
+        return None
+    reader = SnapshotReader(name)
+    client.market = reader
+    risk = getattr(client, "risk", None)
+    if risk is not None:
+        risk.mark_source = reader.mark
+    return reader
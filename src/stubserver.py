@@ -0,0 +1,186 @@
+"""
+Daksh Binance Futures Trading Bot
+Local futures REST stand-in
+
+Serves the subset of the USDT-M futures REST API the bot uses (time,
+order, openOrders, batchOrders, positionRisk, premiumIndex) on localhost,
+backed by a FakeClient order book. klines and aggTrades are canned: a
+deterministic price path with one trade every trade_ms, paged with the
+exchange's limits, so history downloads can be tested offline. Pointing a live client at it with
+BINANCE_FAPI_URL exercises the real python-binance request path (signing,
+HTTP keep-alive, JSON parsing, APIError mapping) without an exchange.
+Latency and -1001 errors are injected by the FakeClient; exchange-side log
+records go to whatever BOT_LOG_PATH the server process was started with.
+"""
+
+import re
+import json
+import math
+import time
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from src.common import FakeClient
+from src.history import AGG_TRADE_LIMIT, AGG_TRADE_WINDOW_MS, INTERVAL_MS, KLINE_LIMIT
+
+API_ERROR_RE = re.compile(r"APIError\(code=(-?\d+)\): (.*)")
+# Added by the signing client; FakeClient does not want them back
+SIGNING_PARAMS = ("timestamp", "signature")
+
+
+class StubExchange:
+    """Maps (method, path) to FakeClient calls; the HTTP layer is in _Handler."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 mark_price: float = 60000.0, trade_ms: int = 1000):
+        self.book = FakeClient(jitter_ms=jitter_ms, latency_ms=latency_ms, error_rate=error_rate,
+                               mark_price=mark_price)
+        self.mark_price = mark_price
+        self.trade_ms = trade_ms
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def handle(self, method: str, path: str, params: Dict[str, str]) -> Tuple[int, Any]:
+        with self._lock:
+            self.requests += 1
+        for key in SIGNING_PARAMS:
+            params.pop(key, None)
+        try:
+            return 200, self._route(method, path, params)
+        except KeyError as e:
+            return 400, {"code": -1102, "msg": f"Mandatory parameter {e} was not sent."}
+        except Exception as e:
+            m = API_ERROR_RE.search(str(e))
+            if m is None:
+                return 500, {"code": -1000, "msg": str(e)}
+            code = int(m.group(1))
+            # -1001 is a server-side fault on the real exchange; rejections are client errors
+            return (503 if code == -1001 else 400), {"code": code, "msg": m.group(2)}
+
+    def _route(self, method: str, path: str, params: Dict[str, str]) -> Any:
+        book = self.book
+        if path in ("/fapi/v1/ping", "/api/v3/ping"):
+            return {}
+        if path == "/fapi/v1/time":
+            return book.futures_time()
+        if path == "/fapi/v1/order":
+            if method == "POST":
+                return book.futures_create_order(**params)
+            if method == "DELETE":
+                return book.futures_cancel_order(**params)
+            return book.futures_get_order(**params)
+        if path == "/fapi/v1/openOrders":
+            return book.futures_get_open_orders(**params)
+        if path == "/fapi/v1/batchOrders":
+            if method == "POST":
+                return book.futures_place_batch_order(json.loads(params.pop("batchOrders")), **params)
+            return book.futures_cancel_orders(
+                params.get("symbol", ""),
+                orderidlist=json.loads(params["orderidlist"]) if "orderidlist" in params else None,
+                origclientorderidlist=json.loads(params["origclientorderidlist"])
+                if "origclientorderidlist" in params else None)
+        if path in ("/fapi/v2/positionRisk", "/fapi/v3/positionRisk"):
+            return []
+        if path == "/fapi/v1/premiumIndex":
+            symbol = params.get("symbol", "BTCUSDT")
+            return {**book.futures_mark_price(symbol=symbol), "lastFundingRate": "0.0001"}
+        if path == "/fapi/v1/klines":
+            return self._klines(params)
+        if path == "/fapi/v1/aggTrades":
+            return self._agg_trades(params)
+        raise Exception(f"APIError(code=-1100): Unknown endpoint {method} {path}")
+
+    def _price(self, t_ms: int) -> float:
+        return round(self.mark_price * (1 + 0.002 * math.sin(t_ms / 3_600_000)), 2)
+
+    def _klines(self, params: Dict[str, str]) -> list:
+        """Candles with open time in [startTime, endTime], oldest first; the open candle is included."""
+        step = INTERVAL_MS.get(params["interval"])
+        if step is None:
+            raise Exception(f"APIError(code=-1120): Invalid interval {params['interval']}")
+        limit = min(int(params.get("limit", 500)), KLINE_LIMIT)
+        now = int(time.time() * 1000)
+        end = min(int(params.get("endTime", now)), now)
+        start = int(params.get("startTime", end - (limit - 1) * step))
+        rows = []
+        for t in range(-(-start // step) * step, end + 1, step):
+            if len(rows) == limit:
+                break
+            o, c = self._price(t), self._price(t + step)
+            rows.append([t, str(o), str(max(o, c) + 1), str(min(o, c) - 1), str(c), "12.5", t + step - 1,
+                         str(round(12.5 * c, 2)), 10, "6.0", str(round(6.0 * c, 2)), "0"])
+        return rows
+
+    def _agg_trades(self, params: Dict[str, str]) -> list:
+        """One trade every trade_ms with id = T // trade_ms; fromId or a window of at most one hour."""
+        limit = min(int(params.get("limit", 500)), AGG_TRADE_LIMIT)
+        last = int(time.time() * 1000) // self.trade_ms
+        if "fromId" in params:
+            first = int(params["fromId"])
+        elif "startTime" in params and "endTime" in params:
+            start, end = int(params["startTime"]), int(params["endTime"])
+            if end - start > AGG_TRADE_WINDOW_MS:
+                raise Exception("APIError(code=-1127): More than 1 hours between startTime and endTime.")
+            first = -(-start // self.trade_ms)
+            last = min(last, end // self.trade_ms)
+        else:
+            first = last - limit + 1
+        return [{"a": i, "p": str(self._price(i * self.trade_ms)), "q": "0.010", "f": i, "l": i,
+                 "T": i * self.trade_ms, "m": i % 2 == 1}
+                for i in range(first, min(last, first + limit - 1) + 1)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as with the real API
+    disable_nagle_algorithm = True  # headers and body are separate writes; avoid the delayed-ACK stall
+    exchange: StubExchange
+
+    def _serve(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        n = int(self.headers.get("Content-Length") or 0)
+        if n:
+            params.update(parse_qsl(self.rfile.read(n).decode("utf-8")))
+        status, body = self.exchange.handle(self.command, url.path, params)
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_DELETE = do_PUT = _serve
+
+    def log_message(self, format, *args):
+        pass  # one stderr line per request would dominate a load test
+
+
+def serve(exchange: StubExchange, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start serving on a daemon thread; port 0 picks a free port (see server.server_address)."""
+    handler = type("StubHandler", (_Handler,), {"exchange": exchange})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-exchange", daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def wait_ready(url: str, timeout: float = 10.0) -> Optional[str]:
+    """Poll the stub's ping endpoint until it answers; returns None when ready, else the last error."""
+    deadline = time.monotonic() + timeout
+    err = None
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url.rstrip("/") + "/fapi/v1/ping", timeout=1):
+                return None
+        except OSError as e:
+            err = str(e)
+            time.sleep(0.05)
+    return err
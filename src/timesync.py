@@ -0,0 +1,112 @@
+"""
+Daksh Binance Futures Trading Bot
+Server time synchronisation for signed requests
+
+Samples the exchange clock in the background, estimates the local/server
+offset and round-trip time, and stamps every signed request with the
+corrected timestamp and a recvWindow sized to the observed network jitter.
+"""
+
+import threading
+import time
+from collections import deque
+from statistics import median, pstdev
+from typing import Any, Deque, Dict, Optional, Tuple
+
+# Binance accepts recvWindow values up to 60s; stay well inside that
+MIN_RECV_WINDOW = 1000
+MAX_RECV_WINDOW = 60000
+
+
+class TimeSync:
+    """
+    Keeps `client.timestamp_offset` aligned with the exchange clock.
+
+    Each sample is an NTP-style exchange: offset = server - midpoint(send, recv).
+    Samples with a high round-trip time carry the largest error, so the
+    estimate is the median offset of the lowest-RTT half of the window.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        interval_sec: float = 30.0,
+        window: int = 8,
+        base_recv_window: int = 5000,
+    ):
+        self.client = client
+        self.interval_sec = interval_sec
+        self.base_recv_window = base_recv_window
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=window)
+        self.offset_ms = 0.0
+        self.rtt_ms = 0.0
+        self.recv_window = base_recv_window
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> Optional[Dict[str, float]]:
+        """Take one server-time sample and refresh the estimate. Returns None on failure."""
+        try:
+            t0 = time.time() * 1000
+            server_ms = float(self.client.futures_time()["serverTime"])
+            t1 = time.time() * 1000
+        except Exception:
+            return None
+        rtt = t1 - t0
+        offset = server_ms - (t0 + t1) / 2
+        with self._lock:
+            self.samples.append((offset, rtt))
+            self._estimate()
+            self.client.timestamp_offset = int(round(self.offset_ms))
+            return {"offsetMs": self.offset_ms, "rttMs": self.rtt_ms, "recvWindow": self.recv_window}
+
+    def _estimate(self):
+        by_rtt = sorted(self.samples, key=lambda s: s[1])
+        best = by_rtt[: max(1, len(by_rtt) // 2)]
+        self.offset_ms = median(o for o, _ in best)
+        rtts = [r for _, r in self.samples]
+        self.rtt_ms = median(rtts)
+        jitter = pstdev(rtts) if len(rtts) > 1 else 0.0
+        # Late arrival is bounded by ~one RTT plus jitter; keep headroom over that
+        needed = int(2 * self.rtt_ms + 4 * jitter + 500)
+        self.recv_window = max(MIN_RECV_WINDOW, min(MAX_RECV_WINDOW, max(needed, self.base_recv_window)))
+
+    def stamp(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of req carrying the tuned recvWindow (caller's value wins)."""
+        out = dict(req)
+        out.setdefault("recvWindow", self.recv_window)
+        return out
+
+    def now_ms(self) -> int:
+        return int(time.time() * 1000 + self.offset_ms)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_sec):
+            self.sample()
+
+    def start(self) -> "TimeSync":
+        # First sample is synchronous so the very first order is already corrected
+        for _ in range(3):
+            self.sample()
+        self._thread = threading.Thread(target=self._run, name="time-sync", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+
+def attach_time_sync(client: Any, cfg: Dict[str, Any]) -> Optional[TimeSync]:
+    """Start a TimeSync for client unless disabled in cfg; exposes it as client.time_sync."""
+    if not cfg.get("TIME_SYNC", True):
+        return None
+    sync = TimeSync(
+        client,
+        interval_sec=cfg.get("TIME_SYNC_INTERVAL", 30.0),
+        base_recv_window=cfg.get("RECV_WINDOW", 5000),
+    ).start()
+    client.time_sync = sync
+    return sync
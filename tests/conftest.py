@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Add project root to path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# src.common opens its log at import time: keep test logs and journals out of the project directory
+_tmp = tempfile.mkdtemp(prefix="dbot_tests_")
+os.environ["BOT_LOG_PATH"] = os.path.join(_tmp, "bot.log")
+os.environ["JOURNAL_PATH"] = os.path.join(_tmp, "orders.journal")
+os.environ["MODE"] = "dryrun"
+# Every record the code under test logs must parse as its typed event
+os.environ["LOG_VALIDATE"] = "on"
+
+
+def limit(price=59000.0, qty=0.002, **extra):
+    """A GTC LIMIT BUY on BTCUSDT; override any field with keyword arguments."""
+    return {"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "timeInForce": "GTC", "quantity": qty,
+            "price": price, **extra}
+
+
+@pytest.fixture
+def live():
+    """A real python-binance client talking to the stub exchange."""
+    from binance.client import Client
+    from src.stubserver import StubExchange, base_url, serve
+
+    exchange = StubExchange()
+    server = serve(exchange)
+    client = Client("key", "secret", ping=False)
+    client.FUTURES_URL = base_url(server) + "/fapi"
+    yield exchange, client
+    server.shutdown()
+    server.server_close()
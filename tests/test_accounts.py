@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from src import common
+from src.accounts import AccountPool, load_accounts
+from src.common import FakeClient, account_path
+from src.journal import load_state, place_leg
+
+
+@pytest.fixture
+def env(monkeypatch):
+    monkeypatch.setenv("BINANCE_ACCOUNTS", "Alpha, beta")
+    monkeypatch.setenv("BINANCE_API_KEY_ALPHA", "ka")
+    monkeypatch.setenv("BINANCE_API_SECRET_ALPHA", "sa")
+    monkeypatch.setenv("BINANCE_API_KEY_BETA", "kb")
+    monkeypatch.setenv("BINANCE_API_SECRET_BETA", "sb")
+    monkeypatch.setenv("ACCOUNT_SIZE_BETA", "0.55")
+    return monkeypatch
+
+
+def test_load_accounts_reads_names_keys_and_sizes(env):
+    accounts = load_accounts("live")
+    assert [(a["name"], a["API_KEY"], a["API_SECRET"], a["size"]) for a in accounts] == [
+        ("alpha", "ka", "sa", 1.0), ("beta", "kb", "sb", 0.55)]
+
+
+def test_load_accounts_rejects_bad_input(env):
+    env.delenv("BINANCE_API_SECRET_BETA")
+    with pytest.raises(ValueError, match="BINANCE_API_SECRET_BETA"):
+        load_accounts("live")
+    assert load_accounts("dryrun")[1]["API_SECRET"] == ""  # dryrun needs no keys
+    env.setenv("ACCOUNT_SIZE_BETA", "0")
+    with pytest.raises(ValueError, match="ACCOUNT_SIZE_BETA"):
+        load_accounts("dryrun")
+    env.setenv("BINANCE_ACCOUNTS", "main,sub-1")
+    with pytest.raises(ValueError, match="account name"):
+        load_accounts("dryrun")
+    env.delenv("BINANCE_ACCOUNTS")
+    with pytest.raises(ValueError, match="BINANCE_ACCOUNTS"):
+        load_accounts("dryrun")
+
+
+class NoMargin(FakeClient):
+    def futures_create_order(self, **kwargs):
+        raise Exception("APIError(code=-2019): Margin is insufficient.")
+
+
+def make_pool(accounts, fail=()):
+    return AccountPool(accounts, mode="dryrun",
+                       factory=lambda acct, mode: NoMargin() if acct["name"] in fail else FakeClient())
+
+
+def market(client, qty, journal, link_id):
+    req = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": qty,
+           "newClientOrderId": f"{link_id}-ENTRY"}
+    journal.plan(link_id, [req], strategy="TEST")
+    return place_leg(client, journal, link_id, req)
+
+
+def test_fan_out_sizes_rounds_and_isolates_accounts(tmp_path):
+    accounts = [{"name": "fa", "size": 1.0}, {"name": "fb", "size": 0.55}, {"name": "fc", "size": 0.2},
+                {"name": "fd", "size": 1.0}]
+    pool = make_pool(accounts, fail={"fd"})
+    try:
+        results = pool.fan_out(lambda client, q, journal: market(client, q, journal, "FAN-1"), 0.002)
+    finally:
+        pool.close()
+    journal_path = lambda name: account_path(pool.cfg["JOURNAL_PATH"], name)
+
+    # 0.002 * 0.55 = 0.0011000000000000001 goes out as one step; 0.0004 is below a step
+    assert results["fa"]["result"]["request"]["quantity"] == 0.002
+    assert results["fb"]["result"]["request"]["quantity"] == 0.001
+    assert "skipped" in results["fc"]
+    assert pool.clients["fc"].orders == {}
+    assert "-2019" in results["fd"]["error"]
+
+    for name in ("fa", "fb"):
+        with open(account_path(common.BOT_LOG_PATH, name), encoding="utf-8") as f:
+            assert any(json.loads(line).get("action") == "place_order" for line in f)
+        assert load_state(journal_path(name))["FAN-1"]["status"]["FAN-1-ENTRY"] == "ack"
+    # The failed account journals its own failure and nobody else's
+    assert load_state(journal_path("fd"))["FAN-1"]["status"]["FAN-1-ENTRY"] == "fail"
+    assert "FAN-1" not in load_state(journal_path("fc"))
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics import execution_quality, load_journal
+from src.common import FakeClient
+from src.journal import IntentJournal
+from src.advanced.twap import run_twap
+
+
+def test_dryrun_twap_report_counts_fills_and_measures_from_arrival(tmp_path):
+    journal = IntentJournal(str(tmp_path / "orders.journal"))
+    client = FakeClient(mark_price=50000.0)
+    run_twap(client, "BTCUSDT", "BUY", 0.003, 3, 0, link_id="TWAP-t1", journal=journal)
+    journal.close()
+
+    report = execution_quality(load_journal(journal.path)).loc["TWAP-t1"]
+    assert report["filledQty"] == np.float64(0.003)
+    assert report["fillRate"] == 1.0
+    assert report["arrivalPrice"] == 50000.0
+    assert report["achievedPrice"] == 50000.0
+    assert report["shortfallBps"] == 0.0
+
+
+def test_fills_without_a_price_still_count():
+    legs = pd.DataFrame({
+        "linkId": ["L1", "L1"], "cid": ["L1-S1", "L1-S2"], "strategy": "TWAP", "arrivalPrice": 100.0,
+        "symbol": "BTCUSDT", "side": "SELL", "type": "MARKET", "qty": [1.0, 1.0], "price": np.nan,
+        "tPlan": [0.0, 0.0], "tDone": [1.0, 2.0], "outcome": "ack",
+        # A plain ACK: no executedQty or avgPrice reported for the first slice
+        "avgPrice": [np.nan, 99.0], "executedQty": [np.nan, 1.0], "latencyMs": 1.0,
+    })
+    report = execution_quality(legs).loc["L1"]
+    assert report["filledQty"] == 2.0
+    assert report["fillRate"] == 1.0
+    assert report["achievedPrice"] == 99.0
+    # Selling below the arrival price is a cost
+    assert report["shortfallBps"] == 100.0
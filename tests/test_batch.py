@@ -0,0 +1,98 @@
+import pytest
+
+from conftest import limit
+from src.advanced.grid import GridStrategy
+from src.common import FakeClient, cancel_batch_with_retry, place_batch_with_retry
+from src.risk import RiskManager, RiskRejected
+
+
+def test_batch_exposure_accumulates_within_the_batch():
+    client = FakeClient()
+    client.risk = RiskManager(max_notional_symbol=200.0, max_orders_per_sec=10)
+    # Each order is 120 notional: alone it fits, the pair does not
+    with pytest.raises(RiskRejected):
+        place_batch_with_retry(client, [limit(60000.0), limit(60000.0)])
+    assert client.orders == {}
+    assert len(client.risk._sent) == 0  # nothing was sent, nothing counts against the rate
+
+
+def test_batch_open_orders_accumulate_within_the_batch():
+    client = FakeClient()
+    client.risk = RiskManager(max_open_orders=2)
+    with pytest.raises(RiskRejected):
+        place_batch_with_retry(client, [limit(59000.0 - i) for i in range(3)])
+    resp = place_batch_with_retry(client, [limit(59000.0 - i) for i in range(2)])
+    assert all("orderId" in item for item in resp)
+    assert len(client.risk.open_orders) == 2
+
+
+def test_batch_rate_limit_counts_the_whole_batch():
+    risk = RiskManager(max_orders_per_sec=5)
+    risk.check_batch([limit(59000.0)] * 3)
+    with pytest.raises(RiskRejected):
+        risk.check_batch([limit(59000.0)] * 3)
+    assert len(risk._sent) == 3
+    risk.check_batch([limit(59000.0)] * 2)
+    assert len(risk._sent) == 5
+
+
+def test_batch_sends_lower_case_booleans_through_the_client(live):
+    exchange, client = live
+    resp = place_batch_with_retry(client, [limit(61000.0, side="SELL", reduceOnly=True, newClientOrderId="B-1"),
+                                           limit(59000.0, reduceOnly=False, newClientOrderId="B-2")])
+    assert [item["request"]["reduceOnly"] for item in resp] == ["true", "false"]
+    assert len(exchange.book.futures_get_open_orders()) == 2
+
+
+def test_grid_batch_cancel_reaches_the_exchange(live):
+    exchange, client = live
+    grid = GridStrategy(client, "BTCUSDT", step=10.0, levels=3, qty=0.001, tick=0.1, link_id="GRID-T")
+    grid.requote(60000.0)
+    assert len(exchange.book.futures_get_open_orders()) == 6
+    # Moving the center by two steps cancels two levels per side in one batch request
+    stats = grid.requote(60020.0)
+    assert stats["cancelled"] == 4
+    open_cids = {o["clientOrderId"] for o in exchange.book.futures_get_open_orders()}
+    assert open_cids == {entry["cid"] for entry in grid.resting.values()}
+    assert len(open_cids) == 6
+
+
+def test_grid_cancels_are_throttled_stamped_and_retried():
+    class Flaky(FakeClient):
+        def __init__(self):
+            super().__init__()
+            self.cancel_calls = []
+
+        def futures_cancel_orders(self, **kwargs):
+            self.cancel_calls.append(kwargs)
+            if len(self.cancel_calls) == 1:
+                raise Exception("APIError(code=-1021): Timestamp for this request is outside of the recvWindow.")
+            return super().futures_cancel_orders(**kwargs)
+
+    class Clock:
+        samples = 0
+
+        def stamp(self, params):
+            return {**params, "timestamp": 1, "recvWindow": 5000}
+
+        def sample(self):
+            Clock.samples += 1
+
+    class Limiter:
+        acquired = 0
+
+        def acquire(self, cost=1.0):
+            Limiter.acquired += 1
+            return 0.0
+
+    client = Flaky()
+    client.risk = RiskManager()
+    client.time_sync, client.rate_limiter = Clock(), Limiter()
+    place_batch_with_retry(client, [limit(59000.0, newClientOrderId="C-1"), limit(58900.0, newClientOrderId="C-2")])
+    resp = cancel_batch_with_retry(client, "BTCUSDT", ["C-1", "C-2"])
+    assert [item["status"] for item in resp] == ["CANCELED", "CANCELED"]
+    # -1021 resamples the clock and retries at once; every attempt is throttled and stamped
+    assert Clock.samples == 1
+    assert Limiter.acquired == 1 + 2
+    assert all(call["recvWindow"] == 5000 for call in client.cancel_calls)
+    assert client.risk.open_orders == {}
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.history import (AGG_TRADE_LIMIT, FapiHttp, agg_trades_store, download_agg_trades, download_klines,
+                         klines_store)
+from src.stubserver import StubExchange, base_url, serve
+
+HOUR = 3_600_000
+T0 = 1_700_000_000_000 // HOUR * HOUR  # an hour boundary well in the past
+
+
+@pytest.fixture
+def stub():
+    exchange = StubExchange(trade_ms=1000)
+    server = serve(exchange)
+    yield exchange, FapiHttp(base_url=base_url(server), weight_per_sec=1e6)
+    server.shutdown()
+    server.server_close()
+
+
+def test_klines_page_across_requests_and_resume(tmp_path, stub):
+    _, http = stub
+    # 2000 one-minute candles: two 1500-row requests
+    assert download_klines("BTCUSDT", "1m", T0, T0 + 2000 * 60_000, str(tmp_path), http) == 2000
+    assert http.requests == 2
+    # Rerunning with a later end fetches only what is missing
+    assert download_klines("BTCUSDT", "1m", T0, T0 + 2500 * 60_000, str(tmp_path), http) == 500
+    assert download_klines("BTCUSDT", "1m", T0, T0 + 2500 * 60_000, str(tmp_path), http) == 0
+    ts = klines_store("BTCUSDT", "1m", str(tmp_path), readonly=True).column("ts")
+    assert np.array_equal(ts, T0 + 60_000 * np.arange(2500))
+
+
+def test_agg_trades_follow_full_pages_by_id_and_resume(tmp_path, stub):
+    _, http = stub
+    # 3600 trades per one-hour window: each window needs four pages chained by fromId
+    assert download_agg_trades("BTCUSDT", T0, T0 + 2 * HOUR, str(tmp_path), http, workers=2) == 7200
+    assert http.requests == 2 * -(-3600 // AGG_TRADE_LIMIT)
+    assert download_agg_trades("BTCUSDT", T0, T0 + 2 * HOUR + 90_000, str(tmp_path), http) == 90
+    store = agg_trades_store("BTCUSDT", str(tmp_path), readonly=True)
+    ids, ts = store.column("id"), store.column("ts")
+    assert np.array_equal(ids, T0 // 1000 + np.arange(7290))
+    assert np.array_equal(ts, ids * 1000)
+
+
+def test_readonly_open_never_truncates_a_partial_append(tmp_path, stub):
+    _, http = stub
+    download_klines("BTCUSDT", "1m", T0, T0 + 6 * 60_000, str(tmp_path), http)
+    path = tmp_path / "BTCUSDT" / "klines_1m"
+    # The writer crashed (or is still appending) after ts got three more rows
+    with open(path / "ts.bin", "ab") as f:
+        f.write(np.arange(3, dtype="<i8").tobytes())
+
+    reader = klines_store("BTCUSDT", "1m", str(tmp_path), readonly=True)
+    assert reader.rows == 6
+    assert (path / "ts.bin").stat().st_size == 9 * 8
+    with pytest.raises(ValueError):
+        reader.append({"ts": np.array([1])})
+
+    # Only the writer rolls the partial append back
+    assert klines_store("BTCUSDT", "1m", str(tmp_path)).rows == 6
+    assert (path / "ts.bin").stat().st_size == 6 * 8
+
+
+def test_readonly_store_of_a_missing_dataset_is_empty(tmp_path):
+    store = agg_trades_store("ETHUSDT", str(tmp_path), readonly=True)
+    assert store.rows == 0
+    assert not (tmp_path / "ETHUSDT").exists()
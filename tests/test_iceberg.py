@@ -0,0 +1,89 @@
+import math
+
+import pytest
+
+from src.advanced.iceberg import IcebergOrder
+from src.common import FakeClient
+from src.journal import IntentJournal, load_state
+
+
+def iceberg(client, total=0.010, visible=0.004, **kwargs):
+    ice = IcebergOrder(client, "BTCUSDT", "BUY", total, visible, 60000.0, **kwargs)
+    client.add_listener(ice.on_event)
+    return ice.start()
+
+
+def slices(client):
+    return [(float(o["origQty"]), float(o["price"])) for o in client.orders.values()]
+
+
+def test_quantities_below_one_lot_are_rejected():
+    with pytest.raises(ValueError, match="total"):
+        IcebergOrder(FakeClient(), "BTCUSDT", "BUY", 0.0004, 0.0004, 60000.0)
+    with pytest.raises(ValueError, match="visible"):
+        IcebergOrder(FakeClient(), "BTCUSDT", "BUY", 0.010, 0.0004, 60000.0)
+
+
+def test_refills_only_when_the_slice_is_filled():
+    client = FakeClient()
+    ice = iceberg(client)
+    client.fill(origClientOrderId=ice.cid, qty=0.001)
+    assert ice.seq == 1
+    client.fill(origClientOrderId=ice.cid)
+    assert ice.seq == 2
+    assert ice.cid.endswith("-I2")
+
+
+def test_last_slice_is_the_remainder():
+    client = FakeClient()
+    ice = iceberg(client)
+    while ice.status == "working":
+        client.fill(origClientOrderId=ice.cid)
+    assert ice.status == "complete"
+    assert [q for q, _ in slices(client)] == [0.004, 0.004, 0.002]
+    assert ice.filled == pytest.approx(0.010)
+
+
+def test_jittered_slices_stay_in_bounds_and_on_the_grid():
+    client = FakeClient()
+    ice = iceberg(client, total=0.200, visible=0.010, size_jitter=0.5, price_jitter_ticks=5, seed=7)
+    while ice.status == "working":
+        client.fill(origClientOrderId=ice.cid)
+    placed = slices(client)
+    lots = [round(q / 0.001) for q, _ in placed]
+    assert sum(lots) == 200
+    assert all(5 <= n <= 15 for n in lots[:-1])
+    assert 1 <= lots[-1] <= 15
+    for q, p in placed:
+        assert math.isclose(q / 0.001, round(q / 0.001), abs_tol=1e-9)
+        assert math.isclose(p / 0.1, round(p / 0.1), abs_tol=1e-6)
+        # A BUY is only ever jittered passive, never through the limit
+        assert 60000.0 - 5 * 0.1 - 1e-9 <= p <= 60000.0
+    assert len({p for _, p in placed}) > 1
+
+
+def test_cancel_stops_refills():
+    client = FakeClient()
+    ice = iceberg(client)
+    cid = ice.cid
+    assert ice.cancel()
+    assert ice.status == "cancelled"
+    # A fill report that raced the cancel does not release more of the reserve
+    ice.on_event({"e": "ORDER_TRADE_UPDATE", "o": {"c": cid, "x": "TRADE", "X": "FILLED", "l": "0.004"}})
+    assert ice.seq == 1
+    assert [o["status"] for o in client.orders.values()] == ["CANCELED"]
+
+
+def test_every_slice_is_journaled_before_it_is_sent(tmp_path):
+    client = FakeClient()
+    journal = IntentJournal(str(tmp_path / "orders.journal"))
+    ice = iceberg(client, journal=journal)
+    while ice.status == "working":
+        client.fill(origClientOrderId=ice.cid)
+    journal.close()
+    link = load_state(journal.path)[ice.link_id]
+    assert link["strategy"] == "ICEBERG"
+    assert link["done"]
+    assert link["legs"] == [f"{ice.link_id}-I{i}" for i in (1, 2, 3)]
+    assert [link["reqs"][cid]["quantity"] for cid in link["legs"]] == [0.004, 0.004, 0.002]
+    assert all(link["status"][cid] == "ack" for cid in link["legs"])
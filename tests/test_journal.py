@@ -0,0 +1,109 @@
+from src.common import FakeClient, place_order_with_retry
+from src.journal import IntentJournal, load_state, recover
+from src.risk import RiskManager
+
+
+def bracket_legs(link_id):
+    return [
+        {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.001,
+         "newClientOrderId": f"{link_id}-ENTRY"},
+        {"symbol": "BTCUSDT", "side": "SELL", "type": "LIMIT", "timeInForce": "GTC", "quantity": 0.001,
+         "price": 62000.0, "reduceOnly": True, "newClientOrderId": f"{link_id}-TP"},
+        {"symbol": "BTCUSDT", "side": "SELL", "type": "STOP_MARKET", "quantity": 0.001, "stopPrice": 59000.0,
+         "reduceOnly": True, "newClientOrderId": f"{link_id}-SL"},
+    ]
+
+
+def sent_cids(client):
+    return sorted(o["clientOrderId"] for o in client.orders.values())
+
+
+def test_resume_looks_up_every_unacked_leg(tmp_path):
+    journal = IntentJournal(str(tmp_path / "orders.journal"))
+    client = FakeClient()
+    legs = bracket_legs("BRK-1")
+    journal.plan("BRK-1", legs, "BRACKET")
+    # ENTRY and TP reached the exchange; both acks were lost in the same group commit
+    client.futures_create_order(**legs[0])
+    client.futures_create_order(**legs[1])
+
+    summary = recover(client, journal, policy="resume")
+    journal.close()
+    assert summary["found"] == 2
+    assert summary["resent"] == 1
+    assert sent_cids(client) == ["BRK-1-ENTRY", "BRK-1-SL", "BRK-1-TP"]
+    assert load_state(journal.path)["BRK-1"]["done"]
+
+
+def test_resume_does_not_resend_a_rejected_leg_before_a_sent_one(tmp_path):
+    journal = IntentJournal(str(tmp_path / "orders.journal"))
+    client = FakeClient()
+    legs = bracket_legs("BRK-2")
+    journal.plan("BRK-2", legs, "BRACKET")
+    # TP was rejected (fail record lost), SL went through (ack lost)
+    client.futures_create_order(**legs[0])
+    client.futures_create_order(**legs[2])
+
+    summary = recover(client, journal, policy="resume")
+    journal.close()
+    assert summary == {"links": 1, "found": 2, "resent": 0, "cancelled": 0, "failed": 0, "skipped": 0}
+    assert load_state(journal.path)["BRK-2"]["status"]["BRK-2-TP"] == "fail"
+
+
+def test_failed_lookup_skips_the_link(tmp_path):
+    class Flaky(FakeClient):
+        def futures_get_order(self, **kwargs):
+            raise Exception("APIError(code=-1001): Internal error")
+
+    journal = IntentJournal(str(tmp_path / "orders.journal"))
+    client = Flaky()
+    journal.plan("BRK-3", bracket_legs("BRK-3"), "BRACKET")
+    summary = recover(client, journal, policy="resume")
+    journal.close()
+    assert summary["skipped"] == 1
+    assert client.orders == {}
+    assert not load_state(journal.path)["BRK-3"]["done"]
+
+
+def test_cancel_policy_releases_risk(tmp_path):
+    journal = IntentJournal(str(tmp_path / "orders.journal"))
+    client = FakeClient()
+    client.risk = RiskManager(max_open_orders=5)
+    legs = bracket_legs("BRK-4")
+    journal.plan("BRK-4", legs, "BRACKET")
+    place_order_with_retry(client, legs[0])
+    place_order_with_retry(client, legs[1])
+    assert len(client.risk.open_orders) == 1
+
+    summary = recover(client, journal, policy="cancel")
+    journal.close()
+    assert summary["found"] == 2
+    assert summary["cancelled"] == 1
+    assert client.risk.open_orders == {}
+    assert [o["status"] for o in client.orders.values()] == ["FILLED", "CANCELED"]
+
+
+def test_torn_tail_is_cut_before_the_next_plan(tmp_path):
+    path = str(tmp_path / "orders.journal")
+    journal = IntentJournal(path)
+    journal.plan("A", bracket_legs("A"), "BRACKET")
+    journal.close()
+    # Crash halfway through writing the next record
+    with open(path, "ab") as f:
+        f.write(b'{"op":"ack","linkId":"A","cid":"A-EN')
+
+    journal = IntentJournal(path)
+    journal.plan("B", bracket_legs("B"), "BRACKET")
+    journal.close()
+    state = load_state(path)
+    assert sorted(state) == ["A", "B"]
+    assert state["B"]["legs"] == ["B-ENTRY", "B-TP", "B-SL"]
+    with open(path, "rb") as f:
+        assert all(line.startswith(b"{") for line in f.read().splitlines())
+
+
+def test_torn_first_record_leaves_an_empty_journal(tmp_path):
+    path = tmp_path / "orders.journal"
+    path.write_bytes(b'{"op":"link","linkId":"A"')
+    IntentJournal(str(path)).close()
+    assert path.read_bytes() == b""
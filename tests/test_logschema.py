@@ -0,0 +1,37 @@
+import pytest
+from pydantic import ValidationError
+
+from src.common import log_info
+from src.logschema import OrderEvent, SliceEvent, decode_frame, encode_record, parse_record
+
+RECORDS = [
+    {"ts": "2025-08-11T06:00:01Z", "level": "INFO", "action": "place_order", "mode": "dryrun",
+     "request": {"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "quantity": 0.01, "price": 60000.0,
+                 "timeInForce": "GTC"}, "orderId": "FAKE-1a2b3c4d"},
+    {"ts": "2025-08-11T06:00:02Z", "level": "ERROR", "action": "order_attempt_failed", "attempt": 1,
+     "transient": True, "error": "APIError(code=-1003): Too many requests",
+     "req": {"symbol": "BTCUSDT", "side": "SELL", "type": "MARKET", "quantity": 0.5}},
+    {"ts": "2025-08-11T06:00:03Z", "level": "INFO", "action": "twap_slice", "symbol": "BTCUSDT", "side": "BUY",
+     "sliceIndex": 2, "totalSlices": 10, "qty": 0.001, "executedQty": 0.002, "linkId": "TWAP-1",
+     "message": "é" * 300},
+]
+
+
+@pytest.mark.parametrize("rec", RECORDS)
+def test_binary_frames_round_trip(rec):
+    assert decode_frame(encode_record(rec)) == rec
+
+
+def test_nested_order_fields_are_coalesced():
+    order = parse_record(RECORDS[0])
+    assert isinstance(order, OrderEvent)
+    assert (order.symbol, order.side, order.qty, order.price) == ("BTCUSDT", "BUY", 0.01, 60000.0)
+    assert parse_record(RECORDS[1]).qty == 0.5
+    assert isinstance(parse_record(RECORDS[2]), SliceEvent)
+
+
+def test_records_that_break_the_schema_fail_when_logged():
+    # conftest turns LOG_VALIDATE on
+    log_info({"action": "twap_slice", "symbol": "BTCUSDT", "sliceIndex": 1, "qty": 0.001})
+    with pytest.raises(ValidationError):
+        log_info({"action": "twap_slice", "symbol": "BTCUSDT", "sliceIndex": "first", "qty": 0.001})
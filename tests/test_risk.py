@@ -0,0 +1,101 @@
+import pytest
+
+from src.common import FakeClient
+from src.risk import RiskManager, RiskRejected
+
+
+def order(side="BUY", qty=0.01, price=60000.0, type_="LIMIT", **extra):
+    req = {"symbol": "BTCUSDT", "side": side, "type": type_, "quantity": qty, **extra}
+    if price is not None:
+        req["price"] = price
+    return req
+
+
+def test_symbol_notional_cap():
+    risk = RiskManager(max_notional_symbol=1000.0)
+    risk.check(order(qty=0.016))  # 960
+    with pytest.raises(RiskRejected, match="BTCUSDT notional"):
+        risk.check(order(qty=0.017))  # 1020
+
+
+def test_account_notional_cap_spans_symbols():
+    risk = RiskManager(max_notional_account=1000.0)
+    risk.on_ack({**order(qty=0.01), "symbol": "ETHUSDT"}, {"orderId": "1"})  # 600 resting
+    risk.check(order(qty=0.006))  # +360
+    with pytest.raises(RiskRejected, match="account notional"):
+        risk.check(order(qty=0.007))  # +420
+
+
+def test_open_order_cap_ignores_market_orders():
+    risk = RiskManager(max_open_orders=1)
+    risk.on_ack(order(), {"orderId": "1"})
+    with pytest.raises(RiskRejected, match="max open orders"):
+        risk.check(order())
+    risk.check(order(type_="MARKET", price=None))
+
+
+def test_order_rate_cap():
+    risk = RiskManager(max_orders_per_sec=3)
+    for _ in range(3):
+        risk.check(order())
+    with pytest.raises(RiskRejected, match="order rate"):
+        risk.check(order())
+
+
+def test_reduce_only_exits_are_exempt_from_notional_caps():
+    risk = RiskManager(max_notional_symbol=100.0)
+    risk.check(order(side="SELL", qty=1.0, reduceOnly=True))
+    with pytest.raises(RiskRejected):
+        risk.check(order(side="SELL", qty=1.0))
+
+
+def test_orders_that_flatten_are_netted_against_the_position():
+    risk = RiskManager(max_notional_symbol=1000.0)
+    risk.on_fill("BTCUSDT", "BUY", 0.015, 60000.0)  # 900 of exposure
+    # Selling the position back is not new exposure, even without reduceOnly
+    risk.check(order(side="SELL", qty=0.015))
+    # Flipping through zero only counts the part beyond flat: 0.016 short = 960
+    risk.check(order(side="SELL", qty=0.031))
+    with pytest.raises(RiskRejected):
+        risk.check(order(side="SELL", qty=0.032))
+    with pytest.raises(RiskRejected):
+        risk.check(order(side="BUY", qty=0.002))
+    # Within a batch the first sell flattens, so the second one opens a short from flat
+    risk.check_batch([order(side="SELL", qty=0.015), order(side="SELL", qty=0.016)])
+    with pytest.raises(RiskRejected):
+        risk.check_batch([order(side="SELL", qty=0.015), order(side="SELL", qty=0.017)])
+
+
+def test_fills_and_cancels_release_exposure():
+    risk = RiskManager(max_notional_symbol=1000.0)
+    risk.on_ack(order(qty=0.015), {"orderId": "1"})
+    assert risk.exposure["BTCUSDT"] == pytest.approx(900.0)
+    risk.on_cancel("1")
+    assert risk.exposure["BTCUSDT"] == pytest.approx(0.0)
+    assert risk.open_orders == {}
+
+    risk.on_ack(order(qty=0.01), {"orderId": "2"})
+    # A partial fill moves notional from resting to position; the order keeps resting
+    risk.on_fill("BTCUSDT", "BUY", 0.004, 60000.0, order_id="2", closed=False)
+    assert risk.open_orders["2"][1] == pytest.approx(360.0)
+    assert risk.exposure["BTCUSDT"] == pytest.approx(600.0)
+    risk.on_fill("BTCUSDT", "BUY", 0.006, 60000.0, order_id="2")
+    assert risk.open_orders == {}
+    assert risk.exposure["BTCUSDT"] == pytest.approx(600.0)
+
+
+def test_sync_bootstraps_positions_and_open_orders():
+    class Account(FakeClient):
+        def futures_position_information(self, **kwargs):
+            return [{"symbol": "BTCUSDT", "positionAmt": "-0.01", "markPrice": "60000"},
+                    {"symbol": "ETHUSDT", "positionAmt": "0", "markPrice": "3000"}]
+
+    client = Account()
+    client.futures_create_order(**order(side="SELL", qty=0.005, price=62000.0))
+    client.futures_create_order(**order(side="BUY", qty=0.01, price=58000.0, reduceOnly=True))
+    risk = RiskManager()
+    risk.sync(client)
+    assert risk.position == {"BTCUSDT": -0.01}
+    assert len(risk.open_orders) == 2
+    # 600 short plus the resting sell; the reduceOnly buy adds nothing
+    assert risk.exposure["BTCUSDT"] == pytest.approx(600.0 + 0.005 * 62000.0)
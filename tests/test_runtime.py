@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from src.advanced.bracket import BracketStrategy
+from src.advanced.oco import OcoStrategy
+from src.advanced.trailing import TrailingEngine
+from src.common import FakeClient
+from src.journal import IntentJournal, load_state
+from src.runtime import Runtime, Strategy, run_once
+
+
+class FillingClient(FakeClient):
+    """Fills the TP as soon as it rests (fill_on="TP") or while the SL is in flight (fill_on="SL")."""
+
+    def __init__(self, fill_on):
+        super().__init__()
+        self.fill_on = fill_on
+
+    def futures_create_order(self, **kwargs):
+        cid = kwargs.get("newClientOrderId", "")
+        if self.fill_on == "SL" and cid.endswith("-SL"):
+            self.fill(origClientOrderId=cid[:-3] + "-TP")
+        resp = super().futures_create_order(**kwargs)
+        if self.fill_on == "TP" and cid.endswith("-TP"):
+            self.fill(origClientOrderId=cid)
+        return resp
+
+
+def leg_statuses(client):
+    return {o["clientOrderId"].rpartition("-")[2]: o["status"] for o in client.orders.values()}
+
+
+def test_strategy_must_implement_start():
+    with pytest.raises(TypeError):
+        Strategy()
+
+
+def test_oco_does_not_send_the_sl_after_the_tp_filled():
+    client = FillingClient("TP")
+    result = run_once(OcoStrategy("BTCUSDT", "SELL", 0.01, 62000.0, 58000.0, link_id="OCO-T1", watch=True), client)
+    assert result["exit"] == "TP"
+    assert leg_statuses(client) == {"TP": "FILLED"}
+
+
+def test_oco_cancels_an_sl_that_was_in_flight_when_the_tp_filled():
+    client = FillingClient("SL")
+    result = run_once(OcoStrategy("BTCUSDT", "SELL", 0.01, 62000.0, 58000.0, link_id="OCO-T2", watch=True), client)
+    assert result["exit"] == "TP"
+    assert leg_statuses(client) == {"TP": "FILLED", "SL": "CANCELED"}
+
+
+def test_bracket_journals_the_skipped_sl(tmp_path):
+    client = FillingClient("TP")
+    journal = IntentJournal(str(tmp_path / "orders.journal"))
+    strategy = BracketStrategy("BTCUSDT", "BUY", 0.01, "MARKET", None, 62000.0, 58000.0, link_id="BRK-T1",
+                               watch=True)
+    result = run_once(strategy, client, journal)
+    journal.close()
+    assert result["exit"] == "TP"
+    assert leg_statuses(client) == {"ENTRY": "FILLED", "TP": "FILLED"}
+    state = load_state(journal.path)["BRK-T1"]
+    assert state["done"]
+    assert state["status"]["BRK-T1-SL"] == "cancel"
+
+
+def test_a_trailed_stop_that_fills_cancels_the_tp():
+    client = FakeClient()
+    strategy = OcoStrategy("BTCUSDT", "SELL", 0.01, 62000.0, 58000.0, link_id="OCO-T3", watch=True)
+    engine = TrailingEngine(client, min_amend_interval=0, background=True)
+
+    async def main():
+        rt = Runtime(client, max_workers=1)
+        task = rt.add(strategy)
+        while "SL" not in strategy.sent:
+            await asyncio.sleep(0.01)
+        engine.add("OCO-T3", "BTCUSDT", "SELL", 0.01, 58000.0, 1000.0, 0.1, on_amend=strategy.sl_replaced)
+        engine.on_mark("BTCUSDT", 60000.0, now=1.0)  # the stop ratchets to 59000 as OCO-T3-SL1
+        await asyncio.to_thread(engine.drain)
+        client.fill(origClientOrderId="OCO-T3-SL1")
+        await task
+        await rt.shutdown()
+
+    try:
+        asyncio.run(main())
+    finally:
+        engine.close()
+    assert strategy.result["exit"] == "SL"
+    assert strategy.sl_cid == "OCO-T3-SL1"
+    assert leg_statuses(client) == {"TP": "CANCELED", "SL": "CANCELED", "SL1": "FILLED"}
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import math
+import uuid
+import subprocess
+from multiprocessing import shared_memory
+
+import pytest
+
+from src.common import FakeClient
+from src.risk import RiskManager
+from src.snapshot import SnapshotReader, SnapshotWriter, attach_snapshot
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def name():
+    """A fresh segment name; the segment is removed after the test (it outlives writers by design)."""
+    name = f"dbot_test_{uuid.uuid4().hex[:8]}"
+    yield name
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def test_each_field_round_trips_and_the_rest_are_kept(name):
+    writer = SnapshotWriter(name, capacity=4)
+    reader = SnapshotReader(name)
+    fields = {"mark": 60000.5, "bid": 60000.4, "ask": 60000.6, "bid_qty": 1.25, "ask_qty": 0.75,
+              "funding": 0.0001, "ts_ms": 1_700_000_000_123}
+    for field, value in fields.items():
+        writer.update("BTCUSDT", **{field: value})
+        assert getattr(reader.get("BTCUSDT"), field) == value
+    # One update per field: every later update kept the earlier fields
+    snap = reader.get("BTCUSDT")
+    assert {f: getattr(snap, f) for f in fields} == fields
+    assert snap.seq == 2 * len(fields)
+    assert reader.mark("BTCUSDT") == 60000.5
+    # A slot that only had book updates has no mark yet
+    writer.update("ETHUSDT", bid=3000.0)
+    assert math.isnan(reader.get("ETHUSDT").mark)
+    assert reader.mark("ETHUSDT") is None
+    reader.close()
+    writer.close()
+
+
+def test_unknown_symbol_reads_as_none(name):
+    writer = SnapshotWriter(name, capacity=4)
+    writer.update("BTCUSDT", mark=60000.0)
+    reader = SnapshotReader(name)
+    assert reader.get("ETHUSDT") is None
+    assert reader.mark("ETHUSDT") is None
+    # Symbols published after the reader attached are found on the next miss
+    writer.update("ETHUSDT", mark=3000.0)
+    assert reader.get("ETHUSDT").mark == 3000.0
+    assert reader.symbols() == ["BTCUSDT", "ETHUSDT"]
+    reader.close()
+    writer.close()
+
+
+def test_restarted_writer_adopts_the_segment(name):
+    first = SnapshotWriter(name, capacity=4)
+    first.update("BTCUSDT", mark=60000.0, funding=0.0001)
+    first.update("ETHUSDT", mark=3000.0)
+    reader = SnapshotReader(name)
+    before = reader.get("ETHUSDT")
+    first.close()
+
+    second = SnapshotWriter(name, capacity=4)
+    assert second.index == {"BTCUSDT": 0, "ETHUSDT": 1}
+    second.update("ETHUSDT", mark=3001.0)
+    second.update("SOLUSDT", mark=150.0)
+    # The attached reader keeps its cached offsets; values and sequence numbers carry on
+    after = reader.get("ETHUSDT")
+    assert after.mark == 3001.0 and after.seq > before.seq
+    assert reader.get("BTCUSDT").funding == 0.0001
+    assert reader.symbols() == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    reader.close()
+    second.close()
+
+
+def test_attach_snapshot_wires_the_client_and_risk(name):
+    client = FakeClient()
+    client.risk = RiskManager()
+    assert attach_snapshot(client, {"MARKET_SHM": ""}) is None
+    with pytest.raises(OSError):
+        attach_snapshot(client, {"MARKET_SHM": name})
+
+    writer = SnapshotWriter(name, capacity=4)
+    writer.update("BTCUSDT", mark=61000.0)
+    reader = attach_snapshot(client, {"MARKET_SHM": name})
+    assert client.market is reader
+    assert client.risk.mark_source("BTCUSDT") == 61000.0
+    writer.update("BTCUSDT", mark=61500.0)
+    assert client.risk.mark_source("BTCUSDT") == 61500.0
+    reader.close()
+    writer.close()
+
+
+def test_feeder_replays_a_recording(tmp_path, name):
+    recording = tmp_path / "stream.jsonl"
+    messages = [
+        {"e": "markPriceUpdate", "E": 1000, "s": "BTCUSDT", "p": "60000.0", "r": "0.0001"},
+        {"stream": "btcusdt@bookTicker",
+         "data": {"e": "bookTicker", "E": 1100, "s": "BTCUSDT", "b": "59999.9", "B": "2", "a": "60000.1", "A": "3"}},
+        {"e": "markPriceUpdate", "E": 1200, "s": "ETHUSDT", "p": "3000.0", "r": ""},
+        {"e": "markPriceUpdate", "E": 1300, "s": "BTCUSDT", "p": "60010.0", "r": "0.0002"},
+    ]
+    recording.write_text("".join(json.dumps(m) + "\n" for m in messages))
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "scripts", "market_feeder.py"), "BTCUSDT", "--name", name,
+         "--capacity", "4", "--replay", str(recording), "--speed", "0"],
+        cwd=str(tmp_path), capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    assert "Published 3 updates" in proc.stdout
+
+    # The segment outlives the feeder; only the requested symbol was published
+    reader = SnapshotReader(name)
+    assert reader.symbols() == ["BTCUSDT"]
+    snap = reader.get("BTCUSDT")
+    assert (snap.mark, snap.bid, snap.ask, snap.bid_qty, snap.ask_qty) == (60010.0, 59999.9, 60000.1, 2.0, 3.0)
+    assert (snap.funding, snap.ts_ms) == (0.0002, 1300)
+    reader.close()
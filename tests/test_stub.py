@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+from binance.exceptions import BinanceAPIException
+
+from conftest import limit
+from src.common import place_order_with_retry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_order_round_trip_and_error_mapping(live):
+    exchange, client = live
+    resp = place_order_with_retry(client, limit(newClientOrderId="STUB-1"))
+    assert client.futures_get_order(symbol="BTCUSDT", origClientOrderId="STUB-1")["orderId"] == resp["orderId"]
+    assert client.futures_cancel_order(symbol="BTCUSDT", orderId=resp["orderId"])["status"] == "CANCELED"
+    with pytest.raises(BinanceAPIException) as err:
+        client.futures_cancel_order(symbol="BTCUSDT", orderId=resp["orderId"])
+    assert (err.value.status_code, err.value.code) == (400, -2011)
+
+
+def test_injected_internal_error_is_retried(live, monkeypatch):
+    exchange, client = live
+    failures = iter([True])
+
+    def flaky():
+        if next(failures, False):
+            raise Exception("APIError(code=-1001): Internal error; unable to process your request.")
+    monkeypatch.setattr(exchange.book, "_inject_error", flaky)
+
+    resp = place_order_with_retry(client, limit(newClientOrderId="STUB-2"), base_delay=0.01)
+    assert resp["clientOrderId"] == "STUB-2"
+    with open(os.environ["BOT_LOG_PATH"], encoding="utf-8") as f:
+        attempts = [json.loads(line) for line in f if '"order_attempt_failed"' in line]
+    assert any("-1001" in rec["error"] and rec["transient"] for rec in attempts)
+
+
+def test_soak_harness_against_the_stub(tmp_path):
+    out = tmp_path / "soak.json"
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "scripts", "soak_test.py"), "--target", "stub", "--duration", "2s",
+         "--rate", "10", "--latencyMs", "0", "--jitterMs", "0", "--errorRate", "0.05", "--warmupSec", "0",
+         "--reportSec", "1", "--out", str(out)],
+        cwd=str(tmp_path), capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    summary = json.loads(out.read_text())["summary"]
+    # -1001s are injected into one request in twenty; the retry wrapper absorbs them
+    assert summary["ops"] >= 10
+    assert summary["ok"] == summary["ops"]
+    assert summary["errors"] == 0
@@ -0,0 +1,40 @@
+import json
+
+from src.common import BOT_LOG_PATH, FakeClient, place_order_with_retry
+from src.timesync import MIN_RECV_WINDOW, TimeSync
+
+
+def test_offset_converges_to_injected_skew():
+    client = FakeClient(skew_ms=2500, jitter_ms=20)
+    sync = TimeSync(client, window=8)
+    for _ in range(8):
+        assert sync.sample() is not None
+    # Asymmetric jitter bounds the error of one sample by half its round trip
+    assert abs(sync.offset_ms - 2500) < 15
+    assert abs(client.timestamp_offset - 2500) < 15
+
+
+def test_recv_window_grows_with_jitter():
+    quiet = TimeSync(FakeClient(), window=8, base_recv_window=MIN_RECV_WINDOW)
+    noisy = TimeSync(FakeClient(jitter_ms=400), window=8, base_recv_window=MIN_RECV_WINDOW)
+    for _ in range(8):
+        quiet.sample()
+        noisy.sample()
+    assert quiet.recv_window == MIN_RECV_WINDOW
+    assert noisy.recv_window > MIN_RECV_WINDOW
+    assert noisy.recv_window >= 2 * noisy.rtt_ms + 500
+    assert noisy.stamp({"symbol": "BTCUSDT"})["recvWindow"] == noisy.recv_window
+    assert noisy.stamp({"recvWindow": 7000})["recvWindow"] == 7000
+
+
+def test_timestamp_error_triggers_resync_and_retry():
+    client = FakeClient(skew_ms=20000)
+    # Never sampled: the first order goes out 20s behind the server clock
+    client.time_sync = TimeSync(client, base_recv_window=5000)
+    req = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.001, "newClientOrderId": "ts-1"}
+    resp = place_order_with_retry(client, req, base_delay=0)
+    assert resp["clientOrderId"] == "ts-1"
+    assert abs(client.timestamp_offset - 20000) < 50
+    with open(BOT_LOG_PATH, encoding="utf-8") as f:
+        failures = [r for r in map(json.loads, f) if r.get("action") == "order_attempt_failed"]
+    assert any("-1021" in r["error"] for r in failures)
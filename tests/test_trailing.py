@@ -0,0 +1,68 @@
+import threading
+
+from src.common import FakeClient, place_order_with_retry
+from src.advanced.trailing import TrailingEngine
+from src.risk import RiskManager
+
+
+class RecordingClient(FakeClient):
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    def futures_create_order(self, **kwargs):
+        self.sent.append(kwargs)
+        return super().futures_create_order(**kwargs)
+
+
+def test_amends_release_the_replaced_stop():
+    client = RecordingClient()
+    client.risk = RiskManager(max_open_orders=2)
+    place_order_with_retry(client, {"symbol": "BTCUSDT", "side": "SELL", "type": "STOP_MARKET", "reduceOnly": True,
+                                    "quantity": 0.001, "stopPrice": 59000.0, "workingType": "CONTRACT_PRICE",
+                                    "newClientOrderId": "BRK-1-SL"})
+    engine = TrailingEngine(client, min_amend_interval=0)
+    st = engine.add("BRK-1", "BTCUSDT", "SELL", 0.001, 59000.0, 500.0, 0.1, threshold_ticks=5)
+    for i in range(10):
+        engine.on_mark("BTCUSDT", 60000.0 + 100 * i, now=float(i))
+
+    # Every ratchet replaced the stop: more amends than the open-order limit, one stop resting
+    assert st.amends == 10
+    assert len(client.risk.open_orders) == 1
+    resting = [o for o in client.orders.values() if o["status"] == "NEW"]
+    assert [o["clientOrderId"] for o in resting] == [st.cid]
+    assert {req["workingType"] for req in client.sent} == {"CONTRACT_PRICE"}
+
+
+def test_a_stop_limit_leg_stays_a_stop_limit():
+    client = RecordingClient()
+    engine = TrailingEngine(client, min_amend_interval=0)
+    # Short exit: the buy stop trails the mark down, its limit 20 above the trigger
+    engine.add("BRK-2", "BTCUSDT", "BUY", 0.001, 61000.0, 500.0, 0.1, limit_price=61020.0)
+    engine.on_mark("BTCUSDT", 60000.0, now=1.0)
+    [req] = client.sent
+    assert (req["type"], req["stopPrice"], req["price"], req["timeInForce"]) == ("STOP", 60500.0, 60520.0, "GTC")
+
+
+def test_background_amends_leave_the_price_callback():
+    client = RecordingClient()
+    engine = TrailingEngine(client, min_amend_interval=0, background=True)
+    st = engine.add("BRK-3", "BTCUSDT", "SELL", 0.001, 59000.0, 500.0, 0.1)
+    replaced = []
+    st.on_amend = replaced.append
+    caller = threading.get_ident()
+    original = client.futures_create_order
+
+    def create(**kwargs):
+        assert threading.get_ident() != caller
+        return original(**kwargs)
+    client.futures_create_order = create
+
+    for i in range(5):
+        engine.on_mark("BTCUSDT", 60000.0 + 100 * i, now=float(i))
+    engine.drain()
+    engine.close()
+    # Marks that arrived while an amend was in flight coalesce into the next one
+    assert 1 <= st.amends <= 5
+    assert st.stop == round(59900.0 / 0.1)
+    assert replaced[-1] == st.cid == f"BRK-3-SL{st.seq}"